@@ -0,0 +1,103 @@
+# Query-count benchmark for show-fixture-stats COMPETITION YEAR TEAM (display_utils.print_fixture_stats_team)
+#
+# Builds seasons of increasing length in a throwaway database, renders one team's fixture statistics and counts
+# the SQL statements run and the stat tables printed. Both must stay flat per fixture: the query count may not
+# grow with the number of fixtures and each fixture is printed exactly once.
+# Exits non-zero when either guard fails.
+#
+#   python benchmarks/bench_fixture_stats_query.py --matches 10 50 100
+
+# Import libraries
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel
+
+from database import make_engine
+from models import Competition, Country, Fixture, FixtureStats, Season, Team, Venue
+from display_utils import print_fixture_stats_team
+
+COMPETITION = 'Bench League'
+YEAR = 2023
+TEAM = 'Team 0'
+
+
+# One season where Team 0 plays `matches` fixtures against rotating opponents, every fixture with statistics
+def build_season(session: Session, matches: int):
+    session.add(Country(id=1, country_name='Benchland', num_comps=1))
+    session.add(Competition(comp_api_id=1, comp_country_id=1, country_name='Benchland', comp_name=COMPETITION,
+                            comp_type='League', comp_logo=''))
+    session.add(Season(id=1, year=YEAR, league_id=1))
+    opponents = 19
+    for team_id in range(opponents + 1):
+        session.add(Venue(venue_api_id=team_id, name=f'Stadium {team_id}', country='Benchland', country_id=1))
+        session.add(Team(team_api_id=team_id, name=f'Team {team_id}', country='Benchland', country_id=1,
+                         national=False, logo_url=''))
+    session.flush()
+    start = datetime(YEAR, 8, 1, tzinfo=timezone.utc)
+    for match in range(matches):
+        opponent = match % opponents + 1
+        home, away = (0, opponent) if match % 2 == 0 else (opponent, 0)
+        session.add(Fixture(id=match + 1, season_id=1, home_team_id=home, away_team_id=away, venue_id=home,
+                            competition_id=1, date=start + timedelta(days=7 * match), short_status='FT',
+                            round=f'Regular Season - {match + 1}', home_goals=1, away_goals=0))
+        session.add(FixtureStats(fixture_id=match + 1, home_team_id=home, away_team_id=away, home_total_sh=10,
+                                 away_total_sh=8, home_possession=55.0, away_possession=45.0))
+    session.commit()
+
+
+# Render the team's statistics, returning statements run, stat tables printed and seconds taken
+def measure(matches: int, directory: str):
+    engine = make_engine(f"sqlite:///{os.path.join(directory, f'bench_{matches}.db')}", profile='default')
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        build_season(session, matches)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    output = io.StringIO()
+    with Session(engine) as session, contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        print_fixture_stats_team(session, COMPETITION, YEAR, TEAM)
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return len(statements), output.getvalue().count('Fixture stats for'), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, nargs='+', default=[10, 50, 100])
+    options = parser.parse_args()
+
+    failures = []
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for matches in options.matches:
+            queries, tables, elapsed = measure(matches, directory)
+            results.append((matches, queries))
+            print(f'{matches:>4} fixtures: {queries} queries, {tables} stat tables, {elapsed * 1000:.0f} ms')
+            if tables != matches:
+                failures.append(f'{matches} fixtures printed {tables} stat tables')
+
+    if len({queries for _, queries in results}) > 1:
+        failures.append(f'query count changes with season length: {results}')
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
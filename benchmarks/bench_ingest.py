@@ -0,0 +1,108 @@
+# Ingest benchmark and guard for fixtures and standings (helper_functions.fetch_fixtures and fetch_standings)
+#
+# Feeds a 20-team season of /fixtures and /standings responses to the ingest code on a throwaway database with the
+# default connection profile, then feeds them again with some new results. Reports the time of the first load and of
+# the re-sync, and checks that every row is stored, including a fixture and a standing for a Team that was never
+# fetched, as API-Football sends for Welsh clubs in English leagues or cup opponents from abroad.
+# Exits non-zero when a check fails.
+#
+#   python benchmarks/bench_ingest.py --updated 40
+
+# Import libraries
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sqlmodel import Session, SQLModel, func, select
+
+import helper_functions
+from database import make_engine
+from helper_functions import fetch_fixtures, fetch_standings
+from models import Competition, Country, Fixture, Season, Standing, Team
+
+TEAMS = 20
+# A Team the database has no row for
+UNKNOWN_TEAM = 99
+
+
+# /fixtures response for a double round-robin of the stored Teams and one tie against the unknown Team
+def fixtures_response(updated: int) -> dict:
+    pairs = [(home, away) for home in range(TEAMS) for away in range(TEAMS) if home != away]
+    pairs.append((0, UNKNOWN_TEAM))
+    played = len(pairs) - 40 + updated
+    response = [{
+        'fixture': {'id': number + 1, 'referee': None,
+                    'date': f'2023-{8 + number // 100:02d}-{1 + number % 28:02d}T15:00:00+00:00',
+                    'venue': {'id': None, 'name': None, 'city': None},
+                    'status': {'short': 'FT' if number < played else 'NS', 'elapsed': 90 if number < played else None}},
+        'league': {'id': 1, 'country': 'Benchland', 'round': f'Regular Season - {number // 10 + 1}'},
+        'teams': {'home': {'id': home}, 'away': {'id': away}},
+        'goals': {'home': number % 4 if number < played else None, 'away': number % 3 if number < played else None},
+        'score': {period: {'home': None, 'away': None} for period in ('halftime', 'fulltime', 'extratime', 'penalty')},
+    } for number, (home, away) in enumerate(pairs)]
+    return {'results': len(response), 'response': response}
+
+
+# /standings response for the stored Teams and the unknown one
+def standings_response() -> dict:
+    record = {'played': 38, 'win': 10, 'draw': 8, 'lose': 20, 'goals': {'for': 40, 'against': 50}}
+    table = [{'rank': rank, 'team': {'id': team_id}, 'points': 38, 'all': record, 'home': record, 'away': record}
+             for rank, team_id in enumerate([*range(TEAMS), UNKNOWN_TEAM], start=1)]
+    return {'results': 1, 'response': [{'league': {'standings': [table]}}]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--updated', type=int, default=40, help='fixtures that get a result in the re-sync')
+    options = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Country(id=1, country_name='Benchland', num_comps=1))
+            session.flush()
+            session.add(Competition(comp_api_id=1, comp_country_id=1, country_name='Benchland',
+                                    comp_name='Bench League', comp_type='League', comp_logo=''))
+            session.add(Season(id=1, year=2023, league_id=1))
+            session.flush()
+            session.bulk_insert_mappings(Team, [dict(team_api_id=team_id, name=f'Team {team_id}', country='Benchland',
+                                                     country_id=1, national=False, logo_url='')
+                                                for team_id in range(TEAMS)])
+            session.commit()
+            season, competition = session.get(Season, 1), session.get(Competition, 1)
+
+            timings = {}
+            for run, updated in (('first load', 0), ('re-sync', options.updated)):
+                responses = {'fixtures': fixtures_response(updated), 'standings': standings_response()}
+                # Serve the canned responses instead of calling the API
+                helper_functions.api_request = lambda url, params=None: responses[url.rsplit('/', 1)[-1]]
+                start = time.perf_counter()
+                inserted, changed, _ = fetch_fixtures(session, season, competition)
+                fetch_standings(session, season, competition)
+                timings[run] = (time.perf_counter() - start) * 1000
+                print(f'{run:>10}: {len(inserted)} fixtures added, {len(changed)} updated in {timings[run]:.0f} ms')
+                if run == 're-sync' and len(changed) != updated:
+                    failures.append(f're-sync updated {len(changed)} fixtures, expected {updated}')
+
+            fixtures = session.exec(select(func.count()).select_from(Fixture)).one()
+            if fixtures != TEAMS * (TEAMS - 1) + 1:
+                failures.append(f'{fixtures} fixtures stored, expected {TEAMS * (TEAMS - 1) + 1}')
+            if not session.exec(select(Fixture).where(Fixture.away_team_id == UNKNOWN_TEAM)).first():
+                failures.append(f'fixture against unknown Team {UNKNOWN_TEAM} was not stored')
+            if not session.exec(select(Standing).where(Standing.team_id == UNKNOWN_TEAM)).first():
+                failures.append(f'standing of unknown Team {UNKNOWN_TEAM} was not stored')
+        engine.dispose()
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# Micro-benchmark and guard for the fixture statistics parser (helper_functions.parse_stats)
+#
+# Parses a batch of team statistics the way /fixtures?ids= responses embed them, with the label-keyed parser and
+# with the positional parser it replaced, and checks that statistics in a different order, missing statistics and
+# statistics the database has no column for all land in the right fields.
+# Exits non-zero when a check fails or the label-keyed parser is over --max-slowdown times slower than the
+# positional one.
+#
+#   python benchmarks/bench_parse_stats.py --teams 20000
+
+# Import libraries
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from helper_functions import STAT_FIELDS, parse_stats, stat_number
+
+# Statistics in the order the API sends them
+API_ORDER = list(STAT_FIELDS)
+
+
+# The positional parser parse_stats replaced, kept as the baseline
+def safe_stats(stats, index):
+    try:
+        return stats['statistics'][index]['value']
+    except (IndexError, KeyError, TypeError):
+        return None
+
+def parse_stats_positional(stats: dict) -> dict:
+    values = [safe_stats(stats, i) for i in range(17)]
+    fields = list(STAT_FIELDS.values())
+    parsed = dict(zip(fields, values))
+    for field in ('possession', 'percent_pass', 'ex_goals'):
+        parsed[field] = stat_number(parsed[field])
+    return parsed
+
+
+# One team's statistics, the value of each is its position in API order unless it is a percentage or xG
+def team_stats(labels) -> dict:
+    values = {label: index for index, label in enumerate(API_ORDER)}
+    values.update({'Ball Possession': '55%', 'Passes %': '81%', 'expected_goals': '1.37'})
+    return {'team': {'id': 1}, 'statistics': [{'type': label, 'value': values.get(label, 0)} for label in labels]}
+
+# Fields a team's statistics should parse to, None for those it does not have
+def expected(labels) -> dict:
+    parsed = {field: None for field in STAT_FIELDS.values()}
+    for index, label in enumerate(API_ORDER):
+        if label in labels:
+            parsed[STAT_FIELDS[label]] = index
+    for label, value in (('Ball Possession', 55.0), ('Passes %', 81.0), ('expected_goals', 1.37)):
+        if label in labels:
+            parsed[STAT_FIELDS[label]] = value
+    return parsed
+
+
+# Parse every case with the label-keyed parser, returning the failures
+def check() -> list:
+    shuffled = API_ORDER[:]
+    random.Random(7).shuffle(shuffled)
+    cases = {
+        'API order': API_ORDER,
+        'reordered': shuffled,
+        'missing Offsides and Fouls': [label for label in API_ORDER if label not in ('Offsides', 'Fouls')],
+        'missing expected_goals': API_ORDER[:-1],
+        'extra goals_prevented': API_ORDER[:13] + ['goals_prevented'] + API_ORDER[13:],
+        'no statistics': [],
+    }
+    failures = []
+    for name, labels in cases.items():
+        parsed = parse_stats(team_stats(labels))
+        wrong = [field for field, value in expected(labels).items() if parsed[field] != value]
+        if wrong:
+            failures.append(f'{name}: wrong {", ".join(wrong)}')
+        if parse_stats_positional(team_stats(labels)) != expected(labels):
+            print(f'{name:>26}: the positional parser misplaces values')
+    if parse_stats({'team': {'id': 1}, 'statistics': None}) != expected([]):
+        failures.append('null statistics: not all None')
+    return failures
+
+
+# Seconds to parse the whole batch
+def measure(parser, batch: list) -> float:
+    start = time.perf_counter()
+    for stats in batch:
+        parser(stats)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--teams', type=int, default=20000, help='team statistics in the batch')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-slowdown', type=float, default=1.25, help='fail above this ratio to positional')
+    options = parser.parse_args()
+
+    failures = check()
+    batch = [team_stats(API_ORDER) for _ in range(options.teams)]
+    # Alternate the parsers so both see the same machine load
+    timings = [(measure(parse_stats_positional, batch), measure(parse_stats, batch)) for _ in range(options.repeat)]
+    positional = min(timing[0] for timing in timings)
+    labelled = min(timing[1] for timing in timings)
+    for name, seconds in (('positional', positional), ('label-keyed', labelled)):
+        print(f'{name:>26}: {seconds * 1000:.0f} ms for {options.teams} teams, '
+              f'{seconds / options.teams * 1e6:.1f} us per team')
+    if labelled > positional * options.max_slowdown:
+        failures.append(f'label-keyed parser took {labelled * 1000:.0f} ms, positional {positional * 1000:.0f} ms')
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# Speed and correctness guard for the local standings engine (standings_engine.compute_standings)
+#
+# Fills a throwaway database with a 20-team double round-robin season of random results, computes the table from
+# the fixtures and checks it against a GROUP BY over the same fixtures, that it is ordered by the tie-break rules and
+# that its rows have exactly the Standing model's columns. A small hand-made league checks the head-to-head rules.
+# Exits non-zero when a check fails or the 380-match table takes longer than --max-ms.
+#
+#   python benchmarks/bench_standings.py --max-ms 20
+
+# Import libraries
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sqlalchemy import case, func, literal, union_all
+from sqlmodel import Session, SQLModel, select
+
+from database import make_engine
+from models import Competition, Country, Fixture, Season, Standing, Team
+from standings_engine import DEFAULT_TIE_BREAKS, compute_standings, load_fixtures
+
+TEAMS = 20
+
+
+# One season of 380 fixtures, the last --unplayed of them not played yet
+def build(directory: str, unplayed: int):
+    engine = make_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", profile='production')
+    SQLModel.metadata.create_all(engine)
+    generator = random.Random(2023)
+    with Session(engine) as session:
+        session.add(Country(id=1, country_name='Benchland', num_comps=1))
+        session.flush()
+        session.add(Competition(comp_api_id=1, comp_country_id=1, country_name='Benchland', comp_name='Bench League',
+                                comp_type='League', comp_logo=''))
+        session.add(Season(id=1, year=2023, league_id=1))
+        session.flush()
+        session.bulk_insert_mappings(Team, [dict(team_api_id=team_id, name=f'Team {team_id}', country='Benchland',
+                                                 country_id=1, national=False, logo_url='') for team_id in range(TEAMS)])
+        pairs = [(home, away) for home in range(TEAMS) for away in range(TEAMS) if home != away]
+        generator.shuffle(pairs)
+        start = datetime(2023, 8, 1, tzinfo=timezone.utc)
+        played = len(pairs) - unplayed
+        session.bulk_insert_mappings(Fixture, [dict(
+            id=number + 1, season_id=1, home_team_id=home, away_team_id=away, competition_id=1,
+            date=start + timedelta(days=number // 10), round=f'Regular Season - {number // 10 + 1}',
+            short_status='FT' if number < played else 'NS',
+            home_goals=generator.randint(0, 4) if number < played else None,
+            away_goals=generator.randint(0, 3) if number < played else None)
+            for number, (home, away) in enumerate(pairs)])
+        session.commit()
+    return engine
+
+
+# Points, goal difference and goals for of each Team, aggregated in SQL
+def sql_table(session: Session) -> dict:
+    sides = union_all(
+        select(Fixture.home_team_id.label('team'), Fixture.home_goals.label('scored'),
+               Fixture.away_goals.label('conceded')).where(Fixture.short_status == 'FT'),
+        select(Fixture.away_team_id.label('team'), Fixture.away_goals.label('scored'),
+               Fixture.home_goals.label('conceded')).where(Fixture.short_status == 'FT'),
+    ).subquery()
+    points = case((sides.c.scored > sides.c.conceded, 3), (sides.c.scored == sides.c.conceded, 1), else_=0)
+    rows = session.exec(select(sides.c.team, func.sum(points), func.sum(sides.c.scored - sides.c.conceded),
+                               func.sum(sides.c.scored), func.count(literal(1))).group_by(sides.c.team)).all()
+    return {team: (points, goal_diff, goals_for, played) for team, points, goal_diff, goals_for, played in rows}
+
+
+# Three Teams level on points: 1 beat 2, 2 beat 3, 3 beat 1 by more, and 4 finishes below them all
+def check_head_to_head() -> list:
+    fixtures = [(home, away, home_goals, away_goals, 'Regular Season - 1', 'FT')
+                for home, away, home_goals, away_goals in ((1, 2, 1, 0), (2, 3, 1, 0), (3, 1, 3, 0),
+                                                           (1, 4, 5, 0), (2, 4, 1, 0), (3, 4, 1, 0))]
+    failures = []
+    expected = {
+        # Goal difference first: 1 and 3 are +3 and 3 won their match, 2 is +1
+        ('goal_diff', 'h2h_points'): [3, 1, 2, 4],
+        # Level on head-to-head points, so head-to-head goal difference decides: 3 is +2, 1 is -2, 2 is 0
+        ('points', 'h2h_points', 'h2h_goal_diff'): [3, 2, 1, 4],
+    }
+    for rules, order in expected.items():
+        ranked = [row['team_id'] for row in compute_standings(fixtures, 1, ['points', *rules])]
+        if ranked != order:
+            failures.append(f'tie-break {", ".join(rules)} ranked {ranked}, expected {order}')
+    ranked = [row['team_id'] for row in compute_standings(fixtures, 1, DEFAULT_TIE_BREAKS, matchday=0)]
+    if ranked != [1, 2, 3, 4]:
+        failures.append(f'no results ranked {ranked}, expected by Team ID')
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--unplayed', type=int, default=40, help='fixtures of the season still to be played')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-ms', type=float, default=20, help='fail if one table takes longer')
+    options = parser.parse_args()
+
+    failures = check_head_to_head()
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build(directory, options.unplayed)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            fixtures = load_fixtures(session, 1)
+            load_ms = (time.perf_counter() - start) * 1000
+            timings = []
+            for _ in range(options.repeat):
+                start = time.perf_counter()
+                rows = compute_standings(fixtures, 1)
+                timings.append((time.perf_counter() - start) * 1000)
+            expected = sql_table(session)
+        engine.dispose()
+
+    compute_ms = min(timings)
+    print(f'{len(fixtures)} fixtures: loaded in {load_ms:.1f} ms, table computed in {compute_ms:.2f} ms')
+    if compute_ms > options.max_ms:
+        failures.append(f'table took {compute_ms:.2f} ms')
+    columns = set(Standing.__table__.columns.keys()) - {'id'}
+    if any(set(row) != columns for row in rows):
+        failures.append('rows do not have the Standing columns')
+    for row in rows:
+        if (row['points'], row['goal_diff'], row['goals_for'], row['played']) != expected[row['team_id']]:
+            failures.append(f'Team {row["team_id"]} differs from the SQL aggregate')
+        if row['played'] != row['wins'] + row['draws'] + row['losses'] or \
+                row['played'] != row['home_played'] + row['away_played']:
+            failures.append(f'Team {row["team_id"]} games do not add up')
+    keys = [(row['points'], row['goal_diff'], row['goals_for']) for row in rows]
+    if keys != sorted(keys, reverse=True) or [row['position'] for row in rows] != list(range(1, TEAMS + 1)):
+        failures.append('table is not ordered by points, goal difference and goals for')
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# Startup-time benchmark for the CLI in src/functions.py
+#
+# Times cold starts of a read-only command and checks which modules each kind of command loads:
+# show-* commands must never import the HTTP stack, fetch commands must never import the display layer. Fetch
+# commands run for real in replay mode with no recordings, so every API request fails without touching the network.
+# Exits non-zero when a guard fails or the median start time exceeds --max-ms.
+#
+#   python benchmarks/bench_startup.py --runs 10 --max-ms 800
+
+# Import libraries
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Modules a command path must not load, tabulate is shared as fetch commands print their summary with it
+HTTP_MODULES = ['requests', 'api_request', 'helper_functions', 'rate_limiter']
+DISPLAY_MODULES = ['display_utils', 'export_utils', 'query_engine']
+
+# Fetch commands checked for display modules
+FETCH_COMMANDS = [
+    ['fetch-country', 'Benchland'],
+    ['fetch-countries', 'Benchland'],
+    ['fetch-season', 'Bench League', '2023'],
+    ['sync-season', 'Bench League', '2023'],
+    ['fetch-fixture-stats', '2023', 'Bench Team'],
+    ['fetch-season-stats', 'Bench League', '2023'],
+    ['backfill'],
+]
+
+# Run a CLI command in-process inside a fresh interpreter and report the modules it loaded
+PROBE = """
+import json, sys
+sys.path.insert(0, {src!r})
+import functions
+try:
+    functions.app({args!r}, standalone_mode=False)
+except Exception:
+    pass
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def loaded_modules(args, cwd):
+    code = PROBE.format(src=os.path.abspath(SRC), args=args)
+    output = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True)
+    return set(json.loads(output.stdout.strip().splitlines()[-1]))
+
+
+def time_command(args, cwd, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(SRC, 'functions.py'), *args], cwd=cwd,
+                       capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=1500, help='fail if the median start time is above this')
+    options = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as cwd:
+        # A database with one Country so show-countries has something to print
+        subprocess.run([sys.executable, os.path.join(SRC, 'functions.py'), 'init-db'], cwd=cwd,
+                       capture_output=True, check=True)
+        with sqlite3.connect(os.path.join(cwd, 'database.db')) as conn:
+            conn.execute("INSERT INTO country (country_name, num_comps) VALUES ('England', 0)")
+
+        show_modules = loaded_modules(['show-countries'], cwd)
+        for module in HTTP_MODULES:
+            if module in show_modules:
+                failures.append(f'show-countries imported {module}')
+        # An empty recordings directory makes every API request fail
+        recordings = os.path.join(cwd, 'recordings')
+        os.mkdir(recordings)
+        for command in FETCH_COMMANDS:
+            fetch_modules = loaded_modules(['--replay', recordings, *command], cwd)
+            for module in DISPLAY_MODULES:
+                if module in fetch_modules:
+                    failures.append(f'{command[0]} imported {module}')
+
+        timings = time_command(['show-countries'], cwd, options.runs)
+
+    median = statistics.median(timings)
+    print(f'show-countries cold start over {options.runs} runs: '
+          f'median {median:.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms')
+    print(f'modules loaded by show-countries: {len(show_modules)}')
+    if median > options.max_ms:
+        failures.append(f'median start time {median:.0f} ms is above {options.max_ms:.0f} ms')
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# Columnar loader benchmark for Fixture statistics (analytics.load_stats_numpy and load_stats_arrow)
+#
+# Fills a throwaway database with seasons of fixtures that all have statistics, then loads every fixture into a
+# per-team long layout twice: through ORM objects as the display code reads them, and through the columnar
+# loader. Reports the time taken and the peak memory held by Python objects for each, and checks that both agree.
+# Exits non-zero when the loader is not faster than the ORM path. Needs numpy, pyarrow is used when installed.
+#
+#   python benchmarks/bench_stats_loader.py --leagues 4 --seasons 5
+
+# Import libraries
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sqlmodel import Session, SQLModel, select
+
+from database import make_engine
+from models import Competition, Country, Fixture, FixtureStats, Season, Team
+from analytics import STAT_COLUMNS, load_stats_arrow, load_stats_numpy
+
+TEAMS = 20
+
+
+# Double round-robin seasons of 20 teams for each league, 380 fixtures a season
+def build(directory: str, leagues: int, seasons: int):
+    engine = make_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", profile='production')
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Country(id=1, country_name='Benchland', num_comps=leagues))
+        session.flush()
+        session.bulk_insert_mappings(Team, [
+            dict(team_api_id=team_id, name=f'Team {team_id}', country='Benchland', country_id=1, national=False,
+                 logo_url='') for team_id in range(leagues * TEAMS)])
+        fixtures, stats = [], []
+        for league in range(leagues):
+            session.add(Competition(comp_api_id=league, comp_country_id=1, country_name='Benchland',
+                                    comp_name=f'League {league}', comp_type='League', comp_logo=''))
+            teams = range(league * TEAMS, (league + 1) * TEAMS)
+            for season in range(seasons):
+                season_id = league * seasons + season
+                session.add(Season(id=season_id, year=2000 + season, league_id=league))
+                start = datetime(2000 + season, 8, 1, tzinfo=timezone.utc)
+                pairs = [(home, away) for home in teams for away in teams if home != away]
+                for number, (home, away) in enumerate(pairs):
+                    fixture_id = len(fixtures) + 1
+                    fixtures.append(dict(
+                        id=fixture_id, season_id=season_id, home_team_id=home, away_team_id=away,
+                        competition_id=league, date=start + timedelta(hours=number), short_status='FT',
+                        round=f'Regular Season - {number // 10 + 1}', home_goals=number % 4, away_goals=number % 3))
+                    stats.append({
+                        'fixture_id': fixture_id, 'home_team_id': home, 'away_team_id': away,
+                        **{f'{side}_{column}': number % 20 for side in ('home', 'away') for column in STAT_COLUMNS},
+                        'home_possession': 40.0 + number % 20, 'away_possession': 60.0 - number % 20,
+                        'home_percent_pass': 80.0, 'away_percent_pass': 75.0,
+                        'home_ex_goals': number % 300 / 100, 'away_ex_goals': number % 200 / 100})
+        session.flush()
+        session.bulk_insert_mappings(Fixture, fixtures)
+        session.bulk_insert_mappings(FixtureStats, stats)
+        session.commit()
+    return engine, len(fixtures)
+
+
+# Per-team rows built from ORM objects, one list per column
+def load_orm(session: Session) -> dict:
+    columns = {column: [] for column in ('fixture_id', 'team_id', 'home', 'goals_for', *STAT_COLUMNS)}
+    for fixture, fixturestats in session.exec(
+            select(Fixture, FixtureStats).join(FixtureStats, FixtureStats.fixture_id == Fixture.id)
+            .order_by(Fixture.date, Fixture.id)).all():
+        for side in ('home', 'away'):
+            columns['fixture_id'].append(fixture.id)
+            columns['team_id'].append(getattr(fixturestats, f'{side}_team_id'))
+            columns['home'].append(side == 'home')
+            columns['goals_for'].append(getattr(fixture, f'{side}_goals'))
+            for column in STAT_COLUMNS:
+                columns[column].append(getattr(fixturestats, f'{side}_{column}'))
+    return columns
+
+
+# Time and peak memory of one load
+def measure(engine, load):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with Session(engine) as session:
+        columns = load(session)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return columns, elapsed * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--leagues', type=int, default=4)
+    parser.add_argument('--seasons', type=int, default=5)
+    options = parser.parse_args()
+
+    try:
+        import pyarrow
+    except ImportError:
+        pyarrow = None
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        engine, fixtures = build(directory, options.leagues, options.seasons)
+        print(f'{fixtures} fixtures, {2 * fixtures} team rows')
+        orm, orm_ms, orm_mb = measure(engine, load_orm)
+        print(f'{"ORM objects":>12}: {orm_ms:.0f} ms, peak {orm_mb:.1f} MB')
+        arrays, numpy_ms, numpy_mb = measure(engine, load_stats_numpy)
+        print(f'{"numpy":>12}: {numpy_ms:.0f} ms, peak {numpy_mb:.1f} MB')
+        if pyarrow is not None:
+            table, arrow_ms, arrow_mb = measure(engine, load_stats_arrow)
+            print(f'{"arrow":>12}: {arrow_ms:.0f} ms, peak {arrow_mb:.1f} MB')
+            if table.num_rows != 2 * fixtures:
+                failures.append(f'arrow loaded {table.num_rows} rows')
+        engine.dispose()
+
+    for column in orm:
+        if arrays[column].tolist() != orm[column]:
+            failures.append(f'numpy column {column} differs from the ORM rows')
+    if numpy_ms >= orm_ms:
+        failures.append(f'numpy loader took {numpy_ms:.0f} ms, ORM objects {orm_ms:.0f} ms')
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Streaming benchmark for the show-* listings (display_utils.print_listing)
+#
+# Fills a throwaway database with many Teams, renders show-teams and measures how long the first line takes to
+# appear, the total time and the peak memory held by Python objects while rendering, then the same for each
+# --format.
+# Exits non-zero when the first line takes longer than --max-first-ms.
+#
+#   python benchmarks/bench_streaming.py --teams 50000 --max-first-ms 500
+
+# Import libraries
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from sqlmodel import Session, SQLModel
+
+from database import make_engine
+from models import Country, Team
+from display_utils import print_listing
+from export_utils import make_output
+from query_engine import Filters
+
+
+# Output sink that notes when the first line is written
+class FirstWrite(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.first = None
+
+    def write(self, text):
+        if self.first is None and text.strip():
+            self.first = time.perf_counter()
+        return len(text)
+
+
+def build(directory: str, teams: int):
+    engine = make_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", profile='production')
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Country(id=1, country_name='Benchland', num_comps=0))
+        session.flush()
+        session.bulk_insert_mappings(Team, [
+            dict(team_api_id=team_id, name=f'Team {team_id:06d}', short_name=f'T{team_id}', country='Benchland',
+                 country_id=1, founded=1900 + team_id % 120, national=False, logo_url=f'https://logo/{team_id}.png')
+            for team_id in range(teams)])
+        session.commit()
+    return engine
+
+
+def measure(engine, limit=None, output_format='pretty'):
+    sink = FirstWrite()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with Session(engine) as session, contextlib.redirect_stdout(sink):
+        print_listing(session, 'teams', Filters(), limit=limit, output=make_output(output_format))
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (sink.first - start) * 1000, total * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--teams', type=int, default=50000)
+    parser.add_argument('--max-first-ms', type=float, default=None, help='fail if the first line is slower')
+    options = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build(directory, options.teams)
+        for limit in (None, 100):
+            first_ms, total_ms, peak_mb = measure(engine, limit)
+            label = f'{options.teams} teams' if limit is None else f'--limit {limit}'
+            print(f'{label:>14}: first line {first_ms:.0f} ms, total {total_ms:.0f} ms, peak {peak_mb:.1f} MB')
+            if options.max_first_ms is not None and first_ms > options.max_first_ms:
+                failures.append(f'{label} first line took {first_ms:.0f} ms')
+        for output_format in ('jsonl', 'csv'):
+            first_ms, total_ms, peak_mb = measure(engine, output_format=output_format)
+            label = f'--format {output_format}'
+            print(f'{label:>14}: first line {first_ms:.0f} ms, total {total_ms:.0f} ms, peak {peak_mb:.1f} MB')
+        engine.dispose()
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
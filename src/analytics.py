@@ -0,0 +1,123 @@
+# Import libraries
+from datetime import datetime
+from sqlalchemy import DateTime, literal, or_, type_coerce, union_all
+from sqlmodel import Session, select
+from typing import List, NamedTuple, Optional
+
+# Import Models
+from models import Fixture, FixtureStats, Season, Team, check_fixture_stats_columns
+
+# Import Functions
+from query_engine import competition_id_stmt
+
+# Rows fetched from the database per chunk, each chunk becomes one slice of the arrays
+CHUNK_SIZE = 10000
+
+# Statistics of a Fixture, by FixtureStats field without its home_/away_ prefix
+STAT_COLUMNS = [
+    'sh_on_goal', 'sh_off_goal', 'total_sh', 'blocked_sh', 'sh_inside', 'sh_outside', 'fouls', 'corners',
+    'offsides', 'possession', 'yellows', 'reds', 'saves', 'tot_passes', 'accurate_pass', 'percent_pass',
+    'ex_goals',
+]
+# Statistics stored as real numbers, the rest are counts
+RATIO_STAT_COLUMNS = ('possession', 'percent_pass', 'ex_goals')
+
+
+# Filters for the Fixtures to load, any combination can be given
+# Each Competition name picks the same single Competition as the show commands when several Countries use it
+# date_from and date_to must be timezone-aware, e.g. datetime(2023, 1, 1, tzinfo=timezone.utc)
+class StatsFilters(NamedTuple):
+    competitions: Optional[List[str]] = None
+    years: Optional[List[int]] = None
+    team_name: Optional[str] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+# Kinds of column in the long layout: ids, the kick-off time, the home flag, counts and ratios
+COLUMN_KINDS = {
+    'fixture_id': 'id', 'competition_id': 'id', 'year': 'id', 'team_id': 'id', 'opponent_id': 'id',
+    'date': 'time', 'home': 'flag', 'goals_for': 'count', 'goals_against': 'count',
+    **{column: 'ratio' if column in RATIO_STAT_COLUMNS else 'count' for column in STAT_COLUMNS},
+}
+
+
+# One side of every Fixture with statistics, as a row for that side's Team against its opponent
+def side_stmt(side: str, filters: StatsFilters):
+    other = 'away' if side == 'home' else 'home'
+    team_id = getattr(FixtureStats, f'{side}_team_id')
+    stmt = (select(Fixture.id.label('fixture_id'),
+                   # Plain DateTime, so dates come back without a timezone and convert to datetime64 directly
+                   type_coerce(Fixture.date, DateTime).label('date'),
+                   Fixture.competition_id.label('competition_id'),
+                   Season.year.label('year'),
+                   team_id.label('team_id'),
+                   getattr(FixtureStats, f'{other}_team_id').label('opponent_id'),
+                   literal(side == 'home').label('home'),
+                   getattr(Fixture, f'{side}_goals').label('goals_for'),
+                   getattr(Fixture, f'{other}_goals').label('goals_against'),
+                   *(getattr(FixtureStats, f'{side}_{column}').label(column) for column in STAT_COLUMNS))
+            .select_from(FixtureStats)
+            .join(Fixture, Fixture.id == FixtureStats.fixture_id)
+            .join(Season, Season.id == Fixture.season_id))
+    if filters.competitions:
+        stmt = stmt.where(or_(*(Fixture.competition_id == competition_id_stmt(name).scalar_subquery()
+                                for name in filters.competitions)))
+    if filters.years:
+        stmt = stmt.where(Season.year.in_(filters.years))
+    if filters.team_name is not None:
+        stmt = stmt.where(team_id.in_(select(Team.team_api_id).where(Team.name == filters.team_name)))
+    if filters.date_from is not None:
+        stmt = stmt.where(Fixture.date >= filters.date_from)
+    if filters.date_to is not None:
+        stmt = stmt.where(Fixture.date <= filters.date_to)
+    return stmt
+
+# Both sides of every Fixture in one query, two rows per Fixture in a long layout with one row per Team
+def long_stats_stmt(filters: StatsFilters):
+    home = side_stmt('home', filters)
+    away = side_stmt('away', filters)
+    stmt = union_all(home, away).subquery()
+    return select(stmt).order_by(stmt.c.date, stmt.c.fixture_id, stmt.c.home.desc())
+
+# Stream the rows of the long layout in chunks of plain tuples, no ORM objects are built
+def stats_chunks(session: Session, filters: StatsFilters, chunk_size: int = CHUNK_SIZE):
+    connection = session.connection()
+    check_fixture_stats_columns(connection)
+    result = connection.execution_options(yield_per=chunk_size).execute(long_stats_stmt(filters))
+    return result.keys(), result.partitions()
+
+#********************************************************************************************#
+
+#**********************************     Loaders         *************************************#
+
+#********************************************************************************************#
+
+# Load Fixture statistics as a dict of contiguous NumPy arrays, one per column, missing counts are NaN
+def load_stats_numpy(session: Session, filters: StatsFilters = StatsFilters(), chunk_size: int = CHUNK_SIZE) -> dict:
+    try:
+        import numpy as np
+    except ImportError:
+        raise ValueError('Loading statistics as NumPy arrays needs numpy: pip install numpy')
+    dtypes = {'id': np.int64, 'time': 'datetime64[us]', 'flag': np.bool_, 'count': np.float64, 'ratio': np.float64}
+    columns, chunks = stats_chunks(session, filters, chunk_size)
+    parts = {column: [] for column in columns}
+    for chunk in chunks:
+        for column, values in zip(columns, zip(*chunk)):
+            parts[column].append(np.array(values, dtype=dtypes[COLUMN_KINDS[column]]))
+    return {column: np.concatenate(arrays) if arrays else np.empty(0, dtype=dtypes[COLUMN_KINDS[column]])
+            for column, arrays in parts.items()}
+
+# Load Fixture statistics as an Arrow table, one record batch per chunk, missing values are nulls
+def load_stats_arrow(session: Session, filters: StatsFilters = StatsFilters(), chunk_size: int = CHUNK_SIZE):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError('Loading statistics as an Arrow table needs pyarrow: pip install pyarrow')
+    types = {'id': pa.int64(), 'time': pa.timestamp('us', tz='UTC'), 'flag': pa.bool_(), 'count': pa.int64(),
+             'ratio': pa.float64()}
+    columns, chunks = stats_chunks(session, filters, chunk_size)
+    schema = pa.schema([(column, types[COLUMN_KINDS[column]]) for column in columns])
+    batches = [pa.RecordBatch.from_arrays([pa.array(values, type=field.type)
+                                           for values, field in zip(zip(*chunk), schema)], schema=schema)
+               for chunk in chunks]
+    return pa.Table.from_batches(batches, schema=schema)
@@ -1,20 +1,138 @@
+# Import libraries
 import config
 import requests
+import time
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 from rich.console import Console
+from urllib.parse import urlsplit
+
+# Import Functions
+from rate_limiter import RateLimiter, limiter as shared_limiter
+from recorder import Recorder
+from response_cache import ResponseCache, cache as shared_cache
 
 console = Console()
 
+# Client Settings (override any of these in config.py)
+API_HOST = 'v3.football.api-sports.io'
+API_LIVE_URL = f'https://{API_HOST}'
+API_BASE_URL = getattr(config, 'API_BASE_URL', API_LIVE_URL)  # point at stub_server.py for offline runs
+API_TIMEOUT = getattr(config, 'API_TIMEOUT', (5, 30))  # (connect, read) seconds
+API_MAX_RETRIES = getattr(config, 'API_MAX_RETRIES', 5)
+API_BACKOFF_FACTOR = getattr(config, 'API_BACKOFF_FACTOR', 1.0)
+API_BACKOFF_MAX = getattr(config, 'API_BACKOFF_MAX', 60)
+API_POOL_SIZE = getattr(config, 'API_POOL_SIZE', 10)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+# Shared HTTP Client with keep-alive connection pooling and retries
+class ApiClient:
+    def __init__(self, api_key: str = config.API_KEY, timeout=API_TIMEOUT, max_retries: int = API_MAX_RETRIES,
+                 backoff_factor: float = API_BACKOFF_FACTOR, backoff_max: float = API_BACKOFF_MAX,
+                 pool_size: int = API_POOL_SIZE, limiter: RateLimiter = shared_limiter,
+                 cache: ResponseCache = shared_cache):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.limiter = limiter
+        self.cache = cache
+        # Set to False to neither read nor store cached responses
+        self.use_cache = True
+        self.base_url = API_BASE_URL
+        # 'live' calls the API, 'record' also saves every response, 'replay' only serves saved responses
+        self.mode = 'live'
+        self.recorder = None
+        # One Session reuses TCP/TLS connections across calls, headers are set once
+        self.session = requests.Session()
+        self.session.headers.update({
+            'x-rapidapi-key': api_key,
+            'x-rapidapi-host': API_HOST
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    # Switch to record or replay mode using recordings kept in `directory`
+    def set_mode(self, mode: str, directory: str = None):
+        if mode not in ('live', 'record', 'replay'):
+            raise ValueError(f'Unknown API client mode: {mode}')
+        self.mode = mode
+        self.recorder = Recorder(directory) if directory else None
+
+    # Seconds to wait before the next attempt, honouring Retry-After when the server sends it
+    def retry_delay(self, attempt: int, response: requests.Response = None) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                    return min(max(delay, 0), self.backoff_max)
+                except (TypeError, ValueError):
+                    pass
+        return min(self.backoff_factor * (2 ** attempt), self.backoff_max)
 
-def api_request(url: str, params: dict = None):
-    headers = {
-        'x-rapidapi-key': config.API_KEY,
-        'x-rapidapi-host': 'v3.football.api-sports.io'
-    }
+    # GET a URL and return the decoded JSON body, from the response cache or the API with retries
+    # finished marks a response about finished Fixtures that the cache can keep for good
+    def get(self, url: str, params: dict = None, finished: bool = False) -> dict:
+        endpoint = urlsplit(url).path
+        base_url = self.base_url.rstrip('/')
+        url = base_url + endpoint
+        # Responses from any other server, such as the stub server, are cached apart from the live API's
+        server = None if base_url == API_LIVE_URL else base_url
+        if self.mode == 'replay':
+            data = self.recorder.load(endpoint, params)
+            if data is None:
+                raise requests.exceptions.RequestException(f'No recording for {endpoint} with params {params}')
+            return data
+        # Recording always goes to the API so every response is captured
+        if self.use_cache and self.mode == 'live':
+            data = self.cache.get(endpoint, params, server)
+            if data is not None:
+                return data
+        attempt = 0
+        while True:
+            # Wait for the endpoint's token bucket, every attempt counts against the quota
+            self.limiter.acquire(endpoint)
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_delay(attempt)
+                console.print(f'API Request error ({e.__class__.__name__}), retrying in {delay:.1f}s.',
+                              style="yellow")
+            else:
+                self.limiter.update_from_headers(response.headers)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    data = response.json()
+                    # API-Sports reports rate limiting in the body of a 200 response
+                    errors = data.get('errors')
+                    if not (isinstance(errors, dict) and 'rateLimit' in errors) or attempt >= self.max_retries:
+                        if self.use_cache:
+                            self.cache.put(endpoint, params, data, server, finished)
+                        if self.mode == 'record':
+                            self.recorder.save(endpoint, params, data)
+                        return data
+                delay = self.retry_delay(attempt, response)
+                console.print(f'API Request returned {response.status_code}, retrying in {delay:.1f}s.',
+                              style="yellow")
+            time.sleep(delay)
+            attempt += 1
+
+
+# Shared client used by every api_request call
+client = ApiClient()
+
+
+def api_request(url: str, params: dict = None, finished: bool = False):
     # Try API Request and user error handling
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = client.get(url, params, finished)
         if data.get('results', 0) == 0:
             raise ValueError(f'No results returned. API response: {data}')
         return data
@@ -23,4 +141,4 @@ def api_request(url: str, params: dict = None):
         return {}
     except ValueError as ve:
         console.print(str(ve), style="red")
-        return {}
\ No newline at end of file
+        return {}
@@ -1 +1,40 @@
-API_KEY = "api_key_goes_here"
\ No newline at end of file
+API_KEY = "api_key_goes_here"
+
+# Optional HTTP client settings (defaults shown)
+# API_TIMEOUT = (5, 30)          # (connect, read) timeout in seconds
+# API_MAX_RETRIES = 5            # retries on connection errors, 429 and 5xx responses
+# API_BACKOFF_FACTOR = 1.0       # exponential backoff base in seconds, Retry-After takes priority
+# API_BACKOFF_MAX = 60           # longest single wait between retries in seconds
+# API_POOL_SIZE = 10             # keep-alive connections kept open to the API
+
+# Optional rate limit settings
+# API_PLAN = "free"              # free, pro, ultra or mega, sets requests per minute/day for all calls
+# API_ENDPOINT_LIMITS = {        # stricter (requests per minute, requests per day) for single endpoints
+#     "/fixtures/statistics": (10, 100),
+# }
+
+# Optional API response cache settings
+# API_CACHE_PATH = "api_cache.db"   # SQLite file holding cached API responses
+# API_CACHE_TTLS = {                # seconds each endpoint stays cached, None caches forever
+#     "/leagues": 604800,
+#     "fixtures_open": 300,         # /fixtures responses with unfinished fixtures
+#     "standings_current": 600,     # /standings for the current season
+# }
+
+# Optional API server address, e.g. "http://127.0.0.1:8080" to use src/stub_server.py
+# API_BASE_URL = "https://v3.football.api-sports.io"
+
+# Optional sync-season setting
+# SYNC_POSTPONED_DAYS = 14       # days a postponed fixture keeps the synced date range open before it is fetched by ID
+
+# Optional tie-break rules for standings computed from fixtures, by competition name. Each rule is a Standing column,
+# higher is better, and an h2h_ prefix compares it over the matches between the tied teams only
+# STANDINGS_TIE_BREAKS = {
+#     "Premier League": ["points", "goal_diff", "goals_for", "h2h_points", "h2h_away_goals_for"],
+# }
+
+# Optional database settings
+# DB_URL = "sqlite:///database.db"
+# DB_PROFILE = "production"      # "production" (WAL, synchronous=NORMAL, large cache, mmap) or "default"
+# DB_ECHO = False                # log every SQL statement, also available as the --echo-sql option
+# DB_PRAGMAS = {}                # extra or overriding pragmas, e.g. {"busy_timeout": 5000}
@@ -1,6 +1,47 @@
 # Import libraries
+import config
+from sqlalchemy import event
 from sqlmodel import create_engine
 
+# Database Settings (override in config.py)
+DB_URL = getattr(config, 'DB_URL', "sqlite:///database.db")
+DB_PROFILE = getattr(config, 'DB_PROFILE', 'production')
+DB_ECHO = getattr(config, 'DB_ECHO', False)
+DB_PRAGMAS = getattr(config, 'DB_PRAGMAS', {})
+
+# SQLite pragmas set on every new connection, by profile
+PROFILES = {
+    # SQLite defaults, rollback journal and a full fsync on every commit
+    'default': {},
+    # Tuned for bulk ingest: WAL lets readers run during writes and syncs only at checkpoints
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,  # negative is KiB, so 64 MB of page cache
+        'mmap_size': 268435456,  # 256 MB memory-mapped reads
+        'temp_store': 'MEMORY',
+        # Foreign keys stay off as in SQLite's default: fixtures and standings name Teams that are never fetched,
+        # such as Welsh clubs in English leagues or cup opponents from other countries
+    },
+}
+
+
+# Create an engine whose connections are configured with the pragmas of a profile
+def make_engine(url: str = DB_URL, profile: str = DB_PROFILE, echo: bool = DB_ECHO, pragmas: dict = None):
+    if profile not in PROFILES:
+        raise ValueError(f'Unknown database profile: {profile}. Choose from {", ".join(PROFILES)}.')
+    new_engine = create_engine(url, echo=echo)
+    settings = {**PROFILES[profile], **DB_PRAGMAS, **(pragmas or {})}
+
+    @event.listens_for(new_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    return new_engine
+
+
 # Create SQLite database file
-sqlite_url = "sqlite:///database.db"
-engine = create_engine(sqlite_url, echo=True)
\ No newline at end of file
+engine = make_engine()
@@ -2,133 +2,95 @@
 from sqlmodel import Session, select, or_, and_
 from rich.console import Console
 from tabulate import tabulate
+from itertools import chain
 from sqlalchemy.orm import aliased
 
 # Import Models
-from models import (Competition, Country, Fixture, FixtureStats, Season, Standing, Team,
-                    TeamSeasonCompetition, Venue)
+from models import Competition, Country, Fixture, FixtureStats, Season, Standing, Team, Venue
 
 # Import Functions
-from helper_functions import make_fix_stats_table
+from export_utils import Output, column_types, export_rows
+from query_engine import Filters, compile_query, competition_id_stmt, describe, empty_message
+from resolver import resolver
+from standings_engine import compute_standings, final_results, load_fixtures, matchday_number, tie_breaks_for
 
 # Create console
 console = Console()
 
-#********************************************************************************************#
 
-#**********************************     Competitions    *************************************#
+# Season ID for a Competition name and Year, used as a subquery so the lookup runs inside the main query
+def season_id_stmt(competition_name: str, year: int):
+    return select(Season.id).where((Season.league_id == competition_id_stmt(competition_name).scalar_subquery())
+                                   & (Season.year == year))
+
+# Explain an empty result, raising the message of the first lookup that finds nothing
+def check_found(session: Session, checks: list):
+    for stmt, message in checks:
+        if session.exec(stmt).first() is None:
+            raise ValueError(message)
+
+# Rows printed per table page, and fetched from the database per batch
+PAGE_SIZE = 50
+
+# Stream a statement's rows in batches instead of loading them all, LIMIT and OFFSET are applied in SQL
+def stream_rows(session: Session, stmt, limit: int = None, offset: int = 0, page_size: int = PAGE_SIZE):
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return iter(session.exec(stmt.execution_options(yield_per=page_size)))
+
+# Print rows as they arrive, one table per page, the first page fixes the column widths for the rest
+def print_pages(rows, headers: list, page_size: int = PAGE_SIZE) -> int:
+    printed = 0
+    page = []
+    for row in rows:
+        page.append(row)
+        if len(page) == page_size:
+            headers = print_page(page, headers, printed)
+            printed += len(page)
+            page = []
+    if page or not printed:
+        print_page(page, headers, printed)
+        printed += len(page)
+    return printed
+
+# Print one page, widening the headers on the first page so later pages line up with it
+def print_page(page: list, headers: list, printed: int) -> list:
+    if not printed:
+        headers = [str(header).center(max([len(str(header))] + [len(str(row[i])) for row in page]))
+                   for i, header in enumerate(headers)]
+    print(tabulate(page, headers=headers, tablefmt="pretty"))
+    return headers
+
+# Print rows under a title, or write them in the machine-readable format asked for without one
+def write_rows(rows, headers: list, output: Output, title: str, types: list = None):
+    if output.format != 'pretty':
+        export_rows(rows, headers, output, types)
+        return
+    console.print(title)
+    print_pages(rows, headers)
 
 #********************************************************************************************#
 
-# Display all Competitions
-def print_comps(session: Session):
-    # Find Competitions
-    comps_stmt = (
-        select(Competition)
-        .order_by(Competition.country_name)
-        .order_by(Competition.comp_type.desc())
-        .order_by(Competition.comp_name))
-    competitions = session.exec(comps_stmt).all()
-    if not competitions:
-        raise ValueError(f'No Competitions found.')
-    # Print Table
-    data = []
-    for comp in competitions:
-        data.append([
-            comp.country_name,
-            comp.comp_name,
-            comp.comp_type,
-            comp.comp_logo
-        ])
-    headers = [
-        "Name", "Type", "Logo"
-    ]
+#**********************************     Listings        *************************************#
 
-    console.print(f"\n[bold] All Competitions")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all Competitions for a Country
-def print_comps_country(session: Session, country_name):
-    # Find Country
-    country_stmt = select(Country).where(Country.country_name == country_name)
-    country = session.exec(country_stmt).first()
-    if not country:
-        raise ValueError(f'Country: {country_name} not found.')
-    # Find Competitions
-    comps_stmt = (
-        select(Competition).where(Competition.comp_country_id == country.id)
-        .order_by(Competition.comp_type.desc())
-        .order_by(Competition.comp_name))
-    competitions = session.exec(comps_stmt).all()
-    if not competitions:
-        raise ValueError(f'No Competitions found for {country.country_name}.')
-    # Print Table
-    data = []
-    for comp in competitions:
-        data.append([
-            comp.comp_name,
-            comp.comp_type,
-            comp.comp_logo
-        ])
-    headers = [
-        "Name", "Type", "Logo"
-    ]
-
-    console.print(f"\n[bold] All Competitions for[/bold] [green]{country.country_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all League or Cup Competitions for a Country
-def print_comps_country_type(session: Session, country_name, comp_type):
-    # Find Country
-    country_stmt = select(Country).where(Country.country_name == country_name)
-    country = session.exec(country_stmt).first()
-    if not country:
-        raise ValueError(f'Country: {country_name} not found.')
-    # Find Competitions
-    comps_stmt = select(Competition).where(
-        (Competition.comp_country_id == country.id) & (Competition.comp_type == comp_type)).order_by(Competition.comp_name)
-    competitions = session.exec(comps_stmt).all()
-    if not competitions:
-        raise ValueError(f'No {comp_type} Competitions found for {country.country_name}.')
-    # Print Table
-    data = []
-    for comp in competitions:
-        data.append([
-            comp.comp_name,
-            comp.comp_logo
-        ])
-    headers = [
-        "Name", "Logo"
-    ]
+#********************************************************************************************#
 
-    console.print(f"\n[bold] All[/bold] [green]{comp_type}[/green] [bold]Competitions for[/bold] [green]{country.country_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all League or Cup Competitions for all Countries
-def print_comps_type(session: Session, comp_type):
-    # Find Competitions
-    comps_stmt = (
-        select(Competition, Country).where(Competition.comp_type == comp_type)
-        .join(Country, Country.id == Competition.comp_country_id)
-        .order_by(Country.country_name)
-        .order_by(Competition.comp_name))
-    competitions = session.exec(comps_stmt).all()
-    if not competitions:
-        raise ValueError(f'No {comp_type} Competitions found.')
+# Display Competitions, Seasons, Teams or Venues for any combination of filters, from one query
+def print_listing(session: Session, entity: str, filters: Filters, limit: int = None, offset: int = 0,
+                  output: Output = Output()):
+    query = compile_query(entity, filters)
+    rows = stream_rows(session, query.stmt, limit, offset)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError(empty_message(session, entity, filters))
+    rows = chain([first], rows)
+    # A single column comes back as plain values
+    if len(query.headers) == 1:
+        rows = ([row] for row in rows)
     # Print Table
-    data = []
-    for comp, country in competitions:
-        data.append([
-            comp.comp_name,
-            country.country_name,
-            comp.comp_logo
-        ])
-    headers = [
-        "Name", "Country", "Logo"
-    ]
-
-    console.print(f"\n[green]{comp_type}[/green] [bold]Competitions for all Countries")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
+    write_rows(rows, query.headers, output, f"\n[bold]{describe(entity, filters)}", column_types(query.stmt))
 
 #********************************************************************************************#
 
@@ -137,27 +99,20 @@ def print_comps_type(session: Session, comp_type):
 #********************************************************************************************#
 
 # Display all Countries
-def print_countries(session: Session):
+def print_countries(session: Session, limit: int = None, offset: int = 0, output: Output = Output()):
     # Find Countries
-    countries_stmt = select(Country).order_by(Country.country_name)
-    countries = session.exec(countries_stmt).all()
-    if not countries:
+    countries_stmt = (select(Country.country_name, Country.num_comps, Country.code, Country.flag)
+                      .order_by(Country.country_name))
+    countries = stream_rows(session, countries_stmt, limit, offset)
+    first = next(countries, None)
+    if first is None:
         raise ValueError(f' No Countries found.')
     # Print Table
-    data = []
-    for country in countries:
-        data.append([
-            country.country_name,
-            country.num_comps,
-            country.code,
-            country.flag
-        ])
     headers = [
         "Name", "Number of Competitions", "Code", "Flag"
     ]
 
-    console.print(f"\n[bold]Countries")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
+    write_rows(chain([first], countries), headers, output, f"\n[bold]Countries", column_types(countries_stmt))
 
 #********************************************************************************************#
 
@@ -165,148 +120,73 @@ def print_countries(session: Session):
 
 #********************************************************************************************#
 
-# Display All Fixtures for a Season
-def print_fixtures_season(session: Session, competition_name: str, year: int):
-    # Find League ID
-    competition_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(competition_stmt).first()
-    if not competition:
-        raise ValueError(f'Could not find Competition: {competition_name}')
-    # Find Season ID
-    season_stmt = select(Season).where(
-        (Season.league_id == competition.comp_api_id) & (Season.year == year)
-    )
-    season = session.exec(season_stmt).first()
-    if not season:
-        raise ValueError(f'Could not find Season for: {year} {competition_name}.')
+# Fixtures of a Season as plain columns, only those of one Team when a name is given
+def fixtures_stmt(competition_name: str, year: int, team_name: str = None):
     # Create aliases to join Team table twice
     HomeTeam = aliased(Team)
     AwayTeam = aliased(Team)
-    # Query Fixtures, teams, venue
-    fixtures = session.exec(
-        select(Fixture, HomeTeam.name.label("home_team_name"), AwayTeam.name.label("away_team_name"), Venue)
-        .join(HomeTeam, Fixture.home_team_id == HomeTeam.team_api_id)
-        .join(AwayTeam, Fixture.away_team_id == AwayTeam.team_api_id)
-        .join(Venue, Fixture.venue_id == Venue.venue_api_id)
-        .where(Fixture.season_id == season.id)
-        .order_by(Fixture.date)
-    ).all()
-    # Print Table
-    data = []
-    # Premier League
-    if competition.comp_type == 'League':
-        for fixture, home_team_name, away_team_name, venue in fixtures:
-            round_str = fixture.round
-            matchday_num = int(round_str.split(" - ")[-1])
-            data.append([
-                matchday_num,
-                fixture.date,
-                home_team_name,
-                fixture.home_goals,
-                away_team_name,
-                fixture.away_goals,
-                fixture.referee,
-                venue.name
-            ])
-        headers = [
-            "Match Day", "Date", "Home Team", "Home Score", "Away Team", "Away Score", "Referee", "Venue"
-        ]
-        console.print(f"\n[bold]Fixtures from the[/bold] "
-                      f"[green]{year} {competition_name}[/green] [bold]season")
-        print(tabulate(data, headers=headers, tablefmt="pretty"))
+    stmt = (select(Fixture.round, Fixture.date, HomeTeam.name.label("home_team_name"), Fixture.home_goals,
+                   AwayTeam.name.label("away_team_name"), Fixture.away_goals, Fixture.referee,
+                   Venue.name.label("venue_name"), Competition.comp_type)
+            .join(HomeTeam, Fixture.home_team_id == HomeTeam.team_api_id)
+            .join(AwayTeam, Fixture.away_team_id == AwayTeam.team_api_id)
+            .join(Venue, Fixture.venue_id == Venue.venue_api_id)
+            .join(Competition, Competition.comp_api_id == Fixture.competition_id)
+            .where(Fixture.season_id == season_id_stmt(competition_name, year).scalar_subquery()))
+    if team_name is not None:
+        # Either side's name picks out the Team's Fixtures
+        stmt = stmt.where(or_(HomeTeam.name == team_name, AwayTeam.name == team_name))
+    return stmt.order_by(Fixture.date)
+
+# Print or write Fixtures as they arrive, League rounds are shown as their Match Day number
+# Match Day number of a League round, or the round as named when it is not a Match Day, such as a play-off Final
+def round_label(round_name: str):
+    matchday = matchday_number(round_name)
+    return round_name if matchday is None else matchday
+
+def write_fixtures(first, fixtures, stmt, output: Output, title: str):
+    league = first is not None and first.comp_type == 'League'
+    headers = [
+        "Match Day" if league else "Round", "Date", "Home Team", "Home Score", "Away Team", "Away Score", "Referee",
+        "Venue"
+    ]
+    types = [int if league else str, *column_types(stmt)[1:8]]
+    rows = chain([first], fixtures) if first is not None else fixtures
+    write_rows(([round_label(row.round) if league else row.round, *row[1:8]] for row in rows), headers,
+               output, title, types)
 
-    else:
-        for fixture, home_team_name, away_team_name, venue in fixtures:
-            data.append([
-                fixture.round,
-                fixture.date,
-                home_team_name,
-                fixture.home_goals,
-                away_team_name,
-                fixture.away_goals,
-                fixture.referee,
-                venue.name
-            ])
-        headers = [
-            "Round", "Date", "Home Team", "Home Score", "Away Team", "Away Score", "Referee", "Venue"
-        ]
-        console.print(f"\n[bold]Fixtures from the[/bold] "
-                      f"[green]{year} {competition_name}[/green] [bold]season")
-        print(tabulate(data, headers=headers, tablefmt="pretty"))
+# Display All Fixtures for a Season
+def print_fixtures_season(session: Session, competition_name: str, year: int, limit: int = None, offset: int = 0,
+                          output: Output = Output()):
+    stmt = fixtures_stmt(competition_name, year)
+    fixtures = stream_rows(session, stmt, limit, offset)
+    first = next(fixtures, None)
+    if first is None:
+        check_found(session, [
+            (competition_id_stmt(competition_name), f'Could not find Competition: {competition_name}'),
+            (season_id_stmt(competition_name, year), f'Could not find Season for: {year} {competition_name}.')
+        ])
+    # Print Table
+    write_fixtures(first, fixtures, stmt, output,
+                   f"\n[bold]Fixtures from the[/bold] [green]{year} {competition_name}[/green] [bold]season")
 
 
 # Display All Fixtures of one Team for a Season
-def print_fixtures_season_team(session: Session, competition_name: str, year: int, team_name: str):
-    # Find League ID
-    competition_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(competition_stmt).first()
-    if not competition:
-        raise ValueError(f'Could not find Competition: {competition_name}')
-    # Find Season ID
-    season_stmt = select(Season).where(
-        (Season.league_id == competition.comp_api_id) & (Season.year == year)
-    )
-    season = session.exec(season_stmt).first()
-    if not season:
-        raise ValueError(f'Could not find Season for: {year} {competition_name}.')
-    # Find Team
-    team_stmt = select(Team).where(Team.name == team_name)
-    team = session.exec(team_stmt).first()
-    # Create aliases for Team
-    HomeTeam = aliased(Team)
-    AwayTeam = aliased(Team)
-    # Query Fixtures, teams, venue
-    fixtures = session.exec(
-        select(Fixture, HomeTeam.name.label("home_team_name"), AwayTeam.name.label("away_team_name"), Venue)
-        .join(HomeTeam, Fixture.home_team_id == HomeTeam.team_api_id)
-        .join(AwayTeam, Fixture.away_team_id == AwayTeam.team_api_id)
-        .join(Venue, Fixture.venue_id == Venue.venue_api_id)
-        .where(
-            (Fixture.season_id == season.id) & or_((Fixture.home_team_id == team.team_api_id), Fixture.away_team_id == team.team_api_id))
-        .order_by(Fixture.date)
-    ).all()
+def print_fixtures_season_team(session: Session, competition_name: str, year: int, team_name: str,
+                               limit: int = None, offset: int = 0, output: Output = Output()):
+    stmt = fixtures_stmt(competition_name, year, team_name)
+    fixtures = stream_rows(session, stmt, limit, offset)
+    first = next(fixtures, None)
+    if first is None:
+        check_found(session, [
+            (competition_id_stmt(competition_name), f'Could not find Competition: {competition_name}'),
+            (season_id_stmt(competition_name, year), f'Could not find Season for: {year} {competition_name}.'),
+            (select(Team.team_api_id).where(Team.name == team_name), f'Could not find Team: {team_name}')
+        ])
     # Print Table
-    data = []
-    # Premier League
-    if competition.comp_type == 'League':
-        for fixture, home_team_name, away_team_name, venue in fixtures:
-            round_str = fixture.round
-            matchday_num = int(round_str.split(" - ")[-1])
-            data.append([
-                matchday_num,
-                fixture.date,
-                home_team_name,
-                fixture.home_goals,
-                away_team_name,
-                fixture.away_goals,
-                fixture.referee,
-                venue.name
-            ])
-        headers = [
-            "Match Day", "Date", "Home Team", "Home Score", "Away Team", "Away Score", "Referee", "Venue"
-        ]
-        console.print(f"\n[bold]Fixtures for[/bold] [green]{team_name}[/green] [bold]from the[/bold] "
-                      f"[green]{year} {competition_name}[/green] [bold]season")
-        print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-    else:
-        for fixture, home_team_name, away_team_name, venue in fixtures:
-            data.append([
-                fixture.round,
-                fixture.date,
-                home_team_name,
-                fixture.home_goals,
-                away_team_name,
-                fixture.away_goals,
-                fixture.referee,
-                venue.name
-            ])
-        headers = [
-            "Round", "Date", "Home Team", "Home Score", "Away Team", "Away Score", "Referee", "Venue"
-        ]
-        console.print(f"\n[bold]Fixtures for[/bold] [green]{team_name}[/green] [bold]from the[/bold] "
-                      f"[green]{year} {competition_name}[/green] [bold]season")
-        print(tabulate(data, headers=headers, tablefmt="pretty"))
+    write_fixtures(first, fixtures, stmt, output,
+                   f"\n[bold]Fixtures for[/bold] [green]{team_name}[/green] [bold]from the[/bold] "
+                   f"[green]{year} {competition_name}[/green] [bold]season")
 
 #********************************************************************************************#
 
@@ -314,86 +194,122 @@ def print_fixtures_season_team(session: Session, competition_name: str, year: in
 
 #********************************************************************************************#
 
+# Statistics of a Fixture by label and FixtureStats field, each field has a home_ and an away_ column
+FIXTURE_STATS = [
+    ("EXPECTED GOALS", "ex_goals"),
+    ("SHOTS ON GOAL", "sh_on_goal"),
+    ("SHOTS OFF GOAL", "sh_off_goal"),
+    ("TOTAL SHOTS", "total_sh"),
+    ("BLOCKED SHOTS", "blocked_sh"),
+    ("SHOTS INSIDE BOX", "sh_inside"),
+    ("SHOTS OUTSIDE BOX", "sh_outside"),
+    ("FOULS", "fouls"),
+    ("CORNERS", "corners"),
+    ("OFFSIDES", "offsides"),
+    ("BALL POSSESSION", "possession"),
+    ("YELLOW CARDS", "yellows"),
+    ("RED CARDS", "reds"),
+    ("SAVES", "saves"),
+    ("TOTAL PASSES", "tot_passes"),
+    ("ACCURATE PASSES", "accurate_pass"),
+    ("PASSING %", "percent_pass"),
+]
+# Statistics stored as numbers and shown as percentages
+PERCENT_STATS = ('possession', 'percent_pass')
+
+# Make Fixture Stats Table, Leagues show the Match Day and Cups the round
+def make_fix_stats_table(fixtures, league: bool = True):
+    headers = [
+        "Match Day" if league else "Round", "Date", "Home Team", "Away Team", "Referee", "Venue"
+    ]
+    for fixture, home_team_name, away_team_name, venue, fixturestats in fixtures:
+        data = []
+        data.append([
+            round_label(fixture.round) if league else fixture.round,
+            fixture.date,
+            home_team_name,
+            away_team_name,
+            fixture.referee,
+            venue.name if venue else None
+        ])
+        console.print(f"\n[bold]Fixture stats for[/bold] [green]{home_team_name}[/green] "
+                      f" [bold]vs.[/bold] [green]{away_team_name}[/green] "
+                      f"[bold]on[/bold] [green]{fixture.date}[/green]")
+        print(tabulate(data, headers=headers, tablefmt="pretty"))
+        if fixturestats is None:
+            console.print('No statistics for this fixture yet.', style="yellow")
+            continue
+        stats = []
+        headers_stats = [f'{home_team_name}', '', f'{away_team_name}']
+        stats.append([fixture.home_goals, "GOALS", fixture.away_goals])
+        for label, field in FIXTURE_STATS:
+            home, away = getattr(fixturestats, f'home_{field}'), getattr(fixturestats, f'away_{field}')
+            if field in PERCENT_STATS:
+                # Text left by a database that was not migrated is shown as stored
+                home, away = (f'{value:g}%' if isinstance(value, (int, float)) else value for value in (home, away))
+            stats.append([home, label, away])
+        print(tabulate(stats, headers=headers_stats, tablefmt="pretty"))
+
+# Write Fixture Stats one row per Fixture, statistics are left empty for Fixtures without them
+def write_fix_stats_rows(fixtures, output: Output, league: bool = True):
+    headers = ["Match Day" if league else "Round", "Date", "Home Team", "Away Team", "Referee", "Venue", "Home Goals",
+               "Away Goals"]
+    types = [int if league else str, *column_types(select(Fixture.date)), str, str, str, str, int, int]
+    for label, field in FIXTURE_STATS:
+        headers += [f'Home {label.title()}', f'Away {label.title()}']
+        types += column_types(select(FixtureStats.__table__.c[f'home_{field}'],
+                                     FixtureStats.__table__.c[f'away_{field}']))
+    rows = ([
+        round_label(fixture.round) if league else fixture.round, fixture.date, home_team_name, away_team_name,
+        fixture.referee, venue.name if venue else None, fixture.home_goals, fixture.away_goals,
+        *(getattr(fixturestats, f'{side}_{field}') if fixturestats else None
+          for _, field in FIXTURE_STATS for side in ('home', 'away'))
+    ] for fixture, home_team_name, away_team_name, venue, fixturestats in fixtures)
+    export_rows(rows, headers, output, types)
+
 # Display Fixture Statistics for one Team in a Season
-def print_fixture_stats_team(session: Session, competition_name: str, year: int, team_name: str):
-    # Find League ID
-    competition_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(competition_stmt).first()
-    if not competition:
-        raise ValueError(f'{competition_name} competition not found.')
-    # Find Season ID
-    season_stmt = select(Season).where(
-        and_(Season.league_id == competition.comp_api_id, Season.year == year)
-    )
-    season = session.exec(season_stmt).first()
-    if not season:
-        raise ValueError(f'There is no season in database for the {year} {competition_name} season.')
-    # Find Team1 ID
-    team1 = session.exec(select(Team).where(Team.name == team_name)).first()
-    # Find Fixtures
-    fixture_list_stmt = select(Fixture).where(
-        and_(Fixture.season_id == season.id,
-        or_(Fixture.home_team_id == team1.team_api_id, Fixture.away_team_id == team1.team_api_id)
-             )
-    )
-    fixture_list = session.exec(fixture_list_stmt).all()
-    team2_id = None
-    for fixture in fixture_list:
-        if fixture.home_team_id == team1.team_api_id:
-            team2_id = fixture.away_team_id
-        else:
-            team2_id = fixture.home_team_id
-        # Find Team2 ID
-        team2 = session.exec(select(Team).where(Team.team_api_id == team2_id)).first()
-        if not team1 or not team2:
-            raise ValueError(f'One or both teams not found')
-        # Create aliases to join Team table twice
-        HomeTeam = aliased(Team)
-        AwayTeam = aliased(Team)
-        # Query Fixtures, teams, venue
-        fixtures = session.exec(
-            select(Fixture, HomeTeam.name.label("home_team_name"), AwayTeam.name.label("away_team_name"), Venue,
-                   FixtureStats)
-            .outerjoin(HomeTeam, Fixture.home_team_id == HomeTeam.team_api_id)
-            .outerjoin(AwayTeam, Fixture.away_team_id == AwayTeam.team_api_id)
-            .outerjoin(Venue, Fixture.venue_id == Venue.venue_api_id)
-            .outerjoin(FixtureStats, Fixture.id == FixtureStats.fixture_id)
-            .where(
-                and_(Fixture.season_id == season.id,
-                     or_(Fixture.home_team_id == team1.team_api_id, Fixture.away_team_id == team1.team_api_id)
-                     )
-            )
-            .order_by(Fixture.date)
-        ).all()
+def print_fixture_stats_team(session: Session, competition_name: str, year: int, team_name: str,
+                             limit: int = None, offset: int = 0, output: Output = Output()):
+    # Create aliases to join Team table twice
+    HomeTeam = aliased(Team)
+    AwayTeam = aliased(Team)
+    # Query Fixtures, teams, venue and statistics for the Team, either side's name picks out its Fixtures
+    fixtures = stream_rows(session,
+        select(Fixture, HomeTeam.name.label("home_team_name"), AwayTeam.name.label("away_team_name"), Venue,
+               FixtureStats)
+        .outerjoin(HomeTeam, Fixture.home_team_id == HomeTeam.team_api_id)
+        .outerjoin(AwayTeam, Fixture.away_team_id == AwayTeam.team_api_id)
+        .outerjoin(Venue, Fixture.venue_id == Venue.venue_api_id)
+        .outerjoin(FixtureStats, Fixture.id == FixtureStats.fixture_id)
+        .where(and_(Fixture.season_id == season_id_stmt(competition_name, year).scalar_subquery(),
+                    or_(HomeTeam.name == team_name, AwayTeam.name == team_name)))
+        .order_by(Fixture.date), limit, offset)
+    first = next(fixtures, None)
+    if first is None:
+        check_found(session, [
+            (competition_id_stmt(competition_name), f'{competition_name} competition not found.'),
+            (season_id_stmt(competition_name, year),
+             f'There is no season in database for the {year} {competition_name} season.'),
+            (select(Team.team_api_id).where(Team.name == team_name), f'{team_name} team not found.')
+        ])
+        raise ValueError(f'No fixtures found for {team_name} in the {year} {competition_name} season.')
 
-        # Print Table
-        make_fix_stats_table(fixtures)
+    # Print Table, by Match Day for a League and by round for a Cup
+    league = resolver.competition(session, competition_name).comp_type == 'League'
+    if output.format != 'pretty':
+        write_fix_stats_rows(chain([first], fixtures), output, league)
+        return
+    make_fix_stats_table(chain([first], fixtures), league)
 
 
 # Display Fixture Statistics for two Teams in a Season
-def print_fixture_stats_two_teams(session: Session, competition_name: str, year: int, team_name1: str, team_name2: str):
-    # Find League ID
-    competition_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(competition_stmt).first()
-    if not competition:
-        raise ValueError(f'{competition_name} competition not found.')
-    # Find Season ID
-    season_stmt = select(Season).where(
-        and_(Season.league_id == competition.comp_api_id, Season.year == year)
-    )
-    season = session.exec(season_stmt).first()
-    if not season:
-        raise ValueError(f'There is no season in database for the {year} {competition_name} season.')
-    # Find Team IDs
-    team1 = session.exec(select(Team).where(Team.name == team_name1)).first()
-    team2 = session.exec(select(Team).where(Team.name == team_name2)).first()
-    if not team1 or not team2:
-        raise ValueError(f'One or both teams not found')
+def print_fixture_stats_two_teams(session: Session, competition_name: str, year: int, team_name1: str, team_name2: str,
+                                  limit: int = None, offset: int = 0, output: Output = Output()):
     # Create aliases to join Team table twice
     HomeTeam = aliased(Team)
     AwayTeam = aliased(Team)
     # Query Fixtures, teams, venue
-    fixtures = session.exec(
+    fixtures = stream_rows(session,
         select(Fixture, HomeTeam.name.label("home_team_name"), AwayTeam.name.label("away_team_name"), Venue, FixtureStats)
         .outerjoin(HomeTeam, Fixture.home_team_id == HomeTeam.team_api_id)
         .outerjoin(AwayTeam, Fixture.away_team_id == AwayTeam.team_api_id)
@@ -401,182 +317,30 @@ def print_fixture_stats_two_teams(session: Session, competition_name: str, year:
         .outerjoin(FixtureStats, Fixture.id == FixtureStats.fixture_id)
         .where(
             and_(
-                Fixture.season_id == season.id,
+                Fixture.season_id == season_id_stmt(competition_name, year).scalar_subquery(),
                 or_(
-                    and_(Fixture.home_team_id == team1.team_api_id,
-                         Fixture.away_team_id == team2.team_api_id),
-                    and_(Fixture.home_team_id == team2.team_api_id,
-                         Fixture.away_team_id == team1.team_api_id)
+                    and_(HomeTeam.name == team_name1, AwayTeam.name == team_name2),
+                    and_(HomeTeam.name == team_name2, AwayTeam.name == team_name1)
                 )
             )
         )
-        .order_by(Fixture.date)
-    ).all()
-    # Print Table
-    make_fix_stats_table(fixtures)
-
-#********************************************************************************************#
-
-#**********************************     Seasons         *************************************#
-
-#********************************************************************************************#
-
-# Display all Seasons
-def print_seasons(session: Session):
-    # Find Seasons
-    season_stmt = (
-        select(Season, Competition, Country)
-        .outerjoin(Competition, Competition.comp_api_id == Season.league_id)
-        .outerjoin(Country, Country.id == Competition.comp_country_id)
-        .order_by(Season.year)
-        .order_by(Competition.comp_type.desc())
-        .order_by(Competition.comp_name))
-    seasons = session.exec(season_stmt).all()
-    if not seasons:
-        raise ValueError(f'No Seasons found.')
-    # Print Table
-    data = []
-    for season, competition, country in seasons:
-        data.append([
-            season.year,
-            country.country_name,
-            competition.comp_name,
-            competition.comp_type
-        ])
-    headers = [
-        "Year", "Country", "Competition", "Type"
-    ]
-
-    console.print(f"\n[bold]All Seasons")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display Seasons for a Competition
-def print_seasons_comp(session: Session, competition_name: str):
-    # Find Competition
-    comp_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(comp_stmt).first()
-    if not competition:
-        raise ValueError(f'{competition_name} Competition not found.')
-    # Find Seasons
-    season_stmt = (
-        select(Season, Competition, Country).where(Competition.comp_api_id == competition.comp_api_id)
-        .outerjoin(Competition, Competition.comp_api_id == Season.league_id)
-        .outerjoin(Country, Country.id == Competition.comp_country_id)
-        .order_by(Season.year)
-        .order_by(Competition.comp_type.desc()))
-    seasons = session.exec(season_stmt).all()
-    if not seasons:
-        raise ValueError(f'No Seasons found for {competition_name} Competition.')
-    # Print Table
-    data = []
-    for season, competition, country in seasons:
-        data.append([
-            season.year
-        ])
-    headers = [
-        "Year"
-    ]
-
-    console.print(
-        f"\n[bold]Country:[/bold] [green]{seasons[0].Country.country_name}[/green], "
-        f"[bold]Competition:[/bold] [green]{competition_name}[/green], "
-        f"[bold]Type:[/bold] [green]{seasons[0].Competition.comp_type}[/green]")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display Seasons for a Country
-def print_seasons_country(session: Session, country_name: str):
-    # Find Country
-    country_stmt = select(Country).where(Country.country_name == country_name)
-    country = session.exec(country_stmt).first()
-    if not country:
-        raise ValueError(f'{country_name} not found.')
-    # Find Seasons
-    season_stmt = (
-        select(Season, Competition, Country).where(Country.id == country.id)
-        .outerjoin(Competition, Competition.comp_api_id == Season.league_id)
-        .outerjoin(Country, Country.id == Competition.comp_country_id)
-        .order_by(Competition.comp_type.desc())
-        .order_by(Competition.comp_name))
-    seasons = session.exec(season_stmt).all()
-    if not seasons:
-        raise ValueError(f'No Seasons found for {country_name}.')
-    # Print Table
-    data = []
-    for season, competition, country in seasons:
-        data.append([
-            season.year,
-            competition.comp_name,
-            competition.comp_type
-        ])
-    headers = [
-        "Year", "Competition", "Type"
-    ]
-
-    console.print(
-        f"\n[bold]All Seasons from[/bold] [green]{country_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display Seasons for a Year
-def print_seasons_year(session: Session, year: int):
-    # Find Seasons
-    season_stmt = (
-        select(Season, Competition, Country).where(Season.year == year)
-        .outerjoin(Competition, Competition.comp_api_id == Season.league_id)
-        .outerjoin(Country, Country.id == Competition.comp_country_id)
-        .order_by(Country.country_name)
-        .order_by(Competition.comp_type.desc())
-        .order_by(Competition.comp_name))
-    seasons = session.exec(season_stmt).all()
-    if not seasons:
-        raise ValueError(f'No Seasons found for {year}.')
-    # Print Table
-    data = []
-    for season, competition, country in seasons:
-        data.append([
-            country.country_name,
-            competition.comp_name,
-            competition.comp_type
-        ])
-    headers = [
-        "Country", "Competition", "Type"
-    ]
-
-    console.print(
-        f"\n[bold]All Seasons for[/bold] [green]{year}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display Seasons for a Year and Country
-def print_seasons_year_country(session: Session, year: int, country_name: str):
-    # Find Country
-    country_stmt = select(Country).where(Country.country_name == country_name)
-    country = session.exec(country_stmt).first()
-    if not country:
-        raise ValueError(f'{country_name} not found.')
-    # Find Seasons
-    season_stmt = (
-        select(Season, Competition, Country).where(
-            (Season.year == year) & (Country.id == country.id))
-        .outerjoin(Competition, Competition.comp_api_id == Season.league_id)
-        .outerjoin(Country, Country.id == Competition.comp_country_id)
-        .order_by(Competition.comp_type.desc())
-        .order_by(Competition.comp_name))
-    seasons = session.exec(season_stmt).all()
-    if not seasons:
-        raise ValueError(f'No Seasons found for {year}.')
-    # Print Table
-    data = []
-    for season, competition, country in seasons:
-        data.append([
-            competition.comp_name,
-            competition.comp_type
+        .order_by(Fixture.date), limit, offset)
+    first = next(fixtures, None)
+    if first is None:
+        check_found(session, [
+            (competition_id_stmt(competition_name), f'{competition_name} competition not found.'),
+            (season_id_stmt(competition_name, year),
+             f'There is no season in database for the {year} {competition_name} season.'),
+            (select(Team.team_api_id).where(Team.name == team_name1), f'One or both teams not found'),
+            (select(Team.team_api_id).where(Team.name == team_name2), f'One or both teams not found')
         ])
-    headers = [
-        "Competition", "Type"
-    ]
-
-    console.print(
-        f"\n[bold]All Seasons from[/bold] [green]{country_name}[/green] [bold]for[/bold] [green]{year}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
+        return
+    # Print Table, by Match Day for a League and by round for a Cup
+    league = resolver.competition(session, competition_name).comp_type == 'League'
+    if output.format != 'pretty':
+        write_fix_stats_rows(chain([first], fixtures), output, league)
+        return
+    make_fix_stats_table(chain([first], fixtures), league)
 
 #********************************************************************************************#
 
@@ -584,431 +348,72 @@ def print_seasons_year_country(session: Session, year: int, country_name: str):
 
 #********************************************************************************************#
 
+# Where show-standings takes a table from: the stored API standings, the Fixtures, or auto for the stored ones
+# unless they miss results the Fixtures already have
+STANDINGS_SOURCES = ('auto', 'api', 'local')
+# Standing columns shown after the position and Team name
+STANDING_COLUMNS = ('played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'goal_diff', 'points')
+
+# Standings computed from a Season's Fixtures, as the rows of the stored standings query
+def local_standings(session: Session, competition_name: str, season_id: int, fixtures: list, matchday: int = None):
+    rows = compute_standings(fixtures, season_id, tie_breaks_for(competition_name), matchday)
+    names = dict(session.exec(
+        select(Team.team_api_id, Team.name).where(Team.team_api_id.in_([row['team_id'] for row in rows]))
+    ).all())
+    return [(row['position'], names.get(row['team_id']), *(row[column] for column in STANDING_COLUMNS))
+            for row in rows]
+
 # Display Standings for a season
-def print_standings_table(session: Session, competition_name: str, year: int):
-    # Find League ID
-    competition_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(competition_stmt).first()
-    if not competition:
-        console.print(f'{competition_name} competition not found.', style="yellow")
-        return
-    else:
+def print_standings_table(session: Session, competition_name: str, year: int, output: Output = Output(),
+                          source: str = 'auto', matchday: int = None):
+    if source not in STANDINGS_SOURCES:
+        raise ValueError(f'Unknown standings source: {source}. Choose from {", ".join(STANDINGS_SOURCES)}.')
+    if source == 'api' and matchday is not None:
+        raise ValueError('Standings up to a Match Day are computed from fixtures, use --source local or auto.')
+    competition = resolver.competition(session, competition_name)
+    # Only a League's fixtures make one table, a Cup mixes group games with knockout ties
+    league = competition is not None and competition.comp_type == 'League'
+    if competition is not None and not league and (source == 'local' or matchday is not None):
+        raise ValueError(f'Standings are only computed from fixtures for Leagues, {competition_name} is a '
+                         f'{competition.comp_type}. Use --source api for its stored standings.')
+    # Query standings and Team names
+    standings_stmt = (select(Standing.position, Team.name, *(getattr(Standing, column) for column in STANDING_COLUMNS))
+                      .join(Team, Standing.team_id == Team.team_api_id)
+                      .where(Standing.season_id == season_id_stmt(competition_name, year).scalar_subquery())
+                      .order_by(Standing.position))
+    standings = session.exec(standings_stmt).all() if source != 'local' and matchday is None else []
+    title = f"\n[bold]Standings for[/bold] [green]{year} {competition_name}[/green]"
+    if source != 'api' and league:
+        season_id = session.exec(season_id_stmt(competition_name, year)).first()
+        fixtures = load_fixtures(session, season_id) if season_id is not None else []
+        # Each result counts as a game played for both Teams
+        if fixtures and (not standings or sum(row.played for row in standings) < 2 * len(final_results(fixtures))):
+            standings = local_standings(session, competition_name, season_id, fixtures, matchday)
+            title += " [bold]from fixtures" + (f" up to Match Day {matchday}" if matchday is not None else "")
+    if not standings:
+        if competition is None:
+            console.print(f'{competition_name} competition not found.', style="yellow")
+            return
         league_id = competition.comp_api_id
-    # Find Season ID
-    season_stmt = select(Season).where(
-        (Season.league_id == league_id) & (Season.year == year)
-    )
-    season = session.exec(season_stmt).first()
-    if not season:
-        console.print(
-            f'[red]Error:[/red] There is no season in database for the {year} {competition_name} (Competition ID: {league_id}) season.',
-            style="yellow")
-        console.print('Please add the required season & teams before adding standings data.',
-                      style="yellow")
-        return
-    # Query standings and Teams
-    standings = session.exec(
-        select(Standing, Team).join(Team, Standing.team_id == Team.team_api_id).where(Standing.season_id == season.id).order_by(Standing.position)
-    ).all()
+        if session.exec(season_id_stmt(competition_name, year)).first() is None:
+            console.print(
+                f'[red]Error:[/red] There is no season in database for the {year} {competition_name} (Competition ID: {league_id}) season.',
+                style="yellow")
+            console.print('Please add the required season & teams before adding standings data.',
+                          style="yellow")
+            return
+        if not league:
+            console.print(f'No standings are stored for the {year} {competition_name} season, and standings are only '
+                          f'computed from fixtures for Leagues.', style="yellow")
+            return
     # Print Table
-    data = []
-    for standing, team in standings:
-        data.append([
-            standing.position,
-            team.name,
-            standing.played,
-            standing.wins,
-            standing.draws,
-            standing.losses,
-            standing.goals_for,
-            standing.goals_against,
-            standing.goal_diff,
-            standing.points
-        ])
     headers = [
         "", "Team", "GP", "W", "D", "L", "F", "A", "GD", "P"
     ]
 
-    console.print(f"\n[bold]Standings for[/bold] [green]{year} {competition_name}[/green]")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-#********************************************************************************************#
-
-#**********************************     Teams           *************************************#
-
-#********************************************************************************************#
-
-# Display all Teams
-def print_teams(session: Session):
-    # Find Teams
-    teams_stmt = select(Team).order_by(Team.country).order_by(Team.national).order_by(Team.name)
-    teams = session.exec(teams_stmt).all()
-    if not teams:
-        raise ValueError(f'No teams found.')
-    # Print Table
-    data = []
-    for team in teams:
-        if team.national == 0:
-            nat_type = "Club"
-        else:
-            nat_type = "National"
-        data.append([
-            team.country,
-            team.name,
-            team.short_name,
-            team.founded,
-            nat_type,
-            team.logo_url
-        ])
-    headers = [
-        "Country", "Name", "Short Name", "Founded", "Type", "Logo"
-    ]
-
-    console.print(f"\n[bold]All Teams")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all Teams for a Country
-def print_teams_country(session: Session, country_name: str):
-    # Find Teams
-    teams_stmt = select(Team).where(
-        Team.country == country_name
-    ).order_by(Team.national).order_by(Team.name)
-    teams = session.exec(teams_stmt).all()
-    if not teams:
-        raise ValueError(f'[bold]No teams found for country: [/bold] [green]{country_name}.')
-    # Print Table
-    data = []
-    for team in teams:
-        if team.national == 0:
-            nat_type = "Club"
-        else:
-            nat_type = "National"
-        data.append([
-            team.name,
-            team.short_name,
-            team.founded,
-            nat_type,
-            team.logo_url
-        ])
-    headers = [
-        "Name", "Short Name", "Founded", "Type", "Logo"
-    ]
-
-    console.print(f"\n[bold]All Teams from[/bold] [green]{country_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all Teams from a Competition
-def print_teams_competition(session: Session, competition_name: str):
-    # Find Competition
-    comp_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(comp_stmt).first()
-    if not competition:
-        raise ValueError(f'[bold]Could not find competition: [/bold] [green]{competition_name}.')
-    # Find Teams
-    teams_stmt = (select(Team)
-                  .join(TeamSeasonCompetition, TeamSeasonCompetition.team_id == Team.team_api_id)
-                  .where(TeamSeasonCompetition.competition_id == competition.comp_api_id)
-                  .distinct(Team.team_api_id)
-                  .order_by(Team.country).order_by(Team.national).order_by(Team.name))
-    teams = session.exec(teams_stmt).all()
-    if not teams:
-        raise ValueError(f'[bold]No teams found for country: [/bold] [green]{competition_name}.')
-    # Print Table
-    data = []
-    for team in teams:
-        data.append([
-            team.country,
-            team.name,
-            team.short_name,
-            team.founded,
-            team.logo_url
-        ])
-    headers = [
-        "Country", "Name", "Short Name", "Founded", "Logo"
-    ]
-
-    if competition.country_name == 'World':
-        nat_type = "National"
-    else:
-        nat_type = "Club"
-    console.print(f"\n[bold]All {nat_type} Teams from[/bold] [green]{competition_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all National Teams
-def print_teams_national(session: Session):
-    # Find Teams
-    teams_stmt = (select(Team).where(Team.national == 1)
-                  .order_by(Team.country).order_by(Team.national).order_by(Team.name))
-    teams = session.exec(teams_stmt).all()
-    if not teams:
-        raise ValueError(f'No teams found.')
-    # Print Table
-    data = []
-    for team in teams:
-        data.append([
-            team.country,
-            team.name,
-            team.short_name,
-            team.founded,
-            team.logo_url
-        ])
-    headers = [
-        "Country", "Name", "Short Name", "Founded", "Logo"
-    ]
-
-    console.print(f"\n[bold]All[/bold] [green]National Teams")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display Teams for a Season (Competition and Year)
-def print_teams_season(session: Session, competition_name: str, year: int):
-    # Find Competition
-    comp_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(comp_stmt).first()
-    if not competition:
-        raise ValueError(f'[bold]Could not find competition: [/bold] [green]{competition_name}.')
-    # Find Season
-    season_stmt = select(Season).where(
-        (Season.year == year) & (Season.league_id == competition.comp_api_id)
-    )
-    season = session.exec(season_stmt).first()
-    if not season:
-        raise ValueError(f'[bold]No season found for [/bold] [green]{year} {competition_name}.')
-    # Find Teams
-    teams_stmt = (select(Team)
-                  .join(TeamSeasonCompetition, TeamSeasonCompetition.team_id == Team.team_api_id)
-                  .where(TeamSeasonCompetition.season_id == season.id)
-                  .order_by(Team.name))
-    teams = session.exec(teams_stmt).all()
-    if not teams:
-        raise ValueError(f'[bold]No teams found for [/bold] [green]{year} {competition_name}.')
-    # Print Table
-    data = []
-    for team in teams:
-        data.append([
-            team.country,
-            team.name,
-            team.short_name,
-            team.founded,
-            team.logo_url
-        ])
-    headers = [
-        "Country", "Name", "Short Name", "Founded", "Logo"
-    ]
-
-    if competition.country_name == 'World':
-        nat_type = "National"
-    else:
-        nat_type = "Club"
-    console.print(f"\n[bold]All {nat_type} Teams from[/bold] [green]{year} {competition_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display Teams for a Year
-def print_teams_year(session: Session, year: int):
-    # Find Seasons
-    season_stmt = select(Season).where(Season.year == year )
-    seasons = session.exec(season_stmt).all()
-    if not seasons:
-        raise ValueError(f'[bold]No season found for year: [/bold] [green]{year}.')
-    data = []
-    for season in seasons:
-        # Find Teams
-        teams_stmt = (select(Team)
-                        .join(TeamSeasonCompetition, TeamSeasonCompetition.team_id == Team.team_api_id)
-                        .where(TeamSeasonCompetition.season_id == season.id)
-                        .order_by(Team.country).order_by(Team.national).order_by(Team.name))
-        teams = session.exec(teams_stmt).all()
-        if not teams:
-            raise ValueError(f'[bold]No teams found for [/bold] [green]{year}.')
-        # Print Table
-        for team in teams:
-            if team.national == 0:
-                nat_type = "Club"
-            else:
-                nat_type = "National"
-            data.append([
-                team.country,
-                team.name,
-                team.short_name,
-                team.founded,
-                nat_type,
-                team.logo_url
-            ])
-    headers = [
-        "Country", "Name", "Short Name", "Founded", "Type", "Logo"
-    ]
-
-    console.print(f"\n[bold]All Teams from[/bold] [green]{year}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-#********************************************************************************************#
-
-#**********************************     Venues          *************************************#
-
-#********************************************************************************************#
-
-# Display all Venues
-def print_venues(session: Session):
-    # Find Venues
-    venues_stmt = select(Venue).order_by(Venue.country).order_by(Venue.name)
-    venues = session.exec(venues_stmt).all()
-    if not venues:
-        raise ValueError(f'No venues found.')
-    # Print Table
-    data = []
-    for venue in venues:
-        data.append([
-            venue.country,
-            venue.name,
-            venue.address,
-            venue.city,
-            venue.capacity,
-            venue.surface,
-            venue.image
-        ])
-    headers = [
-        "Country", "Name", "Address", "City", "Capacity", "Surface", "Image"
-    ]
-
-    console.print(f"\n[bold]All Venues")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all Venues for a Country
-def print_venues_country(session: Session, country_name: str):
-    # Find Venues
-    venues_stmt = select(Venue).where(Venue.country == country_name).order_by(Venue.name)
-    venues = session.exec(venues_stmt).all()
-    if not venues:
-        raise ValueError(f'No venues found.')
-    # Print Table
-    data = []
-    for venue in venues:
-        data.append([
-            venue.name,
-            venue.address,
-            venue.city,
-            venue.capacity,
-            venue.surface,
-            venue.image
-        ])
-    headers = [
-        "Name", "Address", "City", "Capacity", "Surface", "Image"
-    ]
-
-    console.print(f"\n[bold]All Venues in[/bold] [green]{country_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all Venues for a Competition
-def print_venues_competition(session: Session, competition_name: str):
-    # Find Competition
-    comp_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(comp_stmt).first()
-    if not competition:
-        raise ValueError(f'[bold]Could not find competition: [/bold] [green]{competition_name}.')
-    # Find Venues
-    venues_stmt = (select(Venue)
-                   .join(TeamSeasonCompetition, TeamSeasonCompetition.venue_id == Venue.venue_api_id)
-                   .where(TeamSeasonCompetition.competition_id == competition.comp_api_id)
-                   .distinct(Venue.venue_api_id)
-                   .order_by(Venue.name))
-    venues = session.exec(venues_stmt).all()
-    if not venues:
-        raise ValueError(f'No venues found.')
-    # Print Table
-    data = []
-    for venue in venues:
-        data.append([
-            venue.name,
-            venue.address,
-            venue.city,
-            venue.capacity,
-            venue.surface,
-            venue.image
-        ])
-    headers = [
-        "Name", "Address", "City", "Capacity", "Surface", "Image"
-    ]
-
-    console.print(f"\n[bold]All Venues that have been in[/bold] [green] {competition.country_name} - {competition_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display all Venues for a Year
-def print_venues_year(session: Session, year: int):
-    # Find Seasons
-    season_stmt = select(Season).where(Season.year == year)
-    seasons = session.exec(season_stmt).all()
-    if not seasons:
-        raise ValueError(f'[bold]No season found for year: [/bold] [green]{year}.')
-    data = []
-    for season in seasons:
-        # Find Venues
-        venues_stmt = (select(Venue)
-                       .join(TeamSeasonCompetition, TeamSeasonCompetition.venue_id == Venue.venue_api_id)
-                       .where(TeamSeasonCompetition.season_id == season.id)
-                       .distinct(Venue.venue_api_id)
-                       .order_by(Venue.name))
-        venues = session.exec(venues_stmt).all()
-        if not venues:
-            raise ValueError(f'No venues found.')
-        # Print Table
-        data = []
-        for venue in venues:
-            data.append([
-                venue.name,
-                venue.address,
-                venue.city,
-                venue.capacity,
-                venue.surface,
-                venue.image
-            ])
-
-    headers = [
-        "Name", "Address", "City", "Capacity", "Surface", "Image"
-    ]
-
-    console.print(
-        f"\n[bold]All Venues from[/bold] [green] {year}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
-# Display Venues for a Season (Competition and Year)
-def print_venues_season(session: Session, competition_name: str, year: int):
-    # Find Competition
-    comp_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(comp_stmt).first()
-    if not competition:
-        raise ValueError(f'[bold]Could not find competition: [/bold] [green]{competition_name}.')
-    # Find Season
-    season_stmt = select(Season).where(
-        (Season.year == year) & (Season.league_id == competition.comp_api_id)
-    )
-    season = session.exec(season_stmt).first()
-    if not season:
-        raise ValueError(f'[bold]No season found for [/bold] [green]{year} {competition_name}.')
-    # Find Venues
-    venues_stmt = (select(Venue, Team)
-                   .join(TeamSeasonCompetition, TeamSeasonCompetition.venue_id == Venue.venue_api_id)
-                   .join(Team, Team.team_api_id == TeamSeasonCompetition.team_id)
-                   .where(TeamSeasonCompetition.season_id == season.id)
-                   .order_by(Venue.name))
-    venues = session.exec(venues_stmt).all()
-    if not venues:
-        raise ValueError(f'[bold]No venues found for [/bold] [green]{year} {competition_name}.')
-    # Print Table
-    data = []
-    for venue, team in venues:
-        data.append([
-            venue.name,
-            team.name,
-            venue.address,
-            venue.city,
-            venue.capacity,
-            venue.surface,
-            venue.image
-        ])
-
-    headers = [
-    "Name", "Team", "Address", "City", "Capacity", "Surface", "Image"
-    ]
-
-    console.print(f"\n[bold]All Venues from[/bold] [green]{year} {competition_name}")
-    print(tabulate(data, headers=headers, tablefmt="pretty"))
-
+    if output.format != 'pretty':
+        # Machine-readable formats name the position column
+        export_rows(standings, ["Position", *headers[1:]], output, column_types(standings_stmt))
+        return
+    console.print(title)
+    print(tabulate(standings, headers=headers, tablefmt="pretty"))
@@ -0,0 +1,115 @@
+# Import libraries
+from contextlib import nullcontext
+from datetime import date, datetime
+from importlib.util import find_spec
+from itertools import islice
+from sqlalchemy.types import TypeDecorator
+from typing import NamedTuple, Optional
+import csv
+import json
+import sys
+
+# Formats the show-* commands write, pretty is the Rich and tabulate output meant for people
+FORMATS = ('pretty', 'jsonl', 'csv', 'arrow', 'parquet')
+BINARY_FORMATS = ('arrow', 'parquet')
+
+# Rows per Arrow record batch or Parquet row group
+BATCH_SIZE = 10000
+
+
+# Where and how a show-* command writes its rows
+class Output(NamedTuple):
+    format: str = 'pretty'
+    path: Optional[str] = None
+
+# Check a --format and --output pair
+def make_output(output_format: str, path: str = None) -> Output:
+    if output_format not in FORMATS:
+        raise ValueError(f'Unknown format: {output_format}. Choose from {", ".join(FORMATS)}.')
+    if path is not None and output_format == 'pretty':
+        raise ValueError('--output needs a machine-readable --format: jsonl, csv, arrow or parquet.')
+    if output_format in BINARY_FORMATS and find_spec('pyarrow') is None:
+        raise ValueError(f'The {output_format} format needs pyarrow: pip install pyarrow')
+    return Output(output_format, path)
+
+# Python types of the columns a statement selects, used to give Arrow files a fixed schema
+def column_types(stmt) -> list:
+    types = []
+    for column in stmt.selected_columns:
+        # SQLModel wraps strings and datetimes in its own types, the wrapped type knows the Python type
+        sql_type = column.type.impl_instance if isinstance(column.type, TypeDecorator) else column.type
+        try:
+            types.append(sql_type.python_type)
+        except NotImplementedError:
+            types.append(str)
+    return types
+
+# Dates as ISO 8601 text
+def plain_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+#********************************************************************************************#
+
+#**********************************     Writers         *************************************#
+
+#********************************************************************************************#
+
+# One JSON object per row, keyed by the headers
+def write_jsonl(rows, headers: list, stream, types: list = None):
+    encoder = json.JSONEncoder(default=plain_value)
+    for row in rows:
+        stream.write(encoder.encode(dict(zip(headers, row))) + '\n')
+
+# A header line, then one line per row
+def write_csv(rows, headers: list, stream, types: list = None):
+    writer = csv.writer(stream)
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow([plain_value(value) for value in row])
+
+# Arrow types for the column types, anything else is written as text, datetimes are stored in UTC
+def arrow_schema(pa, headers: list, types: list):
+    arrow_types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_(), str: pa.string(),
+                   datetime: pa.timestamp('us', tz='UTC'), date: pa.date32()}
+    return pa.schema([(header, arrow_types.get(column_type, pa.string()))
+                      for header, column_type in zip(headers, types)])
+
+# Record batches of BATCH_SIZE rows, as an Arrow IPC stream or Parquet row groups
+def write_arrow(rows, headers: list, stream, types: list = None, parquet: bool = False):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    rows = iter(rows)
+    batch = list(islice(rows, BATCH_SIZE))
+    # Without column types the schema is inferred from the first batch
+    schema = arrow_schema(pa, headers, types) if types is not None else \
+        pa.Table.from_pylist([dict(zip(headers, row)) for row in batch]).schema
+    writer = pq.ParquetWriter(stream, schema) if parquet else pa.ipc.new_stream(stream, schema)
+    with writer:
+        while batch:
+            columns = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+            batch = list(islice(rows, BATCH_SIZE))
+
+def write_parquet(rows, headers: list, stream, types: list = None):
+    write_arrow(rows, headers, stream, types, parquet=True)
+
+# Writers by format
+WRITERS = {
+    'jsonl': write_jsonl,
+    'csv': write_csv,
+    'arrow': write_arrow,
+    'parquet': write_parquet,
+}
+
+
+# Write rows as they arrive to the output file, or to standard output
+def export_rows(rows, headers: list, output: Output, types: list = None):
+    binary = output.format in BINARY_FORMATS
+    if output.path is not None:
+        stream = open(output.path, 'wb') if binary else open(output.path, 'w', newline='', encoding='utf-8')
+    else:
+        stream = nullcontext(sys.stdout.buffer if binary else sys.stdout)
+    with stream as target:
+        WRITERS[output.format](rows, headers, target, types)
@@ -1,47 +1,120 @@
 # Import libraries
 from database import engine
-from datetime import datetime
 from rich.console import Console
-from rich.progress import track
-from sqlmodel import Session, select, delete, SQLModel, or_, and_
-from tabulate import tabulate
-from typing import Optional
-import requests, json
-import time
+from sqlmodel import Session, SQLModel
+from typing import List, Optional
+import sys
 import typer
 
-# Import Models
-from models import Country, Competition, Venue, Team, Season, Standing, Fixture, FixtureStats
-
-# Import Functions
-from api_request import api_request
-from helper_functions import (make_country, fetch_competitions, fetch_teams, fetch_venues,
-                              make_season, fetch_standings, fetch_fixtures, make_meta_join_table,
-                              fetch_fixture_stats_team, fetch_fixture_stats_team_season)
-from display_utils import (print_comps, print_comps_country, print_comps_country_type, print_comps_type,
-                           print_countries,
-                           print_fixtures_season, print_fixtures_season_team,
-                           print_fixture_stats_team, print_fixture_stats_two_teams,
-                           print_seasons, print_seasons_comp, print_seasons_country, print_seasons_year, print_seasons_year_country,
-                           print_standings_table,
-                           print_teams, print_teams_country, print_teams_competition, print_teams_year, print_teams_season,
-                           print_teams_national,
-                           print_venues, print_venues_country, print_venues_competition, print_venues_year, print_venues_season)
-
-# Import API Key
-import config
+# Models, API, fetch and display modules are imported inside each command, so read-only commands never load
+# the HTTP stack and fetch commands never load the display layer
 
 # Create Typer app and console
 app = typer.Typer()
 console = Console()
 
 
+# Commands that read or write Fixture Statistics, they need the numeric columns from migrate-fixture-stats
+FIXTURE_STATS_COMMANDS = {'show-fixture-stats', 'fetch-fixture-stats', 'fetch-season-stats', 'backfill'}
+
+
+# Global Options
+@app.callback()
+def main(ctx: typer.Context,
+         no_cache: bool = typer.Option(False, "--no-cache", help="Neither read nor store cached API responses for this run"),
+         record: Optional[str] = typer.Option(None, "--record", help="Save every API response to this directory"),
+         replay: Optional[str] = typer.Option(None, "--replay", help="Serve API responses from this directory only"),
+         base_url: Optional[str] = typer.Option(None, "--base-url", help="Send API requests to this server"),
+         echo_sql: bool = typer.Option(False, "--echo-sql", help="Log every SQL statement")):
+    engine.echo = echo_sql or engine.echo
+    if record and replay:
+        raise typer.BadParameter('Use either --record or --replay, not both.')
+    if ctx.invoked_subcommand in FIXTURE_STATS_COMMANDS:
+        from models import check_fixture_stats_columns
+        try:
+            with engine.connect() as conn:
+                check_fixture_stats_columns(conn)
+        except ValueError as e:
+            console.print(f'[red]Error:[/red] {e}')
+            raise typer.Exit(1)
+    if not (no_cache or record or replay or base_url):
+        return
+    from api_request import client
+    client.use_cache = not no_cache
+    if base_url:
+        client.base_url = base_url
+    if record:
+        client.set_mode('record', record)
+    if replay:
+        client.set_mode('replay', replay)
+
+
 # Initialize Database
 @app.command()
 def init_db():
+    import models
     SQLModel.metadata.create_all(engine)
     console.print("Database tables created!", style="green")
 
+# Add any missing indexes to an existing database, leaving its data in place
+@app.command()
+def ensure_indexes():
+    import models
+    from tabulate import tabulate
+    created, missing_tables = [], []
+    with engine.begin() as conn:
+        existing = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        tables = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in SQLModel.metadata.sorted_tables:
+            # Tables added after the database was created get their indexes from init-db along with the table
+            if table.name not in tables:
+                missing_tables.append(table.name)
+                continue
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
+                    created.append((table.name, index.name))
+        # Refresh the query planner's statistics for the new indexes
+        conn.exec_driver_sql("ANALYZE")
+    if created:
+        console.print(f"\n[bold]Created {len(created)} indexes")
+        print(tabulate(created, headers=["Table", "Index"], tablefmt="pretty"))
+    else:
+        console.print("All indexes already exist!", style="green")
+    if missing_tables:
+        console.print(f"Skipped tables not in the database yet: {', '.join(missing_tables)}. "
+                      f"Run init-db to create them with their indexes.", style="yellow")
+
+# Convert possession, passing % and expected goals saved as text such as 55% to numbers, rebuilding the table
+@app.command()
+def migrate_fixture_stats():
+    import models
+    from helper_functions import stat_number
+    table = models.FixtureStats.__table__
+    numeric = set(models.NUMERIC_STATS)
+    with engine.begin() as conn:
+        types = {row[1]: row[2] for row in conn.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+        if not types:
+            console.print("There is no fixture stats table yet, run init-db first.", style="yellow")
+            return
+        if all(types[name] == 'FLOAT' for name in numeric):
+            console.print("Fixture stats are already stored as numbers!", style="green")
+            return
+        # SQLite cannot change a column's type, so the rows are copied once into a table with numeric columns
+        conn.exec_driver_sql(f"ALTER TABLE {table.name} RENAME TO {table.name}_old")
+        for index in table.indexes:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+        table.create(conn)
+        # Convert with the parser ingest uses, so text that is not a number becomes NULL as it does in new rows
+        conn.connection.driver_connection.create_function('stat_number', 1, stat_number, deterministic=True)
+        columns = [column.name for column in table.columns]
+        values = [f"stat_number({name})" if name in numeric else name for name in columns]
+        converted = conn.exec_driver_sql(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) SELECT {', '.join(values)} FROM {table.name}_old"
+        ).rowcount
+        conn.exec_driver_sql(f"DROP TABLE {table.name}_old")
+    console.print(f"Converted {converted} fixture stats to numbers!", style="green")
+
 #****************************************************************************************************#
 
 #**********************************     Fetch Data Functions    *************************************#
@@ -51,11 +124,13 @@ def init_db():
 # Fetch Country
 @app.command()
 def fetch_country(input_country_name: str):
+    from tabulate import tabulate
+    from helper_functions import make_country, fetch_competitions, fetch_teams, fetch_venues
     with Session(engine) as session:
         console.print(f'Fetching all data for {input_country_name}', style="blue")
 
-        make_country(session, input_country_name)
-        comps_added = fetch_competitions(session, input_country_name)
+        comps_data = make_country(session, input_country_name)
+        comps_added = fetch_competitions(session, input_country_name, comps_data)
         teams_added = fetch_teams(session, input_country_name)
         venues_added = fetch_venues(session, input_country_name)
 
@@ -69,9 +144,29 @@ def fetch_country(input_country_name: str):
         print(tabulate(summary_table, headers=headers, tablefmt="pretty"))
 
 
+# Fetch Countries in parallel
+@app.command()
+def fetch_countries(country_names: Optional[List[str]] = typer.Argument(None),
+                    european: bool = typer.Option(False, "--european", help="Fetch every UEFA member nation"),
+                    workers: int = typer.Option(4, "--workers", "-w", min=1,
+                                                help="Countries requested at once, still within the rate limits")):
+    from tabulate import tabulate
+    from helper_functions import EUROPEAN_COUNTRIES, fetch_countries_bulk
+    names = list(dict.fromkeys((country_names or []) + (EUROPEAN_COUNTRIES if european else [])))
+    if not names:
+        raise typer.BadParameter('Give one or more countries, or use --european.')
+    with Session(engine) as session:
+        console.print(f'Fetching all data for {len(names)} countries with {workers} workers.', style="blue")
+        summary = fetch_countries_bulk(session, names, workers)
+        headers = ["Country", "Competitions Added", "Teams Added", "Venues Added"]
+        console.print(f"\n[bold]Data added for[/bold] [green]{len(names)} countries")
+        print(tabulate(summary, headers=headers, tablefmt="pretty"))
+
+
 # Fetch Season
 @app.command()
 def fetch_season(competition_name: str, year: int):
+    from helper_functions import make_season, fetch_standings, fetch_fixtures, make_meta_join_table
     with Session(engine) as session:
         # Find or Make Season
         season, competition = make_season(session, competition_name, year)
@@ -84,17 +179,78 @@ def fetch_season(competition_name: str, year: int):
         # Make Team-Season Join Table Entries
         make_meta_join_table(session, season)
 
+# Sync Season, only requesting Fixtures that are not final yet
+@app.command("sync-season")
+def sync_season_command(competition_name: str, year: int):
+    from helper_functions import sync_season
+    with Session(engine) as session:
+        sync_season(session, competition_name, year)
+
 # Fetch Fixture Statistics
 @app.command()
-def fetch_fixture_stats(year: int, team_name: str, competition_name: Optional[str] = typer.Argument(None)):
+def fetch_fixture_stats(year: int, team_name: str, competition_name: Optional[str] = typer.Argument(None),
+                        workers: int = typer.Option(1, "--workers", "-w", min=1,
+                                                    help="Fetch fixtures in parallel, still within the rate limits"),
+                        batched: bool = typer.Option(False, "--batch",
+                                                     help="Fetch 20 fixtures per request through /fixtures?ids=")):
+    from helper_functions import fetch_fixture_stats_team, fetch_fixture_stats_team_season
     with Session(engine) as session:
         if competition_name:
             # Fetch Fixture Statistics for one Team for one Season (Competition and Year)
-            fetch_fixture_stats_team_season(session, year, team_name, competition_name)
+            fetch_fixture_stats_team_season(session, year, team_name, competition_name, workers, batched)
             return
         else:
             # Fetch Fixture Statistics for one Team for all Competitions in a Year
-            fetch_fixture_stats_team(session, year, team_name)
+            fetch_fixture_stats_team(session, year, team_name, workers, batched)
+
+# Fetch Fixture Statistics for every finished Fixture of a Season
+@app.command()
+def fetch_season_stats(competition_name: str, year: int,
+                       workers: int = typer.Option(1, "--workers", "-w", min=1,
+                                                   help="Requests in flight at once, still within the rate limits"),
+                       batched: bool = typer.Option(True, "--batch/--no-batch",
+                                                    help="Fetch 20 fixtures per request through /fixtures?ids=")):
+    from helper_functions import fetch_fixture_stats_season
+    with Session(engine) as session:
+        fetch_fixture_stats_season(session, competition_name, year, workers, batched)
+
+# Resumable backfill of Fixture Statistics through the persistent job queue
+@app.command()
+def backfill(competition_name: Optional[str] = typer.Argument(None), year: Optional[int] = typer.Argument(None),
+             workers: int = typer.Option(1, "--workers", "-w", min=1,
+                                         help="Jobs requested at once, still within the rate limits"),
+             retry: bool = typer.Option(False, "--retry-failed", help="Queue failed jobs again")):
+    from job_queue import enqueue_fixture_stats, retry_failed, run_jobs, upgrade_job_table
+    with Session(engine) as session:
+        upgrade_job_table(session)
+        if competition_name and year:
+            queued = enqueue_fixture_stats(session, competition_name, year)
+            console.print(f'Queued {queued} fixture statistics jobs for {year} {competition_name}.', style="blue")
+        if retry:
+            console.print(f'Queued {retry_failed(session)} failed jobs again.', style="blue")
+        run_jobs(session, workers)
+
+# Show API Response Cache Statistics
+@app.command()
+def cache_stats():
+    from response_cache import cache
+    from tabulate import tabulate
+    rows = cache.stats()
+    if not rows:
+        console.print('API response cache is empty.', style="yellow")
+        return
+    headers = ["Endpoint", "Entries", "Expired", "Hits", "Misses", "Hit Rate"]
+    data = [(endpoint, entries, expired, hits, misses, f'{hits / (hits + misses):.0%}' if hits + misses else '-')
+            for endpoint, entries, expired, hits, misses in rows]
+    console.print(f"\n[bold]API Response Cache[/bold] [green]{cache.path}")
+    print(tabulate(data, headers=headers, tablefmt="pretty"))
+
+# Clear API Response Cache
+@app.command()
+def cache_clear(expired: bool = typer.Option(False, "--expired", help="Only remove expired responses")):
+    from response_cache import cache
+    removed = cache.clear(expired_only=expired)
+    console.print(f'Removed {removed} cached responses.', style="green")
 
 #****************************************************************************************************#
 
@@ -105,154 +261,172 @@ def fetch_fixture_stats(year: int, team_name: str, competition_name: Optional[st
 # Show Competitions
 @ app.command()
 def show_competitions(country_name: Optional[str] = typer.Option(None, "--country", "-c"),
-                      comp_type: Optional[str] = typer.Option(None, "--type", "-t")):
+                      comp_type: Optional[str] = typer.Option(None, "--type", "-t"),
+                      year: Optional[int] = typer.Option(None, "--year", "-y", help="Only competitions with a season"),
+                      national: bool = typer.Option(False, "--national", help="Show only national team competitions"),
+                      limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many rows"),
+                      offset: int = typer.Option(0, "--offset", min=0, help="Skip this many rows first"),
+                      output_format: str = typer.Option("pretty", "--format", "-f",
+                                                        help="pretty, jsonl, csv, arrow or parquet"),
+                      output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_listing
+    from export_utils import make_output
+    from query_engine import Filters
     with Session(engine) as session:
-        if comp_type and country_name:
-            # Display all League or Cup Competitions for a Country
-            print_comps_country_type(session, country_name, comp_type)
-            return
-        if comp_type:
-            # Display all League or Cup Competitions for all Countries
-            print_comps_type(session, comp_type)
-            return
-        if country_name:
-            # Display all Competitions for a Country
-            print_comps_country(session, country_name)
-            return
-        else:
-            # Display all Competitions
-            print_comps(session)
+        # Display Competitions for any combination of Country, Type, Year and National
+        print_listing(session, 'competitions',
+                      Filters(country=country_name, year=year, comp_type=comp_type, national=national), limit, offset,
+                      make_output(output_format, output))
 
 
 # Show Countries
 @ app.command()
-def show_countries():
+def show_countries(limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many rows"),
+                   offset: int = typer.Option(0, "--offset", min=0, help="Skip this many rows first"),
+                   output_format: str = typer.Option("pretty", "--format", "-f",
+                                                     help="pretty, jsonl, csv, arrow or parquet"),
+                   output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_countries
+    from export_utils import make_output
     with Session(engine) as session:
         # Display all Countries
-        print_countries(session)
+        print_countries(session, limit, offset, make_output(output_format, output))
 
 
 # Show Fixtures function
 @app.command()
-def show_fixtures(competition_name: str, year: int, team_name: Optional[str] = typer.Argument(None)):
+def show_fixtures(competition_name: str, year: int, team_name: Optional[str] = typer.Argument(None),
+                  limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many rows"),
+                  offset: int = typer.Option(0, "--offset", min=0, help="Skip this many rows first"),
+                  output_format: str = typer.Option("pretty", "--format", "-f",
+                                                    help="pretty, jsonl, csv, arrow or parquet"),
+                  output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_fixtures_season, print_fixtures_season_team
+    from export_utils import make_output
     with Session(engine) as session:
         if team_name:
             # Display All Fixtures of one Team for a Season
-            print_fixtures_season_team(session, competition_name, year, team_name)
+            print_fixtures_season_team(session, competition_name, year, team_name, limit, offset,
+                                       make_output(output_format, output))
             return
         else:
             # Display All Fixtures for a Season
-            print_fixtures_season(session, competition_name, year)
+            print_fixtures_season(session, competition_name, year, limit, offset, make_output(output_format, output))
 
 
 # Show Fixture Stats function
 @app.command()
 def show_fixture_stats(competition_name: str, year: int,
-                       team_name1: str, team_name2: Optional[str] = typer.Argument(None)):
+                       team_name1: str, team_name2: Optional[str] = typer.Argument(None),
+                       limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many rows"),
+                       offset: int = typer.Option(0, "--offset", min=0, help="Skip this many rows first"),
+                       output_format: str = typer.Option("pretty", "--format", "-f",
+                                                         help="pretty, jsonl, csv, arrow or parquet"),
+                       output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_fixture_stats_team, print_fixture_stats_two_teams
+    from export_utils import make_output
     with Session(engine) as session:
         if team_name2:
             # Display Fixture Statistics for two Teams in a Season
-            print_fixture_stats_two_teams(session, competition_name, year, team_name1, team_name2)
+            print_fixture_stats_two_teams(session, competition_name, year, team_name1, team_name2, limit,
+                                          offset, make_output(output_format, output))
         else:
             # Display Fixture Statistics for one Team in a Season
-            print_fixture_stats_team(session, competition_name, year, team_name1)
+            print_fixture_stats_team(session, competition_name, year, team_name1, limit, offset,
+                                     make_output(output_format, output))
 
 
 # Show Seasons
 @ app.command()
 def show_seasons(competition_name: Optional[str] = typer.Option(None, "--competition", "-c"),
                  year: Optional[int] = typer.Option(None, "--year", "-y"),
-                 country_name: Optional[str] = typer.Option(None, "--country")):
+                 country_name: Optional[str] = typer.Option(None, "--country"),
+                 comp_type: Optional[str] = typer.Option(None, "--type", "-t"),
+                 national: bool = typer.Option(False, "--national", help="Show only national team competitions"),
+                 limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many rows"),
+                 offset: int = typer.Option(0, "--offset", min=0, help="Skip this many rows first"),
+                 output_format: str = typer.Option("pretty", "--format", "-f",
+                                                   help="pretty, jsonl, csv, arrow or parquet"),
+                 output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_listing
+    from export_utils import make_output
+    from query_engine import Filters
     with Session(engine) as session:
-        if country_name and year:
-            # Display Seasons for a Year and Country
-            print_seasons_year_country(session, year, country_name)
-            return
-        if competition_name:
-            # Display Seasons for a Competition
-            print_seasons_comp(session, competition_name)
-            return
-        if country_name:
-            # Display Seasons for a Country
-            print_seasons_country(session, country_name)
-            return
-        if year:
-            # Display Seasons for a Year
-            print_seasons_year(session, year)
-            return
-        else:
-            # Display all Seasons
-            print_seasons(session)
+        # Display Seasons for any combination of Competition, Year, Country, Type and National
+        print_listing(session, 'seasons', Filters(country=country_name, competition=competition_name, year=year,
+                                                  comp_type=comp_type, national=national), limit, offset,
+                      make_output(output_format, output))
 
 
 # Show Standings function
 @app.command()
-def show_standings(competition_name: str, year: int):
+def show_standings(competition_name: str, year: int,
+                   source: str = typer.Option("auto", "--source", "-s",
+                                              help="api, local (from fixtures) or auto (api unless it is behind)"),
+                   matchday: Optional[int] = typer.Option(None, "--matchday", "-m", min=1,
+                                                          help="Standings after this match day, from fixtures"),
+                   output_format: str = typer.Option("pretty", "--format", "-f",
+                                                     help="pretty, jsonl, csv, arrow or parquet"),
+                   output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_standings_table
+    from export_utils import make_output
     with Session(engine) as session:
-        # Display Standings for a season
-        print_standings_table(session, competition_name, year)
+        # Display Standings for a season, stored or computed from its Fixtures
+        print_standings_table(session, competition_name, year, make_output(output_format, output), source, matchday)
 
 
 # Show Teams
 @app.command()
 def show_teams(competition_name: Optional[str] = typer.Option(None, "--competition", "-c"),
-                 year: Optional[int] = typer.Option(None, "--year", "-y"),
-                 country_name: Optional[str] = typer.Option(None, "--country"),
-               national: bool = typer.Option(False, "--national", help="Show only national teams")):
+               year: Optional[int] = typer.Option(None, "--year", "-y"),
+               country_name: Optional[str] = typer.Option(None, "--country"),
+               comp_type: Optional[str] = typer.Option(None, "--type", "-t"),
+               national: bool = typer.Option(False, "--national", help="Show only national teams"),
+               limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many rows"),
+               offset: int = typer.Option(0, "--offset", min=0, help="Skip this many rows first"),
+               output_format: str = typer.Option("pretty", "--format", "-f",
+                                                 help="pretty, jsonl, csv, arrow or parquet"),
+               output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_listing
+    from export_utils import make_output
+    from query_engine import Filters
     with Session(engine) as session:
-        if national:
-            # Display all National Teams
-            print_teams_national(session)
-            return
-        if competition_name and year:
-            # Display Teams for a Season (Competition and Year) (Works for both Club and National)
-            print_teams_season(session, competition_name, year)
-            return
-        if year:
-            # Display all Teams from a Year
-            print_teams_year(session, year)
-            return
-        if competition_name:
-            # Display all Teams from a Competition (Works for both Club and National)
-            print_teams_competition(session, competition_name)
-            return
-        if country_name:
-            # Display all Teams for a Country
-            print_teams_country(session, country_name)
-            return
-        else:
-            # Display all Teams
-            print_teams(session)
+        # Display Teams for any combination of Competition, Year, Country, Type and National
+        print_listing(session, 'teams', Filters(country=country_name, competition=competition_name, year=year,
+                                                comp_type=comp_type, national=national), limit, offset,
+                      make_output(output_format, output))
 
 
 # Show Venues
 @app.command()
 def show_venues(competition_name: Optional[str] = typer.Option(None, "--competition", "-c"),
-                 year: Optional[int] = typer.Option(None, "--year", "-y"),
-                 country_name: Optional[str] = typer.Option(None, "--country"),):
+                year: Optional[int] = typer.Option(None, "--year", "-y"),
+                country_name: Optional[str] = typer.Option(None, "--country"),
+                comp_type: Optional[str] = typer.Option(None, "--type", "-t"),
+                national: bool = typer.Option(False, "--national", help="Show only national team venues"),
+                limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many rows"),
+                offset: int = typer.Option(0, "--offset", min=0, help="Skip this many rows first"),
+                output_format: str = typer.Option("pretty", "--format", "-f",
+                                                  help="pretty, jsonl, csv, arrow or parquet"),
+                output: Optional[str] = typer.Option(None, "--output", "-o", help="Write to this file instead")):
+    from display_utils import print_listing
+    from export_utils import make_output
+    from query_engine import Filters
     with Session(engine) as session:
-        if competition_name and year:
-            # Display Venues for a Season (Competition and Year)
-            print_venues_season(session, competition_name, year)
-            return
-        if year:
-            # Display all Venues for a Year
-            print_venues_year(session, year)
-            return
-        if competition_name:
-            # Display all Venues for a Competition
-            print_venues_competition(session, competition_name)
-            return
-        if country_name:
-            # Display all Venues for a Country
-            print_venues_country(session, country_name)
-            return
-        else:
-            # Display all Venues
-            print_venues(session)
-
+        # Display Venues for any combination of Competition, Year, Country, Type and National
+        print_listing(session, 'venues', Filters(country=country_name, competition=competition_name, year=year,
+                                                 comp_type=comp_type, national=national), limit, offset,
+                      make_output(output_format, output))
 
 
 # Run App
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    try:
+        app()
+    except Exception as error:
+        # Only commands that call the API load rate_limiter, so only they can run out of daily quota
+        quota_exhausted = getattr(sys.modules.get('rate_limiter'), 'QuotaExhausted', ())
+        if not isinstance(error, quota_exhausted):
+            raise
+        console.print(f"{error} Try again tomorrow, or set API_PLAN in config.py to your plan.", style="red")
+        sys.exit(1)
\ No newline at end of file
@@ -1,65 +1,100 @@
 # Import libraries
+import config
 from sqlmodel import Session, select, or_
 from rich.progress import track
 from rich.console import Console
-from datetime import datetime
-from tabulate import tabulate
-import time
+from datetime import datetime, time, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # Import Models
-from models import Country, Competition, Venue, Team, Season, Standing, Fixture, FixtureStats, TeamSeasonCompetition
+from models import (Country, Competition, Venue, Team, Season, Standing, Fixture, FixtureStats, TeamSeasonCompetition,
+                    CLOSED_STATUSES, FINISHED_STATUSES, POSTPONED_STATUSES, check_fixture_stats_columns)
 
 # Import Functions
 from api_request import api_request
+from resolver import resolver
 
 console = Console()
 
-# Fetch Country
-def make_country(session: Session, input_country_name: str):
-    # Create or get Country
-    country_stmt = select(Country).where(Country.country_name == input_country_name)
-    country = session.exec(country_stmt).first()
-    if not country:
-        # Fetch Competitions with Country
-        console.print(f'Fetching {input_country_name} competitions data from API.', style="blue")
-        # API Request Setup
-        url = "https://v3.football.api-sports.io/leagues"
-        params = {'country': input_country_name}
-        # API Request
-        comps_data = api_request(url, params)
-        comps = comps_data['response']
-        # Process Data
-        country_name = comps_data['parameters']['country']
-        country = Country(country_name=country_name,
-                          num_comps=comps_data['results'],
-                          code=comps_data['response'][0]['country']['code'],
-                          flag=comps_data['response'][0]['country']['flag'])
-        session.add(country)
-        session.commit()
-        console.print(f'Created new Country: {country_name}.', style="green")
-    else:
-        console.print(f'Country found in records: {input_country_name}.', style="green")
+# Days a postponed Fixture keeps sync-season's date window open, older ones are refreshed by ID (set in config.py)
+SYNC_POSTPONED_DAYS = getattr(config, 'SYNC_POSTPONED_DAYS', 14)
 
+# Compare a stored value with an incoming one, SQLite keeps datetimes without their timezone
+def same_value(stored, incoming) -> bool:
+    if isinstance(stored, datetime) and isinstance(incoming, datetime):
+        return stored.replace(tzinfo=None) == incoming.replace(tzinfo=None)
+    return stored == incoming
 
-# Fetch Competitions
-def fetch_competitions(session: Session, input_country_name: str):
-    # Get Country
-    country_stmt = select(Country).where(Country.country_name == input_country_name)
-    country = session.exec(country_stmt).first()
-    # Fetch Competitions with Country
-    console.print(f'Fetching {input_country_name} competitions data from API.', style="blue")
+# Bulk insert or update rows of a Model with one INSERT ... ON CONFLICT DO UPDATE executemany
+def bulk_upsert(session: Session, model, rows: list, key_columns: list, existing_where):
+    table = model.__table__
+    # Load the current version of every row that may already exist in one query
+    existing = {
+        tuple(row[k] for k in key_columns): row
+        for row in session.exec(select(*table.c).where(existing_where)).mappings()
+    }
+    inserted, updated, unchanged = [], [], 0
+    for row in rows:
+        current = existing.get(tuple(row[k] for k in key_columns))
+        if current is None:
+            inserted.append(row)
+        elif not all(same_value(current[column], value) for column, value in row.items()):
+            updated.append(row)
+        else:
+            unchanged += 1
+    changed = inserted + updated
+    if changed:
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={column: stmt.excluded[column] for column in changed[0] if column not in key_columns}
+        )
+        session.exec(stmt, params=changed)
+
+    return inserted, updated, unchanged
+
+# UEFA member nations, named as the API names them
+EUROPEAN_COUNTRIES = [
+    "Albania", "Andorra", "Armenia", "Austria", "Azerbaijan", "Belarus", "Belgium", "Bosnia", "Bulgaria", "Croatia",
+    "Cyprus", "Czech-Republic", "Denmark", "England", "Estonia", "Faroe-Islands", "Finland", "France", "Georgia",
+    "Germany", "Gibraltar", "Greece", "Hungary", "Iceland", "Ireland", "Israel", "Italy", "Kazakhstan", "Kosovo",
+    "Latvia", "Liechtenstein", "Lithuania", "Luxembourg", "Macedonia", "Malta", "Moldova", "Montenegro", "Netherlands",
+    "Northern-Ireland", "Norway", "Poland", "Portugal", "Romania", "Russia", "San-Marino", "Scotland", "Serbia",
+    "Slovakia", "Slovenia", "Spain", "Sweden", "Switzerland", "Turkey", "Ukraine", "Wales"
+]
+
+# Request a Country's data from the API
+def request_country_data(input_country_name: str, endpoint: str):
+    console.print(f'Fetching {input_country_name} {endpoint} data from API.', style="blue")
     # API Request Setup
-    url = "https://v3.football.api-sports.io/leagues"
+    url = f"https://v3.football.api-sports.io/{endpoint}"
     params = {'country': input_country_name}
     # API Request
-    comps_data = api_request(url, params)
-    comps = comps_data['response']
+    return api_request(url, params)
+
+# Add Country from its Competitions data
+def add_country(session: Session, comps_data: dict):
+    country_name = comps_data['parameters']['country']
+    country = Country(country_name=country_name,
+                      num_comps=comps_data['results'],
+                      code=comps_data['response'][0]['country']['code'],
+                      flag=comps_data['response'][0]['country']['flag'])
+    session.add(country)
+    console.print(f'Created new Country: {country_name}.', style="green")
+    return country
+
+# Add new Competitions for a Country from a /leagues response
+def add_competitions(session: Session, country: Country, comps: list):
+    # Find existing Competitions in one query
+    existing_ids = set(session.exec(
+        select(Competition.comp_api_id).where(Competition.comp_api_id.in_([c['league']['id'] for c in comps]))
+    ).all())
     new_comps = []
     for comp_entry in track(comps, description="Processing Competitions."):
-        # Find or create Competition
-        comp_stmt = select(Competition).where(Competition.comp_api_id == comp_entry['league']['id'])
-        comp = session.exec(comp_stmt).first()
-        if not comp:
+        # Create Competition if new
+        if comp_entry['league']['id'] not in existing_ids:
+            existing_ids.add(comp_entry['league']['id'])
             comp = Competition(
                 comp_api_id=comp_entry['league']['id'],
                 comp_country_id=country.id,
@@ -70,37 +105,22 @@ def fetch_competitions(session: Session, input_country_name: str):
             )
             new_comps.append(comp)
             console.print(f'Created new Competition: {comp.comp_name}', style="green")
-    if new_comps:
-        session.add_all(new_comps)
-        session.commit()
-        console.print(f'Successfully added {len(new_comps)} competitions!', style="bold green")
-    else:
-        console.print(f'No new competitions were added!', style="bold red")
-
-    return len(new_comps)
+    session.add_all(new_comps)
 
+    return new_comps
 
-# Fetch Teams
-def fetch_teams(session: Session, input_country_name: str):
-    # Get Country
-    country_stmt = select(Country).where(Country.country_name == input_country_name)
-    country = session.exec(country_stmt).first()
-    # Fetch Teams with Country
-    console.print(f'Fetching {input_country_name} Teams data from API.', style="blue")
-    # API Request Setup
-    url = "https://v3.football.api-sports.io/teams"
-    params = {'country': input_country_name}
-    # API Request
-    teams_data = api_request(url, params)
-    teams_response = teams_data['response']
-    # Process each Team in Response
+# Add new Teams for a Country from a /teams response
+def add_teams(session: Session, country: Country, teams_response: list):
+    # Find existing Teams in one query
+    existing_ids = set(session.exec(
+        select(Team.team_api_id).where(Team.team_api_id.in_([e['team']['id'] for e in teams_response]))
+    ).all())
     new_teams = []
     for entry in track(teams_response, description="ProcessingTeams."):
         team_data = entry['team']
-        # Find or create Team
-        team_stmt = select(Team).where(Team.team_api_id == team_data['id'])
-        team = session.exec(team_stmt).first()
-        if not team:
+        # Create Team if new
+        if team_data['id'] not in existing_ids:
+            existing_ids.add(team_data['id'])
             team = Team(
                 team_api_id=team_data['id'],
                 name=team_data['name'],
@@ -113,35 +133,20 @@ def fetch_teams(session: Session, input_country_name: str):
             )
             new_teams.append(team)
             console.print(f'Created new team: {team.name}.', style="green")
-    if new_teams:
-        session.add_all(new_teams)
-        session.commit()
-        console.print(f'Successfully added {len(new_teams)} teams!', style="bold green")
-    else:
-        console.print(f'No new teams were added!', style="bold red")
-
-    return len(new_teams)
+    session.add_all(new_teams)
 
+    return new_teams
 
-# Fetch Venues
-def fetch_venues(session: Session, input_country_name: str):
-    # Get Country
-    country_stmt = select(Country).where(Country.country_name == input_country_name)
-    country = session.exec(country_stmt).first()
-    # Fetch Venues with Country
-    console.print(f'Fetching {input_country_name} Venues data from API.', style="blue")
-    # API Request Setup
-    url = "https://v3.football.api-sports.io/venues"
-    params = {'country': input_country_name}
-    # API Request
-    venues_data = api_request(url, params)
-    venues_response = venues_data['response']
-    # Process each Venue in Response
+# Add new Venues for a Country from a /venues response
+def add_venues(session: Session, country: Country, venues_response: list):
+    # Find existing Venues in one query
+    existing_ids = set(session.exec(
+        select(Venue.venue_api_id).where(Venue.venue_api_id.in_([e['id'] for e in venues_response]))
+    ).all())
     new_venues = []
     for entry in track(venues_response, description="ProcessingVenues."):
-        venue_stmt = select(Venue).where(Venue.venue_api_id == entry['id'])
-        venue = session.exec(venue_stmt).first()
-        if not venue:
+        if entry['id'] not in existing_ids:
+            existing_ids.add(entry['id'])
             # Create Venue
             venue = Venue(
                 venue_api_id=entry['id'],
@@ -156,8 +161,70 @@ def fetch_venues(session: Session, input_country_name: str):
             )
             new_venues.append(venue)
             console.print(f'Created new venue: {venue.name}.', style="green")
+    session.add_all(new_venues)
+
+    return new_venues
+
+# Fetch Country, returns the /leagues response when it had to be requested so it can be reused
+def make_country(session: Session, input_country_name: str):
+    # Create or get Country
+    country_stmt = select(Country).where(Country.country_name == input_country_name)
+    country = session.exec(country_stmt).first()
+    if not country:
+        # Fetch Competitions with Country
+        comps_data = request_country_data(input_country_name, 'leagues')
+        add_country(session, comps_data)
+        session.commit()
+        return comps_data
+    else:
+        console.print(f'Country found in records: {input_country_name}.', style="green")
+        return None
+
+
+# Fetch Competitions
+def fetch_competitions(session: Session, input_country_name: str, comps_data: dict = None):
+    # Get Country
+    country_stmt = select(Country).where(Country.country_name == input_country_name)
+    country = session.exec(country_stmt).first()
+    # Fetch Competitions with Country, unless make_country already did
+    if comps_data is None:
+        comps_data = request_country_data(input_country_name, 'leagues')
+    new_comps = add_competitions(session, country, comps_data['response'])
+    if new_comps:
+        session.commit()
+        console.print(f'Successfully added {len(new_comps)} competitions!', style="bold green")
+    else:
+        console.print(f'No new competitions were added!', style="bold red")
+
+    return len(new_comps)
+
+
+# Fetch Teams
+def fetch_teams(session: Session, input_country_name: str):
+    # Get Country
+    country_stmt = select(Country).where(Country.country_name == input_country_name)
+    country = session.exec(country_stmt).first()
+    # Fetch Teams with Country
+    teams_data = request_country_data(input_country_name, 'teams')
+    new_teams = add_teams(session, country, teams_data['response'])
+    if new_teams:
+        session.commit()
+        console.print(f'Successfully added {len(new_teams)} teams!', style="bold green")
+    else:
+        console.print(f'No new teams were added!', style="bold red")
+
+    return len(new_teams)
+
+
+# Fetch Venues
+def fetch_venues(session: Session, input_country_name: str):
+    # Get Country
+    country_stmt = select(Country).where(Country.country_name == input_country_name)
+    country = session.exec(country_stmt).first()
+    # Fetch Venues with Country
+    venues_data = request_country_data(input_country_name, 'venues')
+    new_venues = add_venues(session, country, venues_data['response'])
     if new_venues:
-        session.add_all(new_venues)
         session.commit()
         console.print(f'Successfully added {len(new_venues)} venues!', style="bold green")
     else:
@@ -166,18 +233,53 @@ def fetch_venues(session: Session, input_country_name: str):
     return len(new_venues)
 
 
+# Request the /leagues, /teams and /venues data for one Country
+def request_country_bundle(input_country_name: str):
+    return {endpoint: request_country_data(input_country_name, endpoint)
+            for endpoint in ('leagues', 'teams', 'venues')}
+
+# Write one Country's Competitions, Teams and Venues in a single transaction
+def store_country_bundle(session: Session, input_country_name: str, bundle: dict):
+    country_stmt = select(Country).where(Country.country_name == input_country_name)
+    country = session.exec(country_stmt).first()
+    if not country:
+        country = add_country(session, bundle['leagues'])
+        session.flush()
+    comps_added = add_competitions(session, country, bundle['leagues']['response'])
+    teams_added = add_teams(session, country, bundle['teams'].get('response', []))
+    venues_added = add_venues(session, country, bundle['venues'].get('response', []))
+    session.commit()
+
+    return len(comps_added), len(teams_added), len(venues_added)
+
+# Fetch several Countries, API requests run on a worker pool and each Country is written as it arrives
+def fetch_countries_bulk(session: Session, country_names: list, workers: int = 4):
+    summary = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(request_country_bundle, name): name for name in country_names}
+        for future in as_completed(futures):
+            name = futures[future]
+            bundle = future.result()
+            if not bundle['leagues'].get('response'):
+                console.print(f'No competitions returned for {name}, skipping.', style="red")
+                summary.append((name, "-", "-", "-"))
+                continue
+            try:
+                summary.append((name, *store_country_bundle(session, name, bundle)))
+            except Exception as e:
+                session.rollback()
+                console.print(f'Could not store {name}: {e}', style="red")
+                summary.append((name, "-", "-", "-"))
+
+    return sorted(summary)
+
+
 # Make Season
 def make_season(session: Session, competition_name: str, year: int):
-    # Find Competition
-    competition_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(competition_stmt).first()
+    # Find Competition and Season
+    competition, season, _ = resolver.resolve(session, competition_name, year)
     if not competition:
         raise ValueError(f'{competition_name} not found.')
-    # Find Season ID
-    season_stmt = select(Season).where(
-        (Season.league_id == competition.comp_api_id) & (Season.year == year)
-    )
-    season = session.exec(season_stmt).first()
     if not season:
         season = Season(year=year, league_id=competition.comp_api_id)
         session.add(season)
@@ -204,147 +306,192 @@ def fetch_standings(session: Session, season: Season, competition: Competition):
     standings_data = api_request(url, params)
     standings_response = standings_data['response'][0]['league']['standings'][0]
     # Process each Standing in Response
-    new_standings = []
+    standing_rows = []
     for team_entry in track(standings_response, description="Processing teams."):
         team_info = team_entry['team']
         stats = team_entry['all']
         home_stats = team_entry['home']
         away_stats = team_entry['away']
-        # Find or create the Standing
-        standing_stmt = select(Standing).where((Standing.team_id == team_info['id']) & (Standing.season_id == season.id))
-        standing = session.exec(standing_stmt).first()
-        if not standing:
-            # Create standings entry
-            standing = Standing(
-                team_id=team_info['id'],
-                season_id=season.id,
-                position=team_entry['rank'],
-                points=team_entry['points'],
-                goals_for=stats['goals']['for'],
-                goals_against=stats['goals']['against'],
-                goal_diff=(stats['goals']['for'] - stats['goals']['against']),
-                played=stats['played'],
-                wins=stats['win'],
-                draws=stats['draw'],
-                losses=stats['lose'],
-                home_goals_for=home_stats['goals']['for'],
-                home_goals_against=home_stats['goals']['against'],
-                home_goal_diff=(home_stats['goals']['for'] - home_stats['goals']['against']),
-                home_played=home_stats['played'],
-                home_wins=home_stats['win'],
-                home_draws=home_stats['draw'],
-                home_losses=home_stats['lose'],
-                away_goals_for=away_stats['goals']['for'],
-                away_goals_against=away_stats['goals']['against'],
-                away_goal_diff=(away_stats['goals']['for'] - away_stats['goals']['against']),
-                away_played=away_stats['played'],
-                away_wins=away_stats['win'],
-                away_draws=away_stats['draw'],
-                away_losses=away_stats['lose'],
-            )
-            new_standings.append(standing)
-
-    if new_standings:
-        session.add_all(new_standings)
-        session.commit()
-        console.print(f'New standings were added!', style="bold green")
-    else:
-        console.print(f'No new standings were added!', style="bold red")
+        standing_rows.append(dict(
+            team_id=team_info['id'],
+            season_id=season.id,
+            position=team_entry['rank'],
+            points=team_entry['points'],
+            goals_for=stats['goals']['for'],
+            goals_against=stats['goals']['against'],
+            goal_diff=(stats['goals']['for'] - stats['goals']['against']),
+            played=stats['played'],
+            wins=stats['win'],
+            draws=stats['draw'],
+            losses=stats['lose'],
+            home_goals_for=home_stats['goals']['for'],
+            home_goals_against=home_stats['goals']['against'],
+            home_goal_diff=(home_stats['goals']['for'] - home_stats['goals']['against']),
+            home_played=home_stats['played'],
+            home_wins=home_stats['win'],
+            home_draws=home_stats['draw'],
+            home_losses=home_stats['lose'],
+            away_goals_for=away_stats['goals']['for'],
+            away_goals_against=away_stats['goals']['against'],
+            away_goal_diff=(away_stats['goals']['for'] - away_stats['goals']['against']),
+            away_played=away_stats['played'],
+            away_wins=away_stats['win'],
+            away_draws=away_stats['draw'],
+            away_losses=away_stats['lose'],
+        ))
+    # Insert new and update changed Standings in one statement batch
+    inserted, updated, unchanged = bulk_upsert(session, Standing, standing_rows, ['team_id', 'season_id'],
+                                               Standing.season_id == season.id)
+    session.commit()
+    console.print(f'Standings: {len(inserted)} added, {len(updated)} updated, {unchanged} unchanged.',
+                  style="bold green" if inserted or updated else "bold red")
 
 
 # Fetch Fixtures
-def fetch_fixtures(session: Session, season: Season, competition: Competition):
+def fetch_fixtures(session: Session, season: Season, competition: Competition, filters: dict = None):
     console.print(f'Fetching fixture data for {season.year} season with league ID {competition.comp_api_id}.',
                   style="blue")
     # API Request Setup
     url = "https://v3.football.api-sports.io/fixtures"
-    params = {'league': competition.comp_api_id, 'season': season.year}
+    params = {'league': competition.comp_api_id, 'season': season.year, **(filters or {})}
+    # A request by Fixture IDs takes no other parameters
+    if 'ids' in params:
+        params = {'ids': params['ids']}
     # API Request
     fixture_data = api_request(url, params)
     fixtures_response = fixture_data['response']
+    # Find existing Venues and Countries in one query each
+    venue_ids = {entry['fixture']['venue']['id'] for entry in fixtures_response if entry['fixture']['venue']['id']}
+    existing_venue_ids = set(session.exec(
+        select(Venue.venue_api_id).where(Venue.venue_api_id.in_(venue_ids))
+    ).all())
+    country_ids = dict(session.exec(
+        select(Country.country_name, Country.id)
+        .where(Country.country_name.in_({entry['league']['country'] for entry in fixtures_response}))
+    ).all())
     # Process each Fixture in Response
-    new_fixtures = []
+    new_venues = []
+    fixture_rows = []
     for entry in track(fixtures_response, description="Processing Fixtures."):
         fixture_id = entry['fixture']['id']
         fixture_data = entry['fixture']
-        venue_stmt = select(Venue).where(Venue.venue_api_id == fixture_data['venue']['id'])
-        venue = session.exec(venue_stmt).first()
-        if not venue:
+        venue_id = fixture_data['venue']['id']
+        if venue_id and venue_id not in existing_venue_ids:
             # Create Venue
-            country_stmt = select(Country).where(Country.country_name == entry['league']['country'])
-            country = session.exec(country_stmt).first()
-            if fixture_data['venue']['id']:
-                venue = Venue(
-                    venue_api_id=fixture_data['venue']['id'],
-                    name=fixture_data['venue']['name'],
-                    address=None,
-                    city=fixture_data['venue']['city'],
-                    country=entry['league']['country'],
-                    country_id=country.id,
-                    capacity=None,
-                    surface=None,
-                    image=None
-                )
-                session.add(venue)
-                session.commit()
-                console.print(f'Created new venue: {venue.name}.', style="green")
-        # Find or create the Fixture
-        fixture_stmt = select(Fixture).where(Fixture.id == fixture_id)
-        fixture = session.exec(fixture_stmt).first()
-        if not fixture:
-            # Create fixture entry
-            fixture = Fixture(
-                id=fixture_id,
-                season_id=season.id,
-                home_team_id=entry['teams']['home']['id'],
-                away_team_id=entry['teams']['away']['id'],
-                venue_id=fixture_data['venue']['id'],
-                competition_id=competition.comp_api_id,
-                referee=fixture_data['referee'],
-                date=datetime.fromisoformat(fixture_data['date']),
-                short_status=fixture_data['status']['short'],
-                elapsed=fixture_data['status']['elapsed'],
-                round=entry['league']['round'],
-                home_goals=entry['goals']['home'],
-                away_goals=entry['goals']['away'],
-                half_home_goals=entry['score']['halftime']['home'],
-                half_away_goals=entry['score']['halftime']['away'],
-                full_home_goals=entry['score']['fulltime']['home'],
-                full_away_goals=entry['score']['fulltime']['away'],
-                et_home_goals=entry['score']['extratime']['home'],
-                et_away_goals=entry['score']['extratime']['away'],
-                pen_home_goals=entry['score']['penalty']['home'],
-                pen_away_goals=entry['score']['penalty']['away']
+            existing_venue_ids.add(venue_id)
+            venue = Venue(
+                venue_api_id=venue_id,
+                name=fixture_data['venue']['name'],
+                address=None,
+                city=fixture_data['venue']['city'],
+                country=entry['league']['country'],
+                country_id=country_ids.get(entry['league']['country']),
+                capacity=None,
+                surface=None,
+                image=None
             )
-        new_fixtures.append(fixture)
-    if new_fixtures:
-        session.add_all(new_fixtures)
-        session.commit()
-        console.print(f'{len(new_fixtures)} new fixtures were added!', style="bold green")
+            new_venues.append(venue)
+            console.print(f'Created new venue: {venue.name}.', style="green")
+        fixture_rows.append(dict(
+            id=fixture_id,
+            season_id=season.id,
+            home_team_id=entry['teams']['home']['id'],
+            away_team_id=entry['teams']['away']['id'],
+            venue_id=fixture_data['venue']['id'],
+            competition_id=competition.comp_api_id,
+            referee=fixture_data['referee'],
+            date=datetime.fromisoformat(fixture_data['date']),
+            short_status=fixture_data['status']['short'],
+            elapsed=fixture_data['status']['elapsed'],
+            round=entry['league']['round'],
+            home_goals=entry['goals']['home'],
+            away_goals=entry['goals']['away'],
+            half_home_goals=entry['score']['halftime']['home'],
+            half_away_goals=entry['score']['halftime']['away'],
+            full_home_goals=entry['score']['fulltime']['home'],
+            full_away_goals=entry['score']['fulltime']['away'],
+            et_home_goals=entry['score']['extratime']['home'],
+            et_away_goals=entry['score']['extratime']['away'],
+            pen_home_goals=entry['score']['penalty']['home'],
+            pen_away_goals=entry['score']['penalty']['away']
+        ))
+    if new_venues:
+        session.add_all(new_venues)
+        session.flush()
+    # Insert new and update changed Fixtures in one statement batch
+    inserted, updated, unchanged = bulk_upsert(session, Fixture, fixture_rows, ['id'],
+                                               Fixture.id.in_([row['id'] for row in fixture_rows]))
+    session.commit()
+    console.print(f'Fixtures: {len(inserted)} added, {len(updated)} updated, {unchanged} unchanged.',
+                  style="bold green" if inserted or updated else "bold red")
+
+    return inserted, updated, unchanged
+
+
+# Sync only the unfinished Fixtures of a Season, refreshing Standings when a result comes in
+def sync_season(session: Session, competition_name: str, year: int):
+    # Find Competition and Season
+    competition, season, _ = resolver.resolve(session, competition_name, year)
+    if not season:
+        raise ValueError(f'Could not find Season for: {year} {competition_name}. Use fetch-season first.')
+    # Find the Fixtures that can still be played
+    open_fixtures = session.exec(
+        select(Fixture.id, Fixture.date, Fixture.short_status)
+        .where((Fixture.season_id == season.id) & Fixture.short_status.not_in(CLOSED_STATUSES))
+    ).all()
+    if not open_fixtures:
+        console.print(f'All fixtures for {year} {competition_name} are final, nothing to sync.', style="green")
+        return
+    # Fixtures after today cannot have a result yet
+    date_to = datetime.now(timezone.utc).date()
+    # A Fixture postponed long ago would pin the date window there, so it is refreshed by ID instead
+    postponed_before = datetime.combine(date_to - timedelta(days=SYNC_POSTPONED_DAYS), time.min, tzinfo=timezone.utc)
+    postponed_ids = [fixture_id for fixture_id, date, status in open_fixtures
+                     if status in POSTPONED_STATUSES and date.replace(tzinfo=timezone.utc) < postponed_before]
+    window_dates = [date for fixture_id, date, status in open_fixtures if fixture_id not in postponed_ids]
+    date_from = min(window_dates).date() if window_dates else None
+    if not postponed_ids and date_from > date_to:
+        console.print(f'No open fixtures for {year} {competition_name} have been played yet.', style="green")
+        return
+    inserted, updated = [], []
+    for i in range(0, len(postponed_ids), FIXTURE_IDS_PER_REQUEST):
+        batch = postponed_ids[i:i + FIXTURE_IDS_PER_REQUEST]
+        batch_inserted, batch_updated, _ = fetch_fixtures(session, season, competition,
+                                                          {'ids': '-'.join(str(fixture_id) for fixture_id in batch)})
+        inserted += batch_inserted
+        updated += batch_updated
+    if date_from is not None and date_from <= date_to:
+        window_inserted, window_updated, _ = fetch_fixtures(session, season, competition,
+                                                            {'from': date_from.isoformat(), 'to': date_to.isoformat()})
+        inserted += window_inserted
+        updated += window_updated
+    if inserted:
+        make_meta_join_table(session, season)
+    # Standings only move when a Fixture has become final
+    new_results = [row for row in inserted + updated if row['short_status'] in FINISHED_STATUSES]
+    if competition.comp_type == 'League' and new_results:
+        console.print(f'{len(new_results)} new results, refreshing standings.', style="blue")
+        fetch_standings(session, season, competition)
     else:
-        console.print(f'No new fixtures were added!', style="bold red")
+        console.print(f'No new results, standings left as they are.', style="green")
 
 
 # Make MetaData join table
 def make_meta_join_table(session: Session, season: Season):
-    # Find Fixtures
-    fixtures_stmt = select(Fixture).where(Fixture.season_id == season.id)
-    fixtures = session.exec(fixtures_stmt).all()
-    home_venue = []
-    for fixture in fixtures:
-        home_venue.append((
-            fixture.home_team_id,
-            fixture.venue_id
-        ))
-    unique_home_venue = set(home_venue)
+    # Find distinct home Team and Venue pairs from the Season's Fixtures
+    home_venue_stmt = (select(Fixture.home_team_id, Fixture.venue_id)
+                       .where(Fixture.season_id == season.id)
+                       .distinct())
+    unique_home_venue = set(session.exec(home_venue_stmt).all())
+    # Find Teams already linked to this Season in one query
+    existing_team_ids = set(session.exec(
+        select(TeamSeasonCompetition.team_id).where(TeamSeasonCompetition.season_id == season.id)
+    ).all())
     new_meta_entries = []
     for pair in unique_home_venue:
-        # Find or Make Meta Instance
-        meta_instance_stmt = select(TeamSeasonCompetition).where(
-            (TeamSeasonCompetition.season_id == season.id) & (TeamSeasonCompetition.team_id == pair[0])
-        )
-        meta_instance = session.exec(meta_instance_stmt).first()
-        if not meta_instance:
+        # Make Meta Instance if new
+        if pair[0] not in existing_team_ids:
+            existing_team_ids.add(pair[0])
             meta_instance = TeamSeasonCompetition(
                 team_id=pair[0],
                 season_id=season.id,
@@ -360,40 +507,204 @@ def make_meta_join_table(session: Session, season: Season):
     else:
         console.print(f'No new meta instances were added!', style="bold red")
 
-# Safely Pull Fixture Statistics
-def safe_stats(stats, index):
+# FixtureStats field for each statistic type label in API responses, field names are without home_/away_
+STAT_FIELDS = {
+    'Shots on Goal': 'sh_on_goal',
+    'Shots off Goal': 'sh_off_goal',
+    'Total Shots': 'total_sh',
+    'Blocked Shots': 'blocked_sh',
+    'Shots insidebox': 'sh_inside',
+    'Shots outsidebox': 'sh_outside',
+    'Fouls': 'fouls',
+    'Corner Kicks': 'corners',
+    'Offsides': 'offsides',
+    'Ball Possession': 'possession',
+    'Yellow Cards': 'yellows',
+    'Red Cards': 'reds',
+    'Goalkeeper Saves': 'saves',
+    'Total passes': 'tot_passes',
+    'Passes accurate': 'accurate_pass',
+    'Passes %': 'percent_pass',
+    'expected_goals': 'ex_goals',
+}
+# Fields the API sends as text, e.g. 55% or 1.37
+NUMBER_FIELDS = ('possession', 'percent_pass', 'ex_goals')
+# Every field unset, copied for each Team's statistics
+NO_STATS = dict.fromkeys(STAT_FIELDS.values())
+
+# Percentages such as 55% and expected goals such as 1.37 come as text, they are stored as numbers
+def stat_number(value):
+    if value is None:
+        return None
     try:
-        return stats['statistics'][index]['value']
-    except (IndexError, KeyError, TypeError):
+        return float(str(value).rstrip('%'))
+    except ValueError:
         return None
 
-# Parse Safely Pulled Fixture Statistics
+# Parse one Team's statistics by their type labels in a single pass, missing ones are None and unknown ones ignored
 def parse_stats(stats: dict) -> dict:
-    values = [safe_stats(stats, i) for i in range(17)]
-    return dict(
-        sh_on_goal=values[0],
-        sh_off_goal=values[1],
-        total_sh=values[2],
-        blocked_sh=values[3],
-        sh_inside=values[4],
-        sh_outside=values[5],
-        fouls=values[6],
-        corners=values[7],
-        offsides=values[8],
-        possession=values[9],
-        yellows=values[10],
-        reds=values[11],
-        saves=values[12],
-        tot_passes=values[13],
-        accurate_pass=values[14],
-        percent_pass=values[15],
-        ex_goals=values[16]
+    parsed = NO_STATS.copy()
+    for stat in stats.get('statistics') or ():
+        field = STAT_FIELDS.get(stat.get('type'))
+        if field is not None:
+            parsed[field] = stat.get('value')
+    for field in NUMBER_FIELDS:
+        parsed[field] = stat_number(parsed[field])
+    return parsed
+
+# Build FixtureStats from a /fixtures/statistics response, None when the response has no statistics
+def make_fixture_stats(fixture_id: int, fix_stats_data: dict):
+    if len(fix_stats_data.get('response', [])) < 2:
+        console.print(f'No fixture statistics returned for Fixture ID: {fixture_id}.', style="red")
+        return None
+    # Parse Statistics
+    home_stats = fix_stats_data['response'][0]
+    away_stats = fix_stats_data['response'][1]
+    home = parse_stats(home_stats)
+    away = parse_stats(away_stats)
+    return FixtureStats(
+        fixture_id=fixture_id,
+        home_team_id=home_stats['team']['id'],
+        **{f"home_{k}": v for k, v in home.items()},
+        away_team_id=away_stats['team']['id'],
+        **{f"away_{k}": v for k, v in away.items()}
     )
+
+# Fetch and parse Fixture Statistics for one Fixture
+def request_fixture_stats(fixture_id: int, finished: bool = False):
+    # API Request Setup
+    url = "https://v3.football.api-sports.io/fixtures/statistics"
+    params = {'fixture': fixture_id}
+    # API Request, only a finished Fixture's Statistics are cached for good
+    fix_stats_data = api_request(url, params, finished)
+    return make_fixture_stats(fixture_id, fix_stats_data)
+
+# Fixture IDs accepted by one /fixtures?ids= request
+FIXTURE_IDS_PER_REQUEST = 20
+
+# Build FixtureStats for every Fixture in a /fixtures?ids= response, which embeds each Fixture's statistics
+def make_fixture_stats_batch(fixtures_data: dict) -> list:
+    fixture_instances = []
+    for entry in fixtures_data.get('response', []):
+        fixture_instance = make_fixture_stats(entry['fixture']['id'], {'response': entry.get('statistics', [])})
+        if fixture_instance:
+            fixture_instances.append(fixture_instance)
+    return fixture_instances
+
+# Fetch and parse Fixture Statistics for up to 20 Fixtures in one request
+def request_fixture_stats_batch(fixture_ids: list) -> list:
+    # API Request Setup
+    url = "https://v3.football.api-sports.io/fixtures"
+    params = {'ids': '-'.join(str(fixture_id) for fixture_id in fixture_ids)}
+    # API Request
+    fixtures_data = api_request(url, params)
+    return make_fixture_stats_batch(fixtures_data)
+
+# Fetch Fixture Statistics for a list of Fixture IDs, in parallel when workers > 1
+# batched groups 20 Fixtures per /fixtures?ids= request instead of one /fixtures/statistics request each
+# check_existing=False trusts the caller to pass only Fixtures without Statistics
+def fetch_fixture_stats_list(session: Session, fixture_ids: list, workers: int = 1, batched: bool = False,
+                             commit_every: int = 20, check_existing: bool = True):
+    # Parsed numbers would be stored as text in a database that has not been migrated
+    check_fixture_stats_columns(session.connection())
+    # Skip Fixtures that already have Statistics
+    have_stats = set(session.exec(
+        select(FixtureStats.fixture_id).where(FixtureStats.fixture_id.in_(fixture_ids))
+    ).all()) if check_existing else set()
+    missing_ids = [fixture_id for fixture_id in dict.fromkeys(fixture_ids) if fixture_id not in have_stats]
+    if batched:
+        tasks = [missing_ids[i:i + FIXTURE_IDS_PER_REQUEST]
+                 for i in range(0, len(missing_ids), FIXTURE_IDS_PER_REQUEST)]
+        request = request_fixture_stats_batch
+    else:
+        tasks = missing_ids
+        finished_ids = set(session.exec(
+            select(Fixture.id).where(Fixture.id.in_(missing_ids) & Fixture.short_status.in_(FINISHED_STATUSES))
+        ).all())
+
+        # One request per Fixture
+        def request(fixture_id):
+            fixture_instance = request_fixture_stats(fixture_id, fixture_id in finished_ids)
+            return [fixture_instance] if fixture_instance else []
+    added = 0
+    pending = []
+
+    # Write results in bulk as they arrive
+    def store(fixture_instances, flush=False):
+        nonlocal added
+        pending.extend(fixture_instances)
+        if pending and (len(pending) >= commit_every or flush):
+            session.add_all(pending)
+            session.commit()
+            added += len(pending)
+            pending.clear()
+
+    description = f"Fetching Fixture Statistics ({len(tasks)} requests"
+    try:
+        if workers <= 1:
+            for task in track(tasks, description=f"{description})."):
+                store(request(task))
+        else:
+            # Each request still waits on the shared rate limiter, workers only bound how many are in flight
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(request, task) for task in tasks]
+                stored = set()
+                try:
+                    for future in track(as_completed(futures), total=len(futures),
+                                        description=f"{description}, {workers} workers)."):
+                        store(future.result())
+                        stored.add(future)
+                except BaseException:
+                    # Requests that have not started are dropped instead of spending more of the quota, those
+                    # already answered are kept
+                    for future in futures:
+                        future.cancel()
+                    wait(futures)
+                    for future in futures:
+                        if future not in stored and not future.cancelled() and future.exception() is None:
+                            pending.extend(future.result())
+                    raise
+    finally:
+        # Store the Statistics already parsed, also when a request fails or the daily quota runs out
+        store([], flush=True)
+
+    return added
+
+# IDs of the finished Fixtures in a Season without Statistics, in date order, from a single anti-join
+def fixtures_missing_stats(session: Session, season_id: int) -> list:
+    return session.exec(
+        select(Fixture.id)
+        .outerjoin(FixtureStats, FixtureStats.fixture_id == Fixture.id)
+        .where((Fixture.season_id == season_id) & Fixture.short_status.in_(FINISHED_STATUSES)
+               & (FixtureStats.id == None))
+        .order_by(Fixture.date)
+    ).all()
+
+# Fetch Fixture Statistics for every finished Fixture of a Season (Competition and Year)
+def fetch_fixture_stats_season(session: Session, competition_name: str, year: int, workers: int = 1,
+                               batched: bool = True):
+    # Find the Season, of the same Competition the other commands pick when several share the name
+    season = resolver.season(session, competition_name, year)
+    if not season:
+        raise ValueError(f'Could not find Season for: {year} {competition_name}. Use fetch-season first.')
+    fixture_ids = fixtures_missing_stats(session, season.id)
+    if not fixture_ids:
+        console.print(f'All finished fixtures for {year} {competition_name} already have statistics.',
+                      style="green")
+        return
+    console.print(f'{len(fixture_ids)} finished fixtures for {year} {competition_name} need statistics.',
+                  style="blue")
+    added = fetch_fixture_stats_list(session, fixture_ids, workers, batched, check_existing=False)
+    if added:
+        console.print(f'{added} new fixture statistics were added!', style="bold green")
+    else:
+        console.print(f'No statistics were returned for {year} {competition_name}.', style="bold red")
+
 # Fetch Fixture Statistics for one Team for all Competitions in a Year
-def fetch_fixture_stats_team(session: Session, year: int, team_name: str):
+def fetch_fixture_stats_team(session: Session, year: int, team_name: str, workers: int = 1,
+                             batched: bool = False):
     # Find Team ID
-    team_stmt = select(Team).where(Team.name == team_name)
-    team = session.exec(team_stmt).first()
+    team = resolver.team(session, team_name)
     if not team:
         raise ValueError(f'Could not find Team: {team_name}')
     # Find Season ID
@@ -415,56 +726,22 @@ def fetch_fixture_stats_team(session: Session, year: int, team_name: str):
         fixtures = session.exec(fixtures_stmt).all()
         if not fixtures:
             raise ValueError(f'Could not find Fixtures for: {team_name} with Season ID: {comp.season_id}')
-        # Iterate through Fixture IDs
-        new_fix_stats = []
-        for fixture in fixtures:
-            fix_stats_stmt = select(FixtureStats).where(FixtureStats.fixture_id == fixture.id)
-            fix_stats = session.exec(fix_stats_stmt).first()
-            if not fix_stats:
-                # Fetch Fixture Stats
-                time.sleep(8)
-                # API Request Setup
-                url = "https://v3.football.api-sports.io/fixtures/statistics"
-                params = {'fixture': fixture.id}
-                # API Request
-                fix_stats_data = api_request(url, params)
-                # Parse Statistics
-                home_stats = fix_stats_data['response'][0]
-                away_stats = fix_stats_data['response'][1]
-                home = parse_stats(home_stats)
-                away = parse_stats(away_stats)
-                fixture_instance = FixtureStats(
-                    fixture_id=fix_stats_data['parameters']['fixture'],
-                    home_team_id=home_stats['team']['id'],
-                    **{f"home_{k}": v for k, v in home.items()},
-                    away_team_id=away_stats['team']['id'],
-                    **{f"away_{k}": v for k, v in away.items()}
-                )
-                new_fix_stats.append(fixture_instance)
-        if new_fix_stats:
-            session.add_all(new_fix_stats)
-            session.commit()
-            console.print(f'{len(new_fix_stats)} new fixture statistics were added!', style="bold green")
+        # Fetch Statistics for Fixtures without them
+        added = fetch_fixture_stats_list(session, [fixture.id for fixture in fixtures], workers, batched)
+        if added:
+            console.print(f'{added} new fixture statistics were added!', style="bold green")
         else:
-            console.print(f'No new fixture statistics were added for {comp.comp_name}!', style="bold red")
+            console.print(f'No new fixture statistics were added for Season ID: {comp.season_id}!', style="bold red")
 
 # Fetch Fixture Statistics for one Team for one Season (Competition and Year)
-def fetch_fixture_stats_team_season(session: Session, year: int, team_name: str, competition_name: str):
-    # Find League ID
-    competition_stmt = select(Competition).where(Competition.comp_name == competition_name)
-    competition = session.exec(competition_stmt).first()
+def fetch_fixture_stats_team_season(session: Session, year: int, team_name: str, competition_name: str,
+                                    workers: int = 1, batched: bool = False):
+    # Find League, Season and Team IDs
+    competition, season, team = resolver.resolve(session, competition_name, year, team_name)
     if not competition:
         raise ValueError(f'Could not find Competition: {competition_name}')
-    # Find Season ID
-    season_stmt = select(Season).where(
-        (Season.league_id == competition.comp_api_id) & (Season.year == year)
-    )
-    season = session.exec(season_stmt).first()
     if not season:
         raise ValueError(f'Could not find Season for: {year} {competition_name}')
-    # Find Team ID
-    team_stmt = select(Team).where(Team.name == team_name)
-    team = session.exec(team_stmt).first()
     if not team:
         raise ValueError(f'Could not find Team: {team_name}')
     # Pull Fixtures list for Team and Season
@@ -478,78 +755,9 @@ def fetch_fixture_stats_team_season(session: Session, year: int, team_name: str,
     fixtures = session.exec(fixtures_stmt).all()
     if not fixtures:
         raise ValueError(f'Could not find Fixtures for: {team_name} from {year} {competition_name}')
-    # Iterate through Fixture IDs
-    new_fix_stats = []
-    for fixture in fixtures:
-        fix_stats_stmt = select(FixtureStats).where(FixtureStats.fixture_id == fixture.id)
-        fix_stats = session.exec(fix_stats_stmt).first()
-        if not fix_stats:
-            # Fetch Fixture Stats
-            time.sleep(8)
-            # API Request Setup
-            url = "https://v3.football.api-sports.io/fixtures/statistics"
-            params = {'fixture': fixture.id}
-            # API Request
-            fix_stats_data = api_request(url, params)
-            # Parse Statistics
-            home_stats = fix_stats_data['response'][0]
-            away_stats = fix_stats_data['response'][1]
-            home = parse_stats(home_stats)
-            away = parse_stats(away_stats)
-            fixture_instance = FixtureStats(
-                fixture_id=fix_stats_data['parameters']['fixture'],
-                home_team_id=home_stats['team']['id'],
-                **{f"home_{k}": v for k, v in home.items()},
-                away_team_id=away_stats['team']['id'],
-                **{f"away_{k}": v for k, v in away.items()}
-            )
-            new_fix_stats.append(fixture_instance)
-    if new_fix_stats:
-        session.add_all(new_fix_stats)
-        session.commit()
-        console.print(f'{len(new_fix_stats)} new fixture statistics were added!', style="bold green")
+    # Fetch Statistics for Fixtures without them
+    added = fetch_fixture_stats_list(session, [fixture.id for fixture in fixtures], workers, batched)
+    if added:
+        console.print(f'{added} new fixture statistics were added!', style="bold green")
     else:
         console.print(f'No new fixture statistics were added for {competition_name}!', style="bold red")
-
-# Make Fixture Stats Table
-def make_fix_stats_table(fixtures):
-    headers = [
-        "Match Day", "Date", "Home Team", "Away Team", "Referee", "Venue"
-    ]
-    for fixture, home_team_name, away_team_name, venue, fixturestats in fixtures:
-        data = []
-        round_str = fixture.round
-        matchday_num = int(round_str.split(" - ")[-1])
-        data.append([
-            matchday_num,
-            fixture.date,
-            home_team_name,
-            away_team_name,
-            fixture.referee,
-            venue.name
-        ])
-        console.print(f"\n[bold]Fixture stats for[/bold] [green]{home_team_name}[/green] "
-                      f" [bold]vs.[/bold] [green]{away_team_name}[/green] "
-                      f"[bold]on[/bold] [green]{fixture.date}[/green]")
-        print(tabulate(data, headers=headers, tablefmt="pretty"))
-        stats = []
-        headers_stats = [f'{home_team_name}', '', f'{away_team_name}']
-        stats.append([fixture.home_goals, "GOALS", fixture.away_goals])
-        stats.append([fixturestats.home_ex_goals, "EXPECTED GOALS", fixturestats.away_ex_goals])
-        stats.append([fixturestats.home_sh_on_goal, "SHOTS ON GOAL", fixturestats.away_sh_on_goal])
-        stats.append([fixturestats.home_sh_off_goal, "SHOTS OFF GOAL", fixturestats.away_sh_off_goal])
-        stats.append([fixturestats.home_total_sh, "TOTAL SHOTS", fixturestats.away_total_sh])
-        stats.append([fixturestats.home_blocked_sh, "BLOCKED SHOTS", fixturestats.away_blocked_sh])
-        stats.append([fixturestats.home_sh_inside, "SHOTS INSIDE BOX", fixturestats.away_sh_inside])
-        stats.append([fixturestats.home_sh_outside, "SHOTS OUTSIDE BOX", fixturestats.away_sh_outside])
-        stats.append([fixturestats.home_fouls, "FOULS", fixturestats.away_fouls])
-        stats.append([fixturestats.home_corners, "CORNERS", fixturestats.away_corners])
-        stats.append([fixturestats.home_offsides, "OFFSIDES", fixturestats.away_offsides])
-        stats.append([fixturestats.home_possession, "BALL POSSESSION", fixturestats.away_possession])
-        stats.append([fixturestats.home_yellows, "YELLOW CARDS", fixturestats.away_yellows])
-        stats.append([fixturestats.home_reds, "RED CARDS", fixturestats.away_reds])
-        stats.append([fixturestats.home_saves, "SAVES", fixturestats.away_saves])
-        stats.append([fixturestats.home_tot_passes, "TOTAL PASSES", fixturestats.away_tot_passes])
-        stats.append([fixturestats.home_accurate_pass, "ACCURATE PASSES", fixturestats.away_accurate_pass])
-        stats.append([fixturestats.home_percent_pass, "PASSING %", fixturestats.away_percent_pass])
-        print(tabulate(stats, headers=headers_stats, tablefmt="pretty"))
\ No newline at end of file
@@ -0,0 +1,213 @@
+# Import libraries
+from sqlmodel import Session, select, update, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from rich.console import Console
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TimeElapsedColumn, TimeRemainingColumn
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta, timezone
+import json
+
+# Import Models
+from models import ApiJob, FixtureStats, check_fixture_stats_columns
+
+# Import Functions
+from api_request import api_request
+from helper_functions import (make_fixture_stats, make_fixture_stats_batch, fixtures_missing_stats,
+                              FIXTURE_IDS_PER_REQUEST)
+from resolver import resolver
+
+console = Console()
+
+API_URL = "https://v3.football.api-sports.io"
+# A running job claimed longer ago than this was left behind by a worker that crashed or was killed
+STALE_AFTER = timedelta(minutes=30)
+
+
+# Add jobs for an endpoint, one per params dict, skipping any already queued or done
+def enqueue(session: Session, endpoint: str, params_list: list) -> int:
+    if not params_list:
+        return 0
+    now = datetime.now(timezone.utc)
+    rows = [dict(endpoint=endpoint, params=json.dumps(params, sort_keys=True), status='pending', attempts=0,
+                 created_at=now) for params in params_list]
+    stmt = sqlite_insert(ApiJob.__table__).on_conflict_do_nothing(index_elements=['endpoint', 'params'])
+    result = session.exec(stmt, params=rows)
+    session.commit()
+
+    return result.rowcount
+
+# Fixture IDs already covered by a pending or running job
+def queued_fixture_ids(session: Session) -> set:
+    queued = set()
+    jobs = session.exec(
+        select(ApiJob.endpoint, ApiJob.params)
+        .where(ApiJob.status.in_(['pending', 'running']) & ApiJob.endpoint.in_(['/fixtures', '/fixtures/statistics']))
+    ).all()
+    for endpoint, params in jobs:
+        params = json.loads(params)
+        if endpoint == '/fixtures/statistics':
+            queued.add(int(params['fixture']))
+        else:
+            queued.update(int(fixture_id) for fixture_id in params['ids'].split('-'))
+    return queued
+
+# Queue statistics jobs, 20 Fixtures per /fixtures?ids= job, for every finished Fixture of a Season without
+# FixtureStats that is not already queued
+def enqueue_fixture_stats(session: Session, competition_name: str, year: int) -> int:
+    season = resolver.season(session, competition_name, year)
+    if not season:
+        raise ValueError(f'Could not find Season for: {year} {competition_name}. Use fetch-season first.')
+    fixture_ids = fixtures_missing_stats(session, season.id)
+    queued = queued_fixture_ids(session)
+    fixture_ids = [fixture_id for fixture_id in fixture_ids if fixture_id not in queued]
+    chunks = [fixture_ids[i:i + FIXTURE_IDS_PER_REQUEST] for i in range(0, len(fixture_ids), FIXTURE_IDS_PER_REQUEST)]
+
+    return enqueue(session, '/fixtures', [{'ids': '-'.join(str(fixture_id) for fixture_id in chunk)}
+                                          for chunk in chunks])
+
+# Insert FixtureStats, skipping Fixtures that already have them from fetch-season-stats or an earlier run
+def insert_fixture_stats(session: Session, fixture_instances: list):
+    rows = [fixture_instance.model_dump(exclude={'id'}) for fixture_instance in fixture_instances]
+    session.exec(sqlite_insert(FixtureStats.__table__).on_conflict_do_nothing(), params=rows)
+
+# Store a /fixtures/statistics response, returns an error message when there is nothing to store
+def store_fixture_stats(session: Session, params: dict, data: dict):
+    fixture_instance = make_fixture_stats(int(params['fixture']), data)
+    if not fixture_instance:
+        return 'No statistics in response'
+    insert_fixture_stats(session, [fixture_instance])
+    return None
+
+# Store the statistics embedded in a /fixtures?ids= response, Fixtures without statistics are queued again
+# by the next enqueue
+def store_fixture_stats_batch(session: Session, params: dict, data: dict):
+    fixture_instances = make_fixture_stats_batch(data)
+    if not fixture_instances:
+        return 'No statistics in response'
+    insert_fixture_stats(session, fixture_instances)
+    return None
+
+# How each endpoint's response is written to the database
+HANDLERS = {
+    '/fixtures': store_fixture_stats_batch,
+    '/fixtures/statistics': store_fixture_stats,
+}
+
+
+# Add the claimed_at column to a job table created before jobs recorded when they were claimed
+def upgrade_job_table(session: Session):
+    conn = session.connection()
+    columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({ApiJob.__tablename__})")}
+    if columns and 'claimed_at' not in columns:
+        conn.exec_driver_sql(f"ALTER TABLE {ApiJob.__tablename__} ADD COLUMN claimed_at DATETIME")
+    session.commit()
+
+# Put jobs left running by a crashed or killed worker back in the queue, jobs claimed recently may belong to a
+# worker that is still running
+def recover(session: Session) -> int:
+    stale_before = datetime.now(timezone.utc) - STALE_AFTER
+    result = session.exec(
+        update(ApiJob).where((ApiJob.status == 'running')
+                             & ((ApiJob.claimed_at == None) | (ApiJob.claimed_at < stale_before)))
+        .values(status='pending')
+    )
+    session.commit()
+    return result.rowcount
+
+# Put the jobs this worker still holds back in the queue
+def release(session: Session, job_ids: list) -> int:
+    result = session.exec(
+        update(ApiJob).where(ApiJob.id.in_(job_ids) & (ApiJob.status == 'running')).values(status='pending')
+    )
+    session.commit()
+    return result.rowcount
+
+# Claim one pending job, the status check makes the claim atomic if another process got there first
+def claim(session: Session, job: ApiJob) -> bool:
+    result = session.exec(
+        update(ApiJob).where((ApiJob.id == job.id) & (ApiJob.status == 'pending'))
+        .values(status='running', attempts=ApiJob.attempts + 1, claimed_at=datetime.now(timezone.utc))
+    )
+    session.commit()
+    return result.rowcount == 1
+
+# Store a job's response and mark it done or failed in a single transaction
+def complete(session: Session, job: ApiJob, data: dict):
+    params = json.loads(job.params)
+    try:
+        error = HANDLERS[job.endpoint](session, params, data) if data else 'API request failed'
+    except Exception as e:
+        # Keep nothing from a response that could not be stored, the job is marked failed instead
+        session.rollback()
+        error = f'{e.__class__.__name__}: {e}'.splitlines()[0]
+    session.exec(
+        update(ApiJob).where(ApiJob.id == job.id)
+        .values(status='failed' if error else 'done', error=error, finished_at=datetime.now(timezone.utc))
+    )
+    session.commit()
+    return error is None
+
+# Count jobs by status
+def job_counts(session: Session) -> dict:
+    return dict(session.exec(select(ApiJob.status, func.count(ApiJob.id)).group_by(ApiJob.status)).all())
+
+# Work through every pending job, committing each one as it finishes
+def run_jobs(session: Session, workers: int = 1):
+    check_fixture_stats_columns(session.connection())
+    recovered = recover(session)
+    if recovered:
+        console.print(f'Resuming {recovered} jobs that were interrupted.', style="yellow")
+    pending = session.exec(select(ApiJob).where(ApiJob.status == 'pending').order_by(ApiJob.id)).all()
+    counts = job_counts(session)
+    console.print(f"Backfill: {counts.get('done', 0)} done, {len(pending)} pending, "
+                  f"{counts.get('failed', 0)} failed.", style="blue")
+    if not pending:
+        return
+    queue = iter(pending)
+    in_flight = {}
+    claimed = set()
+    done = failed = 0
+    progress = Progress("[progress.description]{task.description}", BarColumn(), MofNCompleteColumn(),
+                        TimeElapsedColumn(), "ETA", TimeRemainingColumn(), console=console)
+    with progress, ThreadPoolExecutor(max_workers=workers) as executor:
+        task = progress.add_task("Running API jobs.", total=len(pending))
+        try:
+            while True:
+                # Keep up to `workers` claimed jobs in flight, requests still wait on the shared rate limiter
+                for job in queue:
+                    if claim(session, job):
+                        claimed.add(job.id)
+                        url = f"{API_URL}{job.endpoint}"
+                        in_flight[executor.submit(api_request, url, json.loads(job.params))] = job
+                        if len(in_flight) >= workers:
+                            break
+                    else:
+                        progress.advance(task)
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = in_flight.pop(future)
+                    if complete(session, job, future.result()):
+                        done += 1
+                    else:
+                        failed += 1
+                    claimed.discard(job.id)
+                    progress.advance(task)
+        except BaseException as e:
+            # Jobs this worker still holds go back to pending, everything committed so far is kept
+            for future in in_flight:
+                future.cancel()
+            session.rollback()
+            release(session, list(claimed))
+            if isinstance(e, KeyboardInterrupt):
+                console.print(f'Interrupted, {done} jobs saved. Run backfill again to resume.', style="yellow")
+            raise
+    console.print(f'Backfill finished: {done} done, {failed} failed.',
+                  style="bold green" if not failed else "bold yellow")
+
+# Put failed jobs back in the queue
+def retry_failed(session: Session) -> int:
+    result = session.exec(update(ApiJob).where(ApiJob.status == 'failed').values(status='pending', error=None))
+    session.commit()
+    return result.rowcount
@@ -3,6 +3,13 @@ from sqlmodel import SQLModel, Field, UniqueConstraint
 from typing import Optional
 from datetime import datetime
 
+# Fixture statuses that are final and can no longer change
+FINISHED_STATUSES = ('FT', 'AET', 'PEN')
+# Fixture statuses that will not be played any more: cancelled, abandoned, awarded and walkovers
+CLOSED_STATUSES = (*FINISHED_STATUSES, 'CANC', 'ABD', 'AWD', 'WO')
+# Fixture statuses waiting for a new date
+POSTPONED_STATUSES = ('PST',)
+
 # Define Country Model
 class Country(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -16,7 +23,7 @@ class Competition(SQLModel, table=True):
     comp_api_id: int = Field(primary_key=True)
     comp_country_id: int = Field(foreign_key="country.id")
     country_name: str = Field(foreign_key="country.country_name")
-    comp_name: str
+    comp_name: str = Field(index=True)
     comp_type: str
     comp_logo: str
 
@@ -35,7 +42,7 @@ class Venue(SQLModel, table=True):
 # Define Team Model, links to Venue
 class Team(SQLModel, table=True):
     team_api_id: int = Field(primary_key=True)
-    name: str
+    name: str = Field(index=True)
     short_name: Optional[str] = Field(default=None)
     country: str
     country_id: int = Field(foreign_key="country.id")
@@ -46,7 +53,7 @@ class Team(SQLModel, table=True):
 # Define Season Model, links to Competition
 class Season(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    year: int
+    year: int = Field(index=True)
     league_id: int = Field(foreign_key="competition.comp_api_id")
     __table_args__ = (UniqueConstraint("year", "league_id"),)
 
@@ -54,7 +61,7 @@ class Season(SQLModel, table=True):
 class TeamSeasonCompetition(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     team_id: int = Field(foreign_key="team.team_api_id")
-    season_id: int = Field(foreign_key="season.id")
+    season_id: int = Field(foreign_key="season.id", index=True)
     competition_id: int = Field(foreign_key="competition.comp_api_id")
     venue_id: Optional[int] = Field(foreign_key="venue.venue_api_id")
 
@@ -94,9 +101,9 @@ class Standing(SQLModel, table=True):
 class Fixture(SQLModel, table=True):
     id: int = Field(primary_key=True)
     # Relationships: Fixture is many, other models are one
-    season_id: int = Field(foreign_key="season.id") # Many-to-one
-    home_team_id: int = Field(foreign_key="team.team_api_id") # Many-to-one
-    away_team_id: int = Field(foreign_key="team.team_api_id") # Many-to-one
+    season_id: int = Field(foreign_key="season.id", index=True) # Many-to-one
+    home_team_id: int = Field(foreign_key="team.team_api_id", index=True) # Many-to-one
+    away_team_id: int = Field(foreign_key="team.team_api_id", index=True) # Many-to-one
     venue_id: Optional[int] = Field(default=None, foreign_key="venue.venue_api_id") # Many-to-one
     competition_id: int = Field(foreign_key="competition.comp_api_id") # Many-to-one
     referee: Optional[str] = Field(default=None)
@@ -118,7 +125,7 @@ class Fixture(SQLModel, table=True):
 # Define a FixtureStats Model, links to Fixture and Team (one)
 class FixtureStats(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    fixture_id: int = Field(foreign_key="fixture.id")
+    fixture_id: int = Field(foreign_key="fixture.id", index=True)
     home_team_id: int = Field(foreign_key="team.team_api_id")
     home_sh_on_goal: Optional[int] = Field(default=None)
     home_sh_off_goal: Optional[int] = Field(default=None)
@@ -129,14 +136,14 @@ class FixtureStats(SQLModel, table=True):
     home_fouls: Optional[int] = Field(default=None)
     home_corners: Optional[int] = Field(default=None)
     home_offsides: Optional[int] = Field(default=None)
-    home_possession: Optional[str] = Field(default=None)
+    home_possession: Optional[float] = Field(default=None)
     home_yellows: Optional[int] = Field(default=None)
     home_reds: Optional[int] = Field(default=None)
     home_saves: Optional[int] = Field(default=None)
     home_tot_passes: Optional[int] = Field(default=None)
     home_accurate_pass: Optional[int] = Field(default=None)
-    home_percent_pass: Optional[str] = Field(default=None)
-    home_ex_goals: Optional[str] = Field(default=None)
+    home_percent_pass: Optional[float] = Field(default=None)
+    home_ex_goals: Optional[float] = Field(default=None)
     away_team_id: int = Field(foreign_key="team.team_api_id")
     away_sh_on_goal: Optional[int] = Field(default=None)
     away_sh_off_goal: Optional[int] = Field(default=None)
@@ -147,13 +154,38 @@ class FixtureStats(SQLModel, table=True):
     away_fouls: Optional[int] = Field(default=None)
     away_corners: Optional[int] = Field(default=None)
     away_offsides: Optional[int] = Field(default=None)
-    away_possession: Optional[str] = Field(default=None)
+    away_possession: Optional[float] = Field(default=None)
     away_yellows: Optional[int] = Field(default=None)
     away_reds: Optional[int] = Field(default=None)
     away_saves: Optional[int] = Field(default=None)
     away_tot_passes: Optional[int] = Field(default=None)
     away_accurate_pass: Optional[int] = Field(default=None)
-    away_percent_pass: Optional[str] = Field(default=None)
-    away_ex_goals: Optional[str] = Field(default=None)
+    away_percent_pass: Optional[float] = Field(default=None)
+    away_ex_goals: Optional[float] = Field(default=None)
+
+    __table_args__ = (UniqueConstraint("fixture_id", "home_team_id", "away_team_id"),)
+
+# FixtureStats columns stored as numbers, databases created before they were kept them as text
+NUMERIC_STATS = tuple(f'{side}_{name}' for side in ('home', 'away') for name in ('possession', 'percent_pass', 'ex_goals'))
+
+# Stop before reading or writing FixtureStats in a database that still stores them as text
+def check_fixture_stats_columns(connection):
+    types = {row[1]: row[2] for row in connection.exec_driver_sql(f"PRAGMA table_info({FixtureStats.__tablename__})")}
+    text_columns = [name for name in NUMERIC_STATS if types.get(name, 'FLOAT') != 'FLOAT']
+    if text_columns:
+        raise ValueError(f'Fixture stats in this database are stored as text ({", ".join(text_columns)}). '
+                         f'Run migrate-fixture-stats first.')
+
+# Define ApiJob Model, one unit of pending API work for resumable backfills
+class ApiJob(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    endpoint: str
+    params: str  # JSON with sorted keys, so the same request is only queued once
+    status: str = Field(default="pending", index=True)  # pending, running, done or failed
+    attempts: int = Field(default=0)
+    error: Optional[str] = Field(default=None)
+    created_at: datetime
+    claimed_at: Optional[datetime] = Field(default=None)  # when a worker last started running it
+    finished_at: Optional[datetime] = Field(default=None)
 
-    __table_args__ = (UniqueConstraint("fixture_id", "home_team_id", "away_team_id"),)
\ No newline at end of file
+    __table_args__ = (UniqueConstraint("endpoint", "params"),)
@@ -0,0 +1,196 @@
+# Import libraries
+from sqlalchemy import case
+from sqlmodel import Session, select
+from typing import NamedTuple, Optional
+
+# Import Models
+from models import Competition, Country, Season, Team, TeamSeasonCompetition, Venue
+
+
+# Filters shared by the show-* listings, any combination can be given
+class Filters(NamedTuple):
+    country: Optional[str] = None
+    competition: Optional[str] = None
+    year: Optional[int] = None
+    comp_type: Optional[str] = None
+    national: bool = False
+
+# A column of a listing, left out when a filter already fixes its value
+class Column(NamedTuple):
+    header: str
+    expr: object
+    fixed_by: Optional[str] = None
+
+# A compiled listing, one statement and the headers of the columns it returns
+class Query(NamedTuple):
+    stmt: object
+    headers: list
+
+
+# Project the columns a listing shows, skipping those pinned by a filter
+def project(columns: list, filters: Filters):
+    shown = [column for column in columns if not (column.fixed_by and getattr(filters, column.fixed_by))]
+    return [column.expr.label(column.header) for column in shown], [column.header for column in shown]
+
+# Competition API ID for a Competition name, the first one if several Countries use the name as the resolver picks
+def competition_id_stmt(competition_name: str):
+    return (select(Competition.comp_api_id).where(Competition.comp_name == competition_name)
+            .order_by(Competition.comp_api_id).limit(1))
+
+# Conditions on the Competition table, used wherever a listing is joined to it
+def competition_conditions(filters: Filters, country: bool = True) -> list:
+    conditions = []
+    if country and filters.country is not None:
+        conditions.append(Competition.country_name == filters.country)
+    if filters.competition is not None:
+        conditions.append(Competition.comp_api_id == competition_id_stmt(filters.competition).scalar_subquery())
+    if filters.comp_type is not None:
+        conditions.append(Competition.comp_type == filters.comp_type)
+    return conditions
+
+# Join TeamSeasonCompetition rows to Competition and Season only when a filter needs them
+def scope_joins(stmt, filters: Filters):
+    if filters.competition is not None or filters.comp_type is not None:
+        stmt = stmt.join(Competition, Competition.comp_api_id == TeamSeasonCompetition.competition_id)
+    if filters.year is not None:
+        stmt = stmt.join(Season, Season.id == TeamSeasonCompetition.season_id)
+    return stmt
+
+# Whether a Team or Venue listing has to go through the Seasons it took part in
+def scoped(filters: Filters) -> bool:
+    return filters.competition is not None or filters.year is not None or filters.comp_type is not None
+
+
+# Competitions, with a Season for the Year when one is given
+def compile_competitions(filters: Filters) -> Query:
+    labels, headers = project([
+        Column("Country", Competition.country_name, 'country'),
+        Column("Name", Competition.comp_name, 'competition'),
+        Column("Type", Competition.comp_type, 'comp_type'),
+        Column("Logo", Competition.comp_logo),
+    ], filters)
+    conditions = competition_conditions(filters)
+    if filters.national:
+        conditions.append(Competition.country_name == 'World')
+    stmt = select(*labels).select_from(Competition)
+    if filters.year is not None:
+        stmt = stmt.join(Season, Season.league_id == Competition.comp_api_id)
+        conditions.append(Season.year == filters.year)
+    stmt = (stmt.where(*conditions)
+            .order_by(Competition.country_name, Competition.comp_type.desc(), Competition.comp_name))
+    return Query(stmt, headers)
+
+# Seasons with their Competition and Country
+def compile_seasons(filters: Filters) -> Query:
+    labels, headers = project([
+        Column("Year", Season.year, 'year'),
+        Column("Country", Competition.country_name, 'country'),
+        Column("Competition", Competition.comp_name, 'competition'),
+        Column("Type", Competition.comp_type, 'comp_type'),
+    ], filters)
+    conditions = competition_conditions(filters)
+    if filters.year is not None:
+        conditions.append(Season.year == filters.year)
+    if filters.national:
+        conditions.append(Competition.country_name == 'World')
+    stmt = (select(*labels).select_from(Season)
+            .join(Competition, Competition.comp_api_id == Season.league_id)
+            .where(*conditions)
+            .order_by(Season.year, Competition.country_name, Competition.comp_type.desc(), Competition.comp_name))
+    return Query(stmt, headers)
+
+# Teams, through the Seasons they played when a Competition, Year or Type is given
+def compile_teams(filters: Filters) -> Query:
+    labels, headers = project([
+        Column("Country", Team.country, 'country'),
+        Column("Name", Team.name),
+        Column("Short Name", Team.short_name),
+        Column("Founded", Team.founded),
+        Column("Type", case((Team.national == True, "National"), else_="Club"), 'national'),
+        Column("Logo", Team.logo_url),
+    ], filters)
+    conditions = competition_conditions(filters, country=False)
+    if filters.country is not None:
+        conditions.append(Team.country == filters.country)
+    if filters.national:
+        conditions.append(Team.national == True)
+    if filters.year is not None:
+        conditions.append(Season.year == filters.year)
+    stmt = select(*labels).select_from(Team)
+    if scoped(filters):
+        # A Team plays many Seasons, each is listed once
+        stmt = scope_joins(stmt.join(TeamSeasonCompetition, TeamSeasonCompetition.team_id == Team.team_api_id),
+                           filters).distinct()
+    stmt = stmt.where(*conditions).order_by(Team.country, Team.national, Team.name)
+    return Query(stmt, headers)
+
+# Venues, with the Team playing there when a Competition, Year or Type is given
+def compile_venues(filters: Filters) -> Query:
+    columns = [
+        Column("Country", Venue.country, 'country'),
+        Column("Name", Venue.name),
+        Column("Address", Venue.address),
+        Column("City", Venue.city),
+        Column("Capacity", Venue.capacity),
+        Column("Surface", Venue.surface),
+        Column("Image", Venue.image),
+    ]
+    if scoped(filters):
+        columns.insert(2, Column("Team", Team.name))
+    labels, headers = project(columns, filters)
+    conditions = competition_conditions(filters, country=False)
+    if filters.country is not None:
+        conditions.append(Venue.country == filters.country)
+    if filters.national:
+        conditions.append(Team.national == True)
+    if filters.year is not None:
+        conditions.append(Season.year == filters.year)
+    stmt = select(*labels).select_from(Venue)
+    if scoped(filters) or filters.national:
+        # A Venue hosts many Seasons, each Venue and Team pair is listed once
+        stmt = (stmt.join(TeamSeasonCompetition, TeamSeasonCompetition.venue_id == Venue.venue_api_id)
+                .join(Team, Team.team_api_id == TeamSeasonCompetition.team_id))
+        stmt = scope_joins(stmt, filters).distinct()
+    stmt = stmt.where(*conditions).order_by(Venue.country, Venue.name)
+    return Query(stmt, headers)
+
+# Compilers by entity
+COMPILERS = {
+    'competitions': compile_competitions,
+    'seasons': compile_seasons,
+    'teams': compile_teams,
+    'venues': compile_venues,
+}
+
+
+# Compile a listing of an entity to a single statement
+def compile_query(entity: str, filters: Filters) -> Query:
+    if entity not in COMPILERS:
+        raise ValueError(f'Unknown entity: {entity}. Choose from {", ".join(COMPILERS)}.')
+    return COMPILERS[entity](filters)
+
+# Title of a listing, e.g. All League Teams from England in Premier League for 2023
+def describe(entity: str, filters: Filters, prefix: str = 'All') -> str:
+    words = [prefix] if prefix else []
+    if filters.national:
+        words.append('National')
+    if filters.comp_type:
+        words.append(filters.comp_type)
+    words.append(entity.capitalize())
+    if filters.country:
+        words.append(f'from {filters.country}')
+    if filters.competition:
+        words.append(f'in {filters.competition}')
+    if filters.year:
+        words.append(f'for {filters.year}')
+    return ' '.join(words)
+
+# Explain an empty listing, naming a Country or Competition filter that matches nothing
+def empty_message(session: Session, entity: str, filters: Filters) -> str:
+    if filters.country is not None and \
+            session.exec(select(Country.id).where(Country.country_name == filters.country)).first() is None:
+        return f'Could not find country: {filters.country}.'
+    if filters.competition is not None and session.exec(
+            select(Competition.comp_api_id).where(Competition.comp_name == filters.competition)).first() is None:
+        return f'Could not find competition: {filters.competition}.'
+    return f'No {describe(entity, filters, prefix=None)} found.'
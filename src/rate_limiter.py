@@ -0,0 +1,118 @@
+# Import libraries
+import config
+import threading
+import time
+
+# Request quotas for each API-Sports plan tier: (requests per minute, requests per day)
+PLAN_LIMITS = {
+    'free': (10, 100),
+    'pro': (300, 7500),
+    'ultra': (450, 75000),
+    'mega': (900, 150000),
+}
+
+# Plan and optional per-endpoint overrides (set in config.py)
+API_PLAN = getattr(config, 'API_PLAN', 'free')
+API_ENDPOINT_LIMITS = getattr(config, 'API_ENDPOINT_LIMITS', {})
+
+
+# Raised when the daily quota is spent, waiting for it to refill would take hours
+class QuotaExhausted(RuntimeError):
+    pass
+
+
+# Thread-safe token bucket, refills continuously at `rate` tokens per second up to `capacity`
+class TokenBucket:
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Take one token and return how long the caller must wait before using it
+    def reserve(self) -> float:
+        with self.lock:
+            self._refill()
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    # Put back a token that was reserved but not used
+    def release(self):
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    # Lower the available tokens to match what the server reports as remaining
+    def sync(self, remaining: int):
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, remaining)
+
+    # Set the available tokens to what the server reports as remaining, growing the bucket and its refill rate when
+    # the account allows more than the configured plan
+    def reset(self, remaining: int):
+        with self.lock:
+            self._refill()
+            if remaining > self.capacity:
+                self.rate *= remaining / self.capacity
+                self.capacity = remaining
+            self.tokens = remaining
+
+
+# Per-minute and per-day buckets for one quota
+class Quota:
+    def __init__(self, per_minute: int, per_day: int):
+        self.minute = TokenBucket(per_minute, per_minute / 60)
+        self.day = TokenBucket(per_day, per_day / 86400)
+
+
+# Rate limiter shared by every API call, one account-wide quota plus optional stricter per-endpoint quotas
+class RateLimiter:
+    def __init__(self, plan: str = API_PLAN, endpoint_limits: dict = None):
+        if plan not in PLAN_LIMITS:
+            raise ValueError(f'Unknown API plan: {plan}. Choose from {", ".join(PLAN_LIMITS)}.')
+        self.plan = plan
+        self.account = Quota(*PLAN_LIMITS[plan])
+        self.endpoints = {endpoint: Quota(*limits)
+                          for endpoint, limits in (endpoint_limits or API_ENDPOINT_LIMITS).items()}
+
+    def _quotas(self, endpoint: str):
+        quotas = [self.account]
+        if endpoint in self.endpoints:
+            quotas.append(self.endpoints[endpoint])
+        return quotas
+
+    # Block until a request to `endpoint` is allowed, sleeping only when a bucket is empty
+    def acquire(self, endpoint: str):
+        quotas = self._quotas(endpoint)
+        for quota in quotas:
+            if quota.day.reserve() > 0:
+                for spent in quotas:
+                    spent.day.release()
+                    if spent is quota:
+                        break
+                raise QuotaExhausted(f'Daily request quota for the {self.plan} plan is used up ({endpoint}).')
+        wait = max(quota.minute.reserve() for quota in quotas)
+        if wait > 0:
+            time.sleep(wait)
+
+    # Keep the account buckets in line with the quota headers returned by the API, the daily count is the server's
+    # so it can also raise the bucket of a config.py that predates API_PLAN
+    def update_from_headers(self, headers):
+        day_remaining = headers.get('x-ratelimit-requests-remaining')
+        minute_remaining = headers.get('X-RateLimit-Remaining')
+        if day_remaining is not None and day_remaining.isdigit():
+            self.account.day.reset(int(day_remaining))
+        if minute_remaining is not None and minute_remaining.isdigit():
+            self.account.minute.sync(int(minute_remaining))
+
+
+# Shared limiter used by the API client
+limiter = RateLimiter()
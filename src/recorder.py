@@ -0,0 +1,37 @@
+# Import libraries
+import json
+import os
+
+# Import Functions
+from response_cache import cache_key
+
+
+# Raw API responses saved to disk, one JSON file per endpoint and params
+class Recorder:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    # recordings/fixtures_statistics/<key>.json
+    def path(self, endpoint: str, params: dict = None) -> str:
+        folder = endpoint.strip('/').replace('/', '_') or 'root'
+        return os.path.join(self.directory, folder, f'{cache_key(endpoint, params)}.json')
+
+    # Save a response for an endpoint and params
+    def save(self, endpoint: str, params: dict, data: dict):
+        path = self.path(endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        recording = {
+            'endpoint': endpoint,
+            'params': {k: str(v) for k, v in (params or {}).items()},
+            'body': data
+        }
+        with open(path, 'w') as f:
+            json.dump(recording, f)
+
+    # Load the recorded response for an endpoint and params, None if it was never recorded
+    def load(self, endpoint: str, params: dict = None):
+        path = self.path(endpoint, params)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)['body']
@@ -0,0 +1,183 @@
+# Import libraries
+from sqlalchemy import event, and_
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+from typing import NamedTuple, Optional
+import threading
+
+# Import Models
+from models import Competition, Season, Team, Venue
+
+
+# Cached entities are plain values named like the model fields, so they outlive the Session that loaded them
+class CompetitionRef(NamedTuple):
+    comp_api_id: int
+    comp_name: str
+    comp_type: str
+    country_name: str
+
+class SeasonRef(NamedTuple):
+    id: int
+    year: int
+    league_id: int
+
+class TeamRef(NamedTuple):
+    team_api_id: int
+    name: str
+
+class VenueRef(NamedTuple):
+    venue_api_id: int
+    name: Optional[str]
+
+class Resolved(NamedTuple):
+    competition: Optional[CompetitionRef]
+    season: Optional[SeasonRef]
+    team: Optional[TeamRef]
+
+# Caches to drop when a table is written, Seasons are looked up by Competition name
+TABLE_CACHES = {
+    'competition': ('competitions', 'seasons'),
+    'season': ('seasons',),
+    'team': ('teams',),
+    'venue': ('venues',),
+}
+
+
+# In-process cache of name and ID lookups for Competitions, Seasons, Teams and Venues
+class EntityResolver:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.caches = {name: {} for name in ('competitions', 'seasons', 'teams', 'venues')}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, cache: str, key):
+        with self.lock:
+            if key in self.caches[cache]:
+                self.hits += 1
+                return True, self.caches[cache][key]
+            self.misses += 1
+            return False, None
+
+    def _store(self, cache: str, key, value):
+        with self.lock:
+            self.caches[cache][key] = value
+        return value
+
+    # Run a lookup once, misses are cached too until the table is next written
+    def _cached(self, session: Session, cache: str, key, stmt, make):
+        found, value = self._lookup(cache, key)
+        if found:
+            return value
+        row = session.exec(stmt).first()
+        return self._store(cache, key, make(*row) if row else None)
+
+    # Competition by name, the first one if several Countries use the name
+    def competition(self, session: Session, competition_name: str) -> Optional[CompetitionRef]:
+        return self._cached(
+            session, 'competitions', ('name', competition_name),
+            select(Competition.comp_api_id, Competition.comp_name, Competition.comp_type, Competition.country_name)
+            .where(Competition.comp_name == competition_name).order_by(Competition.comp_api_id),
+            CompetitionRef)
+
+    # Season by Competition name and Year
+    def season(self, session: Session, competition_name: str, year: int) -> Optional[SeasonRef]:
+        return self.resolve(session, competition_name, year).season
+
+    # Team by name
+    def team(self, session: Session, team_name: str) -> Optional[TeamRef]:
+        return self._cached(
+            session, 'teams', ('name', team_name),
+            select(Team.team_api_id, Team.name).where(Team.name == team_name).order_by(Team.team_api_id),
+            TeamRef)
+
+    # Team by API ID
+    def team_by_id(self, session: Session, team_id: int) -> Optional[TeamRef]:
+        return self._cached(session, 'teams', ('id', team_id),
+                            select(Team.team_api_id, Team.name).where(Team.team_api_id == team_id), TeamRef)
+
+    # Venue by name
+    def venue(self, session: Session, venue_name: str) -> Optional[VenueRef]:
+        return self._cached(
+            session, 'venues', ('name', venue_name),
+            select(Venue.venue_api_id, Venue.name).where(Venue.name == venue_name).order_by(Venue.venue_api_id),
+            VenueRef)
+
+    # Venue by API ID
+    def venue_by_id(self, session: Session, venue_id: int) -> Optional[VenueRef]:
+        return self._cached(session, 'venues', ('id', venue_id),
+                            select(Venue.venue_api_id, Venue.name).where(Venue.venue_api_id == venue_id), VenueRef)
+
+    # Resolve a Competition, optionally with its Season for a Year and a Team, in at most one query
+    def resolve(self, session: Session, competition_name: str, year: int = None,
+                team_name: str = None) -> Resolved:
+        comp_found, competition = self._lookup('competitions', ('name', competition_name))
+        season_found, season = self._lookup('seasons', (competition_name, year)) if year is not None \
+            else (True, None)
+        team_found, team = self._lookup('teams', ('name', team_name)) if team_name is not None else (True, None)
+        if comp_found and season_found and team_found:
+            return Resolved(competition, season, team)
+
+        # Competition, joined to its Season and the Team only when they were asked for
+        columns = [Competition.comp_api_id, Competition.comp_name, Competition.comp_type, Competition.country_name]
+        season_columns = [Season.id, Season.year, Season.league_id] if year is not None else []
+        team_columns = [Team.team_api_id, Team.name] if team_name is not None else []
+        stmt = select(*columns, *season_columns, *team_columns).select_from(Competition)
+        if season_columns:
+            stmt = stmt.outerjoin(Season, and_(Season.league_id == Competition.comp_api_id, Season.year == year))
+        if team_columns:
+            stmt = stmt.outerjoin(Team, Team.name == team_name)
+        row = session.exec(
+            stmt.where(Competition.comp_name == competition_name)
+            .order_by(Competition.comp_api_id, *team_columns[:1]).limit(1)
+        ).first()
+        if row is None:
+            # No Competition, a Team on its own can still be resolved later
+            return Resolved(self._store('competitions', ('name', competition_name), None), None,
+                            team if team_found else None)
+
+        competition = self._store('competitions', ('name', competition_name), CompetitionRef(*row[:4]))
+        rest = row[4:]
+        if season_columns:
+            season = self._store('seasons', (competition_name, year),
+                                 SeasonRef(*rest[:3]) if rest[0] is not None else None)
+            rest = rest[3:]
+        if team_columns:
+            team = self._store('teams', ('name', team_name), TeamRef(*rest) if rest[0] is not None else None)
+        return Resolved(competition, season, team)
+
+    # Drop cached entries for written tables, or everything
+    def invalidate(self, tables=None):
+        with self.lock:
+            for table in (tables if tables is not None else TABLE_CACHES):
+                for cache in TABLE_CACHES.get(table, ()):
+                    self.caches[cache].clear()
+
+
+# Shared resolver for the process
+resolver = EntityResolver()
+
+
+# Note the tables each Session writes, through ORM flushes and Core statements alike
+@event.listens_for(OrmSession, 'after_flush')
+def track_flush(session, flush_context):
+    tables = session.info.setdefault('written_tables', set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        tables.add(instance.__tablename__)
+
+@event.listens_for(OrmSession, 'do_orm_execute')
+def track_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = orm_execute_state.statement.table
+        orm_execute_state.session.info.setdefault('written_tables', set()).add(table.name)
+
+# Invalidate once the writes are committed, forget them if they were rolled back
+@event.listens_for(OrmSession, 'after_commit')
+def invalidate_written(session):
+    tables = session.info.pop('written_tables', None)
+    if tables:
+        resolver.invalidate(tables)
+
+@event.listens_for(OrmSession, 'after_rollback')
+def forget_written(session):
+    session.info.pop('written_tables', None)
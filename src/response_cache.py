@@ -0,0 +1,141 @@
+# Import libraries
+import config
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# Import Models
+from models import FINISHED_STATUSES
+
+# Cache Settings (override in config.py)
+API_CACHE_PATH = getattr(config, 'API_CACHE_PATH', 'api_cache.db')
+API_CACHE_TTLS = getattr(config, 'API_CACHE_TTLS', {})
+
+# Default time-to-live in seconds for each endpoint, None caches forever
+DEFAULT_TTLS = {
+    '/leagues': 7 * 86400,
+    '/teams': 7 * 86400,
+    '/venues': 30 * 86400,
+    'fixtures_open': 5 * 60,
+    'standings_current': 10 * 60,
+    'default': 3600,
+}
+TTLS = {**DEFAULT_TTLS, **API_CACHE_TTLS}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS response (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    body TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    endpoint TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+# Content-address a request by its endpoint and sorted parameters, and by its server unless that is the live API
+def cache_key(endpoint: str, params: dict = None, server: str = None) -> str:
+    request = {'endpoint': endpoint, 'params': {k: str(v) for k, v in (params or {}).items()}}
+    if server:
+        request['server'] = server
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+
+# Work out how long a response stays valid from its endpoint and how fresh its data is
+# finished tells whether the Fixtures of a response without their status, such as statistics, are finished
+def ttl_for(endpoint: str, params: dict, data: dict, finished: bool = False):
+    if endpoint == '/fixtures':
+        # Finished fixtures never change, anything scheduled or live is re-checked soon
+        statuses = {entry['fixture']['status']['short'] for entry in data.get('response', [])}
+        return None if statuses <= set(FINISHED_STATUSES) else TTLS['fixtures_open']
+    if endpoint == '/fixtures/statistics':
+        # Statistics of a live or unplayed Fixture are still filling in, the same rule as /fixtures
+        return None if finished else TTLS['fixtures_open']
+    if endpoint == '/standings':
+        # A season starting two or more years ago is over
+        season = int((params or {}).get('season', 0))
+        return None if season < datetime.now().year - 1 else TTLS['standings_current']
+    return TTLS.get(endpoint, TTLS['default'])
+
+
+# Persistent on-disk cache of API responses, stored in SQLite
+class ResponseCache:
+    def __init__(self, path: str = API_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+
+    @property
+    def conn(self):
+        # Open lazily so commands that never call the API never create the file
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _count(self, endpoint: str, column: str):
+        self.conn.execute(f"INSERT INTO stats (endpoint, {column}) VALUES (?, 1) "
+                          f"ON CONFLICT(endpoint) DO UPDATE SET {column} = {column} + 1", (endpoint,))
+
+    # Return the cached body for a request, or None when missing or expired. Responses from a server other than
+    # the live API are listed under its URL
+    def get(self, endpoint: str, params: dict = None, server: str = None):
+        with self.lock:
+            row = self.conn.execute("SELECT body, expires_at FROM response WHERE key = ?",
+                                    (cache_key(endpoint, params, server),)).fetchone()
+            if row and (row[1] is None or row[1] > time.time()):
+                self.hits += 1
+                self._count((server or '') + endpoint, 'hits')
+                return json.loads(row[0])
+            self.misses += 1
+            self._count((server or '') + endpoint, 'misses')
+            return None
+
+    # Store a successful response with the TTL for its endpoint
+    def put(self, endpoint: str, params: dict, data: dict, server: str = None, finished: bool = False):
+        if not data.get('results') or data.get('errors'):
+            return
+        ttl = ttl_for(endpoint, params, data, finished)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO response (key, endpoint, params, body, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key(endpoint, params, server), (server or '') + endpoint,
+                 json.dumps(params or {}, sort_keys=True), json.dumps(data), now, None if ttl is None else now + ttl))
+
+    # Entries, expired entries, hits and misses for each endpoint
+    def stats(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT e.endpoint, COUNT(r.key), COALESCE(SUM(r.expires_at < ?), 0), "
+                "COALESCE(s.hits, 0), COALESCE(s.misses, 0) "
+                "FROM (SELECT endpoint FROM response UNION SELECT endpoint FROM stats) e "
+                "LEFT JOIN response r ON r.endpoint = e.endpoint "
+                "LEFT JOIN stats s ON s.endpoint = e.endpoint "
+                "GROUP BY e.endpoint ORDER BY e.endpoint", (time.time(),)).fetchall()
+
+    # Delete cached responses, only expired ones if expired_only, and return how many were removed
+    def clear(self, expired_only: bool = False) -> int:
+        with self.lock:
+            if expired_only:
+                cursor = self.conn.execute("DELETE FROM response WHERE expires_at < ?", (time.time(),))
+            else:
+                cursor = self.conn.execute("DELETE FROM response")
+                self.conn.execute("DELETE FROM stats")
+            return cursor.rowcount
+
+
+# Shared cache used by the API client
+cache = ResponseCache()
@@ -0,0 +1,128 @@
+# Import libraries
+import config
+from itertools import groupby
+from sqlmodel import Session, select
+
+# Import Models
+from models import FINISHED_STATUSES, Fixture
+
+# Points for a win and a draw
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+# Tie-break rules by Competition name, applied in order. A rule names a Standing column, higher is better, and an
+# h2h_ prefix compares that column over the matches between the tied Teams only
+TIE_BREAKS = {
+    'Premier League': ['points', 'goal_diff', 'goals_for', 'h2h_points', 'h2h_away_goals_for'],
+    'La Liga': ['points', 'h2h_points', 'h2h_goal_diff', 'goal_diff', 'goals_for'],
+    'Serie A': ['points', 'h2h_points', 'h2h_goal_diff', 'goal_diff', 'goals_for'],
+    'Bundesliga': ['points', 'goal_diff', 'goals_for', 'h2h_points', 'h2h_away_goals_for', 'away_goals_for'],
+    **getattr(config, 'STANDINGS_TIE_BREAKS', {}),
+}
+DEFAULT_TIE_BREAKS = ['points', 'goal_diff', 'goals_for']
+
+# Standing columns counted for each side, in the order a record holds them, the overall ones are their sums
+SIDE_COLUMNS = ('played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against')
+RULE_COLUMNS = ('points', 'goal_diff', *SIDE_COLUMNS,
+                *(f'{side}_{column}' for side in ('home', 'away') for column in (*SIDE_COLUMNS, 'goal_diff')))
+
+
+# Tie-break rules for a Competition, checking each names a Standing column
+def tie_breaks_for(competition_name: str) -> list:
+    rules = TIE_BREAKS.get(competition_name, DEFAULT_TIE_BREAKS)
+    for rule in rules:
+        if rule.removeprefix('h2h_') not in RULE_COLUMNS:
+            raise ValueError(f'Unknown tie-break rule: {rule}. Use a Standing column, optionally prefixed h2h_.')
+    return rules
+
+# Match Day number of a League round such as Regular Season - 12, None for rounds without one
+def matchday_number(round_name: str):
+    try:
+        return int(round_name.rsplit(' - ', 1)[-1])
+    except (AttributeError, ValueError):
+        return None
+
+# Fixtures of a Season as (home Team, away Team, home goals, away goals, round, status), in one query
+def load_fixtures(session: Session, season_id) -> list:
+    return session.exec(
+        select(Fixture.home_team_id, Fixture.away_team_id, Fixture.home_goals, Fixture.away_goals, Fixture.round,
+               Fixture.short_status)
+        .where(Fixture.season_id == season_id)
+    ).all()
+
+# Final results among the Fixtures, only those up to a Match Day when one is given
+def final_results(fixtures: list, matchday: int = None) -> list:
+    results = []
+    for home, away, home_goals, away_goals, round_name, status in fixtures:
+        if status not in FINISHED_STATUSES or home_goals is None or away_goals is None:
+            continue
+        if matchday is not None:
+            number = matchday_number(round_name)
+            if number is None or number > matchday:
+                continue
+        results.append((home, away, home_goals, away_goals))
+    return results
+
+#********************************************************************************************#
+
+#**********************************     Tables          *************************************#
+
+#********************************************************************************************#
+
+# Home and away records of each Team in one pass over the results, each record counts SIDE_COLUMNS
+def tally(results: list, teams) -> dict:
+    records = {team: ([0] * 6, [0] * 6) for team in teams}
+    for home, away, home_goals, away_goals in results:
+        outcome = 1 if home_goals > away_goals else 2 if home_goals == away_goals else 3
+        home_record = records[home][0]
+        home_record[0] += 1
+        home_record[outcome] += 1
+        home_record[4] += home_goals
+        home_record[5] += away_goals
+        away_record = records[away][1]
+        away_record[0] += 1
+        # A home win is an away loss and the other way round
+        away_record[4 - outcome] += 1
+        away_record[4] += away_goals
+        away_record[5] += home_goals
+    return records
+
+# A Team's records as the columns of a Standing
+def standing_columns(home: list, away: list) -> dict:
+    row = {}
+    for side, record in (('home', home), ('away', away)):
+        row.update({f'{side}_{column}': value for column, value in zip(SIDE_COLUMNS, record)})
+        row[f'{side}_goal_diff'] = record[4] - record[5]
+    row.update({column: home[index] + away[index] for index, column in enumerate(SIDE_COLUMNS)})
+    row['goal_diff'] = row['goals_for'] - row['goals_against']
+    row['points'] = WIN_POINTS * row['wins'] + DRAW_POINTS * row['draws']
+    return row
+
+# Order Teams by the first rule, breaking each tie with the rules after it, then by Team ID
+def rank(teams: list, rules: list, table: dict, results: list) -> list:
+    if len(teams) < 2 or not rules:
+        return sorted(teams)
+    rule, rest = rules[0], rules[1:]
+    if rule.startswith('h2h_'):
+        # A table of the matches between these Teams only
+        tied = set(teams)
+        records = tally([result for result in results if result[0] in tied and result[1] in tied], tied)
+        rows = {team: standing_columns(*records[team]) for team in teams}
+        column = rule.removeprefix('h2h_')
+    else:
+        rows, column = table, rule
+    ordered = sorted(teams, key=lambda team: rows[team][column], reverse=True)
+    ranked = []
+    for _, group in groupby(ordered, key=lambda team: rows[team][column]):
+        ranked += rank(list(group), rest, table, results)
+    return ranked
+
+# Standings of a Season from its Fixtures, as rows with the columns of the Standing model
+def compute_standings(fixtures: list, season_id: int, rules: list = DEFAULT_TIE_BREAKS, matchday: int = None) -> list:
+    # Every Team with a Fixture in the Season has a row, even before it has played
+    teams = {team for fixture in fixtures for team in fixture[:2]}
+    results = final_results(fixtures, matchday)
+    records = tally(results, teams)
+    table = {team: standing_columns(*records[team]) for team in teams}
+    return [{'team_id': team, 'season_id': season_id, 'position': position, **table[team]}
+            for position, team in enumerate(rank(list(teams), rules, table, results), start=1)]
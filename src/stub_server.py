@@ -0,0 +1,91 @@
+# Import libraries
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from rich.console import Console
+from urllib.parse import urlsplit, parse_qsl
+import json
+import random
+import threading
+import time
+import typer
+
+# Import Functions
+from recorder import Recorder
+
+# Create Typer app and console
+app = typer.Typer()
+console = Console()
+
+
+# Local stand-in for the API-Sports service, serving responses saved with --record
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    recorder: Recorder = None
+    latency = 0.0
+    jitter = 0.0
+    rate_429 = 0.0
+    retry_after = 1
+    served = {}
+    lock = threading.Lock()
+
+    def send_json(self, status: int, body: dict, headers: dict = None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        # Simulated network and server time
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        if random.random() < self.rate_429:
+            status = 429
+            self.send_json(429, {'message': 'Too many requests'}, {'Retry-After': str(self.retry_after)})
+        else:
+            body = self.recorder.load(url.path, params)
+            if body is None:
+                status = 404
+                self.send_json(404, {'message': f'No recording for {url.path} with params {params}'})
+            else:
+                status = 200
+                self.send_json(200, body)
+        with self.lock:
+            self.served[status] = self.served.get(status, 0) + 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Serve recordings over HTTP
+@app.command()
+def serve(recordings: str,
+          port: int = typer.Option(8080, "--port", "-p"),
+          latency: float = typer.Option(0.0, "--latency", help="Seconds added to every response"),
+          jitter: float = typer.Option(0.0, "--jitter", help="Random +/- seconds added to the latency"),
+          rate_429: float = typer.Option(0.0, "--rate-429", min=0.0, max=1.0,
+                                         help="Fraction of requests answered with 429 Too Many Requests"),
+          retry_after: int = typer.Option(1, "--retry-after", help="Retry-After seconds sent with each 429")):
+    StubHandler.recorder = Recorder(recordings)
+    StubHandler.latency = latency
+    StubHandler.jitter = jitter
+    StubHandler.rate_429 = rate_429
+    StubHandler.retry_after = retry_after
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    console.print(f'Serving {recordings} on http://127.0.0.1:{port} (latency {latency}s, 429 rate {rate_429:.0%}).',
+                  style="green")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        console.print(f'Responses served by status: {StubHandler.served}', style="blue")
+
+
+# Run App
+if __name__ == "__main__":
+    app()